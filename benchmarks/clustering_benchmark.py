@@ -0,0 +1,110 @@
+"""Compare cluster_articles with the previous exhaustive scan.
+
+Run from the repository root:
+
+    python -m benchmarks.clustering_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from datetime import datetime, timedelta
+
+from src.daily_news_bot.clustering import SPECIFIC_ANCHORS, build_theme, cluster_articles, representative_id, similarity
+from src.daily_news_bot.models import Article, EventCluster
+
+DEFAULT_SIZES = (500, 2000, 10000)
+CATEGORIES = ("macro", "energy", "tech", "china", "markets")
+FILLER = (
+    "inflation", "bond", "yields", "jobs", "payrolls", "tariff", "export", "chip", "supply", "demand",
+    "shipping", "refinery", "output", "budget", "deficit", "currency", "yuan", "euro", "central", "bank",
+    "growth", "factory", "survey", "consumer", "housing", "credit", "lending", "guidance", "forecast", "rally",
+)
+
+
+def synthetic_articles(count: int, seed: int = 7) -> list[Article]:
+    """Articles drawn from ~count/4 story lines so clusters have realistic sizes."""
+    rng = random.Random(seed)
+    anchors = sorted(SPECIFIC_ANCHORS)
+    vocabulary = list(FILLER) + [f"topic{index}" for index in range(max(count // 3, 50))]
+    stories = []
+    for _ in range(max(count // 4, 1)):
+        stories.append(rng.sample(vocabulary, 5) + ([rng.choice(anchors)] if rng.random() < 0.3 else []))
+    start = datetime(2026, 5, 1)
+    articles = []
+    for index in range(count):
+        story = rng.choice(stories)
+        words = rng.sample(story, min(len(story), rng.randint(3, 5))) + rng.sample(vocabulary, 2)
+        articles.append(
+            Article(
+                title=" ".join(words).capitalize(),
+                url=f"https://example.com/{index}",
+                source=f"source{index % 40}",
+                category=rng.choice(CATEGORIES),
+                region="US",
+                source_weight=rng.choice((0.8, 1.0, 1.2)),
+                published_at=start + timedelta(minutes=rng.randint(0, 7 * 24 * 60)),
+                summary=" ".join(rng.sample(story, min(len(story), 3)) + rng.sample(vocabulary, 4)) if rng.random() < 0.8 else "",
+            )
+        )
+    return articles
+
+
+def exhaustive_cluster_articles(articles: list[Article], threshold: float = 0.33) -> list[EventCluster]:
+    """The pre-index algorithm: score every cluster and rebuild the theme on every append."""
+    clusters: list[EventCluster] = []
+    for article in articles:
+        matched_cluster: EventCluster | None = None
+        best_score = 0.0
+        for cluster in clusters:
+            score = similarity(article, cluster.representative)
+            if score >= threshold and score > best_score:
+                matched_cluster = cluster
+                best_score = score
+        if matched_cluster is None:
+            cluster_id = re.sub(r"[^a-z0-9]", "", representative_id(article.title))[:12]
+            matched_cluster = EventCluster(cluster_id=cluster_id or "event", theme=article.title)
+            clusters.append(matched_cluster)
+        matched_cluster.articles.append(article)
+        matched_cluster.theme = build_theme(matched_cluster.articles)
+    return clusters
+
+
+def _signature(clusters: list[EventCluster]) -> list[tuple[str, str, list[str]]]:
+    return [(cluster.cluster_id, cluster.theme, [article.url for article in cluster.articles]) for cluster in clusters]
+
+
+def _timed(func, articles: list[Article]) -> tuple[float, list[EventCluster]]:
+    started = time.perf_counter()
+    clusters = func(articles)
+    return time.perf_counter() - started, clusters
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--skip-exhaustive-above", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    print(f"{'articles':>9} {'clusters':>9} {'exhaustive':>11} {'indexed':>9} {'speedup':>8}")
+    for size in args.sizes:
+        articles = synthetic_articles(size)
+        indexed_seconds, indexed = _timed(cluster_articles, articles)
+        if size > args.skip_exhaustive_above:
+            print(f"{size:>9} {len(indexed):>9} {'skipped':>11} {indexed_seconds:>8.2f}s {'-':>8}")
+            continue
+        exhaustive_seconds, exhaustive = _timed(exhaustive_cluster_articles, articles)
+        if _signature(indexed) != _signature(exhaustive):
+            raise SystemExit(f"cluster output differs at {size} articles")
+        print(
+            f"{size:>9} {len(indexed):>9} {exhaustive_seconds:>10.2f}s {indexed_seconds:>8.2f}s "
+            f"{exhaustive_seconds / max(indexed_seconds, 1e-9):>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+"""Time dashboard rendering without a cache, with a cold render cache and with a warm one.
+
+Run from the repository root (optionally on a real run's payload):
+
+    python -m benchmarks.dashboard_render_benchmark [--payload outputs/report.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Callable
+
+from src.daily_news_bot.dashboard import SectionCache, dashboard_css_href, render_dashboard_html
+from tests.dashboard_support import dashboard_payload
+
+from .report_json_benchmark import synthetic_payload
+
+
+def _time(render: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) / repeat
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payload", default="")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    if args.payload:
+        payload = json.loads(Path(args.payload).read_text(encoding="utf-8"))
+    else:
+        payload = dashboard_payload()
+        payload["clusters"] = synthetic_payload(60, 0, 0)["clusters"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dashboard_render_cache.json"
+        inline = render_dashboard_html(payload)
+        linked = render_dashboard_html(payload, css_href=dashboard_css_href())
+        uncached = _time(lambda: render_dashboard_html(payload), args.repeat)
+
+        def cold() -> None:
+            path.unlink(missing_ok=True)
+            render_dashboard_html(payload, cache=SectionCache(path))
+
+        cold_seconds = _time(cold, args.repeat)
+        warm = SectionCache(path)
+        if render_dashboard_html(payload, cache=warm) != inline or warm.misses:
+            raise SystemExit("warm render differs from the uncached page")
+        warm_seconds = _time(lambda: render_dashboard_html(payload, cache=SectionCache(path)), args.repeat)
+
+    print(f"page {len(inline) / 1024:.1f} KB with inline CSS, {len(linked) / 1024:.1f} KB with the shared stylesheet")
+    print(f"  no cache:   {uncached * 1000:7.2f} ms")
+    print(f"  cold cache: {cold_seconds * 1000:7.2f} ms")
+    print(f"  warm cache: {warm_seconds * 1000:7.2f} ms ({warm.hits} parts reused)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Compare build_tracking_summary's indexed lookup with a full scan of a 400-day event history.
+
+Run from the repository root:
+
+    python -m benchmarks.event_history_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from benchmarks.clustering_benchmark import synthetic_articles
+from src.daily_news_bot.clustering import cluster_articles
+from src.daily_news_bot.models import EventCluster
+from src.daily_news_bot.tracking import (
+    _cluster_tokens,
+    _similarity,
+    build_tracking_summary,
+    load_event_history,
+    update_event_history,
+)
+
+GENERATED_AT = datetime(2026, 5, 9, 8, 0)
+
+
+def synthetic_clusters(count: int, seed: int) -> list[EventCluster]:
+    clusters = cluster_articles(synthetic_articles(count * 6, seed=seed))
+    return clusters[:count]
+
+
+def full_scan_tracking_summary(
+    clusters: list[EventCluster],
+    generated_at: datetime,
+    path: Path,
+    lookback_days: int = 7,
+) -> dict[str, Any]:
+    """The pre-index matcher: load every record, parse every timestamp, score every recent record."""
+    history = load_event_history(path)
+    cutoff = generated_at - timedelta(days=lookback_days)
+    recent_history = []
+    for item in history:
+        try:
+            item_time = datetime.fromisoformat(item.get("generated_at_utc", ""))
+        except ValueError:
+            continue
+        if item_time >= cutoff and item_time < generated_at:
+            recent_history.append(item)
+
+    summaries: list[dict[str, Any]] = []
+    for cluster in clusters:
+        current_tokens = _cluster_tokens(cluster)
+        matches: list[dict[str, Any]] = []
+        for item in recent_history:
+            score = _similarity(current_tokens, set(item.get("tokens") or []))
+            if score >= 0.45:
+                matches.append({**item, "match_score": round(score, 3)})
+        matches.sort(key=lambda item: (item.get("generated_at_utc", ""), item.get("match_score", 0)), reverse=True)
+        direction_counter = Counter(item.get("direction", "") for item in matches if item.get("direction"))
+        summaries.append(
+            {
+                "cluster_id": cluster.cluster_id,
+                "theme": cluster.theme,
+                "seen_recently": bool(matches),
+                "match_count": len(matches),
+                "last_seen_utc": matches[0].get("generated_at_utc") if matches else None,
+                "recent_titles": [item.get("title", "") for item in matches[:3] if item.get("title")],
+                "recent_direction_bias": direction_counter.most_common(1)[0][0] if direction_counter else None,
+            }
+        )
+    return {"generated_at_utc": generated_at.isoformat(), "lookback_days": lookback_days, "tracked_events": summaries}
+
+
+def build_history(path: Path, days: int, per_run: int, seed: int = 3) -> None:
+    """Two runs a day for ``days`` days, each recording ``per_run`` clusters, written the way the pipeline does."""
+    rng = random.Random(seed)
+    for day in range(days, 0, -1):
+        for hour in (0, 12):
+            generated_at = GENERATED_AT - timedelta(days=day, hours=hour)
+            clusters = synthetic_clusters(per_run, seed=rng.randint(0, 10**6))
+            for cluster in clusters:
+                cluster.direction = rng.choice(("偏利多", "偏利空", "中性"))
+            update_event_history(clusters, generated_at, path=path, keep_days=days + 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--per-run", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "event_history.json"
+        build_history(path, args.days, args.per_run)
+        clusters = synthetic_clusters(args.per_run, seed=11)
+        records = len(load_event_history(path))
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy = full_scan_tracking_summary(clusters, GENERATED_AT, path)
+        legacy_seconds = (time.perf_counter() - started) / args.repeat
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            indexed = build_tracking_summary(clusters, GENERATED_AT, path)
+        indexed_seconds = (time.perf_counter() - started) / args.repeat
+
+    if legacy != indexed:
+        raise SystemExit("indexed tracking summary differs from the full scan")
+    matched = sum(item["match_count"] for item in indexed["tracked_events"])
+    print(f"{records} history records over {args.days} days, {len(clusters)} clusters, {matched} matches")
+    print(f"full scan:      {legacy_seconds * 1000:8.1f} ms")
+    print(f"indexed lookup: {indexed_seconds * 1000:8.1f} ms")
+    print(f"speedup:        {legacy_seconds / max(indexed_seconds, 1e-9):8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
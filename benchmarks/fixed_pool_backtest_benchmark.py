@@ -0,0 +1,197 @@
+"""Compare the array-backed fixed-pool backtest with the per-trigger scan it replaced.
+
+Run from the repository root:
+
+    python -m benchmarks.fixed_pool_backtest_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from src.daily_news_bot import fixed_pool_history
+from src.daily_news_bot.backtest import PriceSeries, summarize_returns
+from src.daily_news_bot.fixed_pool_history import (
+    EVENT_THEME_TO_FIXED_POOL_THEME_KEYS,
+    WIN_HORIZONS,
+    WIN_LOOKBACK_WINDOWS,
+    _leader_from_stats,
+    _parse_day,
+    _safe_float,
+    build_fixed_pool_60d_panel,
+)
+
+LATEST_DAY = date(2026, 5, 9)
+THEME_TEXT = {"ai": "AI 算力", "energy": "oil hormuz", "gold": "gold fed", "china_macro": "china stimulus", "new_energy": "battery solar"}
+
+
+def _find_start_index(points: list[dict[str, Any]], trigger_day: date) -> int | None:
+    for index, point in enumerate(points):
+        point_day = _parse_day(point.get("date") or "")
+        if point_day and point_day >= trigger_day:
+            return index
+    return None
+
+
+def _compute_forward_return(points: list[dict[str, Any]], start_index: int, horizon: int) -> float | None:
+    end_index = start_index + horizon
+    if start_index < 0 or end_index >= len(points):
+        return None
+    start_close = _safe_float(points[start_index].get("close"))
+    end_close = _safe_float(points[end_index].get("close"))
+    if start_close in (None, 0) or end_close in (None, 0):
+        return None
+    return round((end_close - start_close) / start_close * 100, 3)
+
+
+def legacy_returns(points: list[dict[str, Any]], trigger_days: list[date], horizon: int) -> list[float]:
+    """The pre-engine inner loop: a linear scan, re-parsing dates, per trigger day and horizon."""
+    returns: list[float] = []
+    for trigger_day in trigger_days:
+        start_index = _find_start_index(points, trigger_day)
+        if start_index is None:
+            continue
+        result = _compute_forward_return(points, start_index, horizon)
+        if result is not None:
+            returns.append(result)
+    return returns
+
+
+def legacy_leaders(
+    portfolio: dict[str, Any],
+    history_items: list[dict[str, Any]],
+    daily_themes: dict[date, set[str]],
+    event_themes: list[str],
+) -> list[dict[str, Any]]:
+    points_by_code = {str(item["code"]): item["history"] for item in history_items}
+    refs_by_theme = fixed_pool_history._theme_to_codes(portfolio)
+    result = []
+    for event_theme in event_themes:
+        leaders: dict[str, Any] = {}
+        for window in WIN_LOOKBACK_WINDOWS:
+            cutoff = LATEST_DAY - timedelta(days=window)
+            theme_days = sorted(day for day, themes in daily_themes.items() if event_theme in themes and day >= cutoff)
+            horizon_stats: dict[int, list[dict[str, Any]]] = {horizon: [] for horizon in WIN_HORIZONS}
+            for ref in refs_by_theme.get(event_theme) or []:
+                code = str(ref.get("code") or "")
+                points = points_by_code.get(code) or []
+                for horizon in WIN_HORIZONS:
+                    returns = legacy_returns(points, theme_days, horizon)
+                    if not returns:
+                        continue
+                    positive = [item for item in returns if item > 0]
+                    horizon_stats[horizon].append(
+                        {
+                            "code": code,
+                            "name": ref.get("name") or code,
+                            "samples": len(returns),
+                            "avg_return_pct": round(sum(returns) / len(returns), 3),
+                            "win_rate_pct": round(len(positive) / len(returns) * 100, 1),
+                        }
+                    )
+            leaders[f"d{window}"] = {f"t{horizon}": _leader_from_stats(horizon_stats[horizon]) for horizon in WIN_HORIZONS}
+        result.append(leaders)
+    return result
+
+
+def synthetic_points(days: int, rng: random.Random) -> list[dict[str, Any]]:
+    """Weekday closes ending at LATEST_DAY with a random walk and the occasional missing close."""
+    points = []
+    close = 1.0
+    day = LATEST_DAY - timedelta(days=days)
+    while day <= LATEST_DAY:
+        if day.weekday() < 5:
+            close = max(0.05, close * (1 + rng.gauss(0, 0.015)))
+            points.append({"date": day.isoformat(), "close": None if rng.random() < 0.01 else round(close, 4)})
+        day += timedelta(days=1)
+    return points
+
+
+def synthetic_pool(history_days: int, seed: int) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    rng = random.Random(seed)
+    theme_keys = sorted({key for keys in EVENT_THEME_TO_FIXED_POOL_THEME_KEYS.values() for key in keys})
+    pool = [{"theme_key": key, "code": f"{510000 + index}", "name": key, "type": "ETF"} for index, key in enumerate(theme_keys)]
+    items = [{**item, "history": synthetic_points(history_days, rng)} for item in pool]
+    return {"decision_cockpit": {"fixed_buy_pool": pool}}, items
+
+
+def synthetic_events(days: int, seed: int) -> tuple[list[dict[str, Any]], dict[date, set[str]]]:
+    """Event records (newest first) hitting 1-2 themes a day, plus the theme-by-day map they produce."""
+    rng = random.Random(seed)
+    records = []
+    daily_themes: dict[date, set[str]] = {}
+    for offset in range(days):
+        day = LATEST_DAY - timedelta(days=offset)
+        for theme in rng.sample(sorted(THEME_TEXT), rng.randint(1, 2)):
+            records.append({"generated_at_utc": f"{day.isoformat()}T08:00:00", "theme": THEME_TEXT[theme], "tags": []})
+            daily_themes.setdefault(day, set()).add(theme)
+    return records, daily_themes
+
+
+def bench_panel(repeat: int) -> None:
+    portfolio, items = synthetic_pool(400, seed=3)
+    records, daily_themes = synthetic_events(260, seed=5)
+    event_themes = ["ai", "energy", "gold"]
+    routes = [{"theme_key": theme} for theme in event_themes]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        legacy = legacy_leaders(portfolio, items, daily_themes, event_themes)
+    legacy_seconds = (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        with patch.object(fixed_pool_history, "iter_event_history", lambda **_: iter(records)):
+            panel = build_fixed_pool_60d_panel(portfolio, routes, {"items": items})
+    panel_seconds = (time.perf_counter() - started) / repeat
+
+    if [row["leaders"] for row in panel["win_rows"]] != legacy:
+        raise SystemExit("panel win_rows differ from the per-trigger scan")
+    print(f"panel: {len(items)} instruments x {len(daily_themes)} event days, win_rows identical")
+    print(f"  per-trigger scan: {legacy_seconds * 1000:8.1f} ms (win-rate loop only)")
+    print(f"  full panel:       {panel_seconds * 1000:8.1f} ms")
+
+
+def bench_engine(trigger_count: int, max_horizon: int) -> None:
+    rng = random.Random(7)
+    points = synthetic_points(trigger_count * 7 // 5 + 60, rng)
+    trigger_days = sorted(LATEST_DAY - timedelta(days=rng.randint(30, trigger_count * 7 // 5)) for _ in range(trigger_count))
+    horizons = list(range(1, max_horizon + 1))
+
+    started = time.perf_counter()
+    legacy = [legacy_returns(points, trigger_days, horizon) for horizon in horizons]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    series = PriceSeries.from_points(points)
+    returns = series.forward_returns([day.toordinal() for day in trigger_days], horizons)
+    engine = [[value for value in returns[horizon] if value is not None] for horizon in horizons]
+    stats = [summarize_returns(returns[horizon]) for horizon in horizons]
+    engine_seconds = time.perf_counter() - started
+
+    if engine != legacy or not all(stats):
+        raise SystemExit("forward returns differ from the per-trigger scan")
+    print(f"engine: {len(points)} prices, {trigger_count} trigger days, horizons T+1..T+{max_horizon}")
+    print(f"  per-trigger scan: {legacy_seconds * 1000:8.1f} ms")
+    print(f"  PriceSeries:      {engine_seconds * 1000:8.1f} ms")
+    print(f"  speedup:          {legacy_seconds / max(engine_seconds, 1e-9):8.1f}x")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--triggers", type=int, default=1000)
+    parser.add_argument("--horizons", type=int, default=5)
+    args = parser.parse_args(argv)
+    bench_panel(args.repeat)
+    bench_engine(args.triggers, args.horizons)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Compare the shared keyword matcher with per-keyword scans over the real rule tables.
+
+Run from the repository root:
+
+    python -m benchmarks.keyword_matcher_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Any
+
+from benchmarks.clustering_benchmark import synthetic_articles
+from src.daily_news_bot import credibility, fixed_pool_history, macro_burst_risk, portfolio, prediction_lens, ranking, strategic_lens
+from src.daily_news_bot.cluster_features import cluster_features
+from src.daily_news_bot.clustering import cluster_articles
+from src.daily_news_bot.keyword_matcher import SUBSTRING, TOKEN, WORD, KeywordMatcher, _bigrams
+from src.daily_news_bot.models import EventCluster
+
+# (label, matcher, text builder) for every static table the pipeline scans per cluster.
+TABLES: list[tuple[str, KeywordMatcher, Any]] = [
+    ("ranking.tags", ranking.TAG_MATCHER, ranking.cluster_text),
+    ("ranking.story", ranking.STORY_MATCHER, ranking.cluster_text),
+    ("credibility.content", credibility.CONTENT_MATCHER, lambda cluster: ranking.cluster_text(cluster)),
+    ("portfolio.themes", portfolio.THEME_MATCHER, lambda cluster: cluster_features(cluster).source_text),
+    ("strategic_lens", strategic_lens.RULE_MATCHER, lambda cluster: cluster_features(cluster).detail_text),
+    ("prediction_lens", prediction_lens.RULE_MATCHER, lambda cluster: cluster_features(cluster).detail_text),
+    ("macro_burst_risk", macro_burst_risk.NEWS_MATCHER, lambda cluster: cluster_features(cluster).detail_text),
+    ("fixed_pool_history", fixed_pool_history.THEME_MATCHER, lambda cluster: ranking.cluster_text(cluster)),
+]
+
+
+def legacy_found(matcher: KeywordMatcher, text: str) -> set[str]:
+    """Needles found by checking each keyword on its own, the way the modules used to."""
+    needles = {needle for entries in matcher.tables.values() for _, needle in entries}
+    if matcher.mode == SUBSTRING:
+        return {needle for needle in needles if needle in text}
+    if matcher.mode == WORD:
+        return {
+            needle
+            for needle in needles
+            if (re.search(rf"\b{re.escape(needle)}\b", text) is not None if any("a" <= char <= "z" for char in needle) else needle in text)
+        }
+    if matcher.mode == TOKEN:
+        tokens = ranking.token_set(text)
+        return {needle for needle in needles if (needle in text if " " in needle else needle in tokens)}
+    raise ValueError(matcher.mode)
+
+
+def synthetic_clusters(count: int, seed: int = 5) -> list[EventCluster]:
+    """Synthetic clusters salted with real keywords so every table gets hits."""
+    rng = random.Random(seed)
+    keywords = sorted({keyword for _, matcher, _ in TABLES for entries in matcher.tables.values() for keyword, _ in entries})
+    articles = synthetic_articles(count * 4, seed=seed)
+    for article in articles:
+        article.title = f"{article.title} {' '.join(rng.sample(keywords, 2))}"
+        article.summary = f"{article.summary} {' '.join(rng.sample(keywords, 3))}"
+    clusters = cluster_articles(articles)
+    for cluster in clusters:
+        cluster.tags = ranking.infer_tags(cluster)
+    return clusters[:count]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clusters", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    clusters = synthetic_clusters(args.clusters)
+    texts = [[(matcher, build(cluster)) for _, matcher, build in TABLES] for cluster in clusters]
+
+    started = time.perf_counter()
+    legacy = [[legacy_found(matcher, text) for matcher, text in cluster_texts] for cluster_texts in texts]
+    legacy_seconds = time.perf_counter() - started
+
+    _bigrams.cache_clear()
+    started = time.perf_counter()
+    compiled = [[matcher.scan(text).found for matcher, text in cluster_texts] for cluster_texts in texts]
+    compiled_seconds = time.perf_counter() - started
+
+    if legacy != compiled:
+        raise SystemExit("matcher hits differ from per-keyword scans")
+    keywords = sum(len({needle for entries in matcher.tables.values() for _, needle in entries}) for _, matcher, _ in TABLES)
+    print(f"{len(clusters)} clusters, {len(TABLES)} tables, {keywords} keywords")
+    print(f"per-keyword scans: {legacy_seconds / len(clusters) * 1e6:8.0f} us/cluster")
+    print(f"shared matcher:    {compiled_seconds / len(clusters) * 1e6:8.0f} us/cluster")
+    print(f"speedup:           {legacy_seconds / max(compiled_seconds, 1e-9):8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
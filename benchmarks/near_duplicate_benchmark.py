@@ -0,0 +1,93 @@
+"""Measure near-duplicate recall and clustering time against URL-only dedupe.
+
+Run from the repository root:
+
+    python -m benchmarks.near_duplicate_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from benchmarks.clustering_benchmark import DEFAULT_SIZES, synthetic_articles
+from src.daily_news_bot.clustering import cluster_articles
+from src.daily_news_bot.models import Article
+from src.daily_news_bot.near_duplicates import DEFAULT_THRESHOLD, near_duplicate_groups
+
+WIRE_SUFFIXES = (" - Reuters", " | AP", " (Bloomberg)", "")
+
+
+def with_reprints(articles: list[Article], share: float = 0.3, seed: int = 11) -> tuple[list[Article], list[int]]:
+    """Append 1-3 lightly edited reprints for ``share`` of the articles; returns articles and their story labels."""
+    rng = random.Random(seed)
+    result = list(articles)
+    labels = list(range(len(articles)))
+    for index, article in enumerate(articles):
+        if rng.random() >= share:
+            continue
+        for copy_index in range(rng.randint(1, 3)):
+            summary_words = article.summary.split()
+            if len(summary_words) > 4 and rng.random() < 0.5:
+                summary_words.insert(rng.randrange(len(summary_words)), "reportedly")
+            result.append(
+                replace(
+                    article,
+                    title=article.title + rng.choice(WIRE_SUFFIXES),
+                    summary=" ".join(summary_words),
+                    url=f"{article.url}/reprint-{copy_index}",
+                    source=f"syndicator{rng.randint(0, 30)}",
+                    credibility_flags=[],
+                )
+            )
+            labels.append(index)
+    return result, labels
+
+
+def _score_groups(groups: list[list[int]], labels: list[int]) -> tuple[float, int]:
+    copies = len(labels) - len(set(labels))
+    caught = 0
+    false_merges = 0
+    for members in groups:
+        by_label: dict[int, int] = {}
+        for position in members:
+            by_label[labels[position]] = by_label.get(labels[position], 0) + 1
+        caught += sum(count - 1 for count in by_label.values())
+        false_merges += len(by_label) - 1
+    return caught / max(copies, 1), false_merges
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    print(f"threshold {args.threshold:g}")
+    print(f"{'articles':>9} {'reprints':>9} {'recall':>7} {'false':>6} {'url-only':>9} {'pre-pass':>9} {'with lsh':>9}")
+    for size in args.sizes:
+        articles, labels = with_reprints(synthetic_articles(size))
+        started = time.perf_counter()
+        cluster_articles(articles)
+        baseline_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        groups = near_duplicate_groups(articles, args.threshold)
+        prepass_seconds = time.perf_counter() - started
+        dropped = {position for members in groups for position in members[1:]}
+        started = time.perf_counter()
+        cluster_articles([article for position, article in enumerate(articles) if position not in dropped])
+        clustered_seconds = time.perf_counter() - started
+
+        recall, false_merges = _score_groups(groups, labels)
+        print(
+            f"{len(articles):>9} {len(articles) - size:>9} {recall:>7.1%} {false_merges:>6} "
+            f"{baseline_seconds:>8.2f}s {prepass_seconds:>8.2f}s {prepass_seconds + clustered_seconds:>8.2f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Compare peak memory and time of the copy-free public payload redaction with the deep-copy pipeline it replaced.
+
+Run from the repository root:
+
+    python -m benchmarks.public_payload_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from src.daily_news_bot.main import _public_output_payload
+from tests.public_payload_support import legacy_public_payload, weekly_payload
+
+from .report_json_benchmark import synthetic_payload
+
+
+def _measure(build: Callable[[], Any], repeat: int) -> tuple[float, int, Any]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = build()
+    seconds = (time.perf_counter() - started) / repeat
+    tracemalloc.start()
+    result = build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instruments", type=int, default=40)
+    parser.add_argument("--history-days", type=int, default=320)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    payload = weekly_payload(args.instruments, args.history_days)
+    payload["clusters"] = synthetic_payload(60, 0, 0)["clusters"]
+
+    for redact, public_url in ((True, "https://user.github.io/news/"), (False, "https://user.github.io/news/"), (False, "")):
+        legacy_seconds, legacy_peak, legacy = _measure(lambda: legacy_public_payload(payload, redact, public_url), args.repeat)
+        seconds, peak, current = _measure(lambda: _public_output_payload(payload, redact, public_url), args.repeat)
+        if json.dumps(current, ensure_ascii=False) != json.dumps(legacy, ensure_ascii=False):
+            raise SystemExit("redacted payload differs from the deep-copy pipeline")
+        print(f"redact_portfolio={redact!s:<5} public_url={bool(public_url)!s:<5} output identical")
+        print(f"  deep copy:  {legacy_seconds * 1000:8.2f} ms  peak {legacy_peak / 1024:9.1f} KB")
+        print(f"  copy-free:  {seconds * 1000:8.2f} ms  peak {peak / 1024:9.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+"""Measure report.json size, write time and peak memory for each save_json mode against the old indented dump.
+
+Run from the repository root:
+
+    python -m benchmarks.report_json_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable
+
+from src.daily_news_bot.report import save_json, side_file_dir
+
+
+def legacy_save_json(path: Path, payload: dict) -> None:
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def synthetic_payload(clusters: int, instruments: int, history_days: int, seed: int = 11) -> dict[str, Any]:
+    """A report shaped like a full portfolio run: clustered articles, source status and per-day histories."""
+    rng = random.Random(seed)
+    start = date(2026, 5, 9) - timedelta(days=history_days)
+
+    def history() -> list[dict[str, Any]]:
+        close = 1.0
+        points = []
+        for offset in range(history_days):
+            close *= 1 + rng.gauss(0, 0.012)
+            points.append({"date": (start + timedelta(days=offset)).isoformat(), "close": round(close, 4), "nav": round(close, 4)})
+        return points
+
+    return {
+        "generated_at": "2026-05-09T08:00:00+00:00",
+        "clusters": [
+            {
+                "title": f"中东局势 {index} 推动油价与航运保险重新定价",
+                "tags": ["energy", "geopolitics"],
+                "articles": [
+                    {
+                        "title": f"Article {index}-{article}: oil tankers reroute around Hormuz",
+                        "link": f"https://example.com/news/{index}/{article}",
+                        "summary": "Shipping insurers raised war-risk premiums as tankers diverted. " * 4,
+                        "source": "Reuters",
+                    }
+                    for article in range(rng.randint(3, 12))
+                ],
+            }
+            for index in range(clusters)
+        ],
+        "source_status": [{"name": f"source-{index}", "ok": index % 7 != 0, "count": rng.randint(0, 40), "error": ""} for index in range(160)],
+        "portfolio": {
+            "enabled": True,
+            "fixed_pool_backfill_rows": [{"code": f"{510000 + index}", "name": f"ETF {index}", "history": history()} for index in range(instruments)],
+            "quotes": {"items": [{"code": f"{1000 + index:06d}", "history": history()[-40:]} for index in range(instruments // 2)]},
+        },
+    }
+
+
+def _measure(label: str, write: Callable[[], Any], paths: Callable[[], list[Path]], repeat: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        write()
+    seconds = (time.perf_counter() - started) / repeat
+    tracemalloc.start()
+    write()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    sizes = [path.stat().st_size for path in paths() if path.exists()]
+    print(f"  {label:<28} {sum(sizes) / 1024:9.1f} KB in {len(sizes):3d} files  {seconds * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MB")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clusters", type=int, default=60)
+    parser.add_argument("--instruments", type=int, default=24)
+    parser.add_argument("--history-days", type=int, default=320)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    payload = synthetic_payload(args.clusters, args.instruments, args.history_days)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "report.json"
+        gz_path = path.with_name("report.json.gz")
+
+        def main_file() -> list[Path]:
+            return [path]
+
+        def side_files() -> list[Path]:
+            return [path, *sorted(side_file_dir(path).glob("*.json"))]
+
+        def gzip_files() -> list[Path]:
+            return [gz_path, *sorted(side_file_dir(path).glob("*.json.gz"))]
+
+        print(f"payload: {args.clusters} clusters, {args.instruments} instruments x {args.history_days} days")
+        _measure("indent=2 json.dumps (old)", lambda: legacy_save_json(path, payload), main_file, args.repeat)
+        _measure("streamed indent=2", lambda: save_json(path, payload), main_file, args.repeat)
+        _measure("compact", lambda: save_json(path, payload, compact=True), main_file, args.repeat)
+        _measure("compact + side files", lambda: save_json(path, payload, compact=True, side_files=True), side_files, args.repeat)
+        _measure("compact + side files + gzip", lambda: save_json(path, payload, compact=True, side_files=True, gzip_copy=True), side_files, args.repeat)
+        print(f"  report.json alone with side files: {path.stat().st_size / 1024:.1f} KB")
+        print(f"  gzip copies: {sum(item.stat().st_size for item in gzip_files()) / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""Compare signal_validation's SignalIndex with the full scans it replaced, at 10-100x the old MAX_SIGNALS.
+
+Run from the repository root:
+
+    python -m benchmarks.signal_index_benchmark
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from src.daily_news_bot import signal_validation
+from src.daily_news_bot.signal_validation import (
+    DEDUP_DAYS,
+    HORIZONS,
+    KEEP_DAYS,
+    SignalIndex,
+    _finalize_rows,
+    _horizon_key,
+    _parse_time,
+    _safe_float,
+)
+
+NOW = datetime(2026, 5, 9, 8, 0)
+THEMES = ("ai", "energy_power", "gold_insurance", "semiconductor", "growth_core", "broad_core", "new_energy", "china_macro")
+
+
+def legacy_trim(signals: list[dict[str, Any]], now: datetime, max_signals: int) -> list[dict[str, Any]]:
+    cutoff = now - timedelta(days=KEEP_DAYS)
+    kept = [signal for signal in signals if (_parse_time(signal.get("created_at_utc")) or datetime.min) >= cutoff]
+    kept.sort(key=lambda item: str(item.get("created_at_utc") or ""), reverse=True)
+    return kept[:max_signals]
+
+
+def legacy_is_duplicate(signals: list[dict[str, Any]], code: str, theme_key: str, now: datetime) -> bool:
+    cutoff = now - timedelta(days=DEDUP_DAYS)
+    for signal in signals:
+        if str(signal.get("code") or "") != code or str(signal.get("theme_key") or "") != theme_key:
+            continue
+        created_at = _parse_time(signal.get("created_at_utc"))
+        if created_at is not None and created_at >= cutoff:
+            return True
+    return False
+
+
+def legacy_summarize(signals: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    grouped: dict[str, dict[str, Any]] = {}
+    for signal in signals:
+        theme_key = str(signal.get("theme_key") or "unknown")
+        row = grouped.setdefault(
+            theme_key,
+            {
+                "theme_key": theme_key,
+                "theme": str(signal.get("theme") or theme_key),
+                "signals": 0,
+                **{
+                    _horizon_key(horizon): {
+                        "samples": 0, "hits": 0, "sum_return_pct": 0.0,
+                        "relative_samples": 0, "relative_hits": 0, "sum_relative_return_pct": 0.0,
+                    }
+                    for horizon in HORIZONS
+                },
+            },
+        )
+        row["signals"] += 1
+        for horizon in HORIZONS:
+            obs = (signal.get("observations") or {}).get(_horizon_key(horizon)) or {}
+            return_pct = _safe_float(obs.get("return_pct"))
+            if return_pct is None:
+                continue
+            bucket = row[_horizon_key(horizon)]
+            bucket["samples"] += 1
+            bucket["sum_return_pct"] += return_pct
+            bucket["hits"] += return_pct > 0
+            relative = _safe_float(obs.get("relative_return_pct"))
+            if relative is not None:
+                bucket["relative_samples"] += 1
+                bucket["sum_relative_return_pct"] += relative
+                bucket["relative_hits"] += relative > 0
+    return _finalize_rows(list(grouped.values()))
+
+
+def synthetic_signals(count: int, seed: int = 3) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    signals = []
+    for index in range(count):
+        created_at = NOW - timedelta(minutes=rng.randint(60, (KEEP_DAYS - 1) * 24 * 60))
+        elapsed = (NOW - created_at).days
+        observations = {}
+        for horizon in HORIZONS:
+            if elapsed >= horizon:
+                return_pct = round(rng.gauss(1, 6), 3)
+                observations[_horizon_key(horizon)] = {
+                    "return_pct": return_pct,
+                    "relative_return_pct": round(return_pct - rng.gauss(0.5, 3), 3),
+                    "basis": "close",
+                }
+        theme = rng.choice(THEMES)
+        signals.append(
+            {
+                "id": f"s{index}",
+                "created_at_utc": created_at.isoformat(),
+                "theme": theme,
+                "theme_key": theme,
+                "code": f"{510000 + rng.randint(0, 300)}",
+                "observations": observations,
+            }
+        )
+    return signals
+
+
+def _comparable(rows: list[dict[str, Any]]) -> list[tuple]:
+    result = []
+    for row in rows:
+        buckets = tuple(
+            (row[key]["samples"], row[key]["hits"], row[key]["avg_return_pct"], row[key]["avg_relative_return_pct"])
+            for key in (_horizon_key(horizon) for horizon in HORIZONS)
+        )
+        result.append((row["theme_key"], row["signals"], buckets, row["verdict"]))
+    return sorted(result)
+
+
+def run(count: int, entries: int) -> None:
+    signals = synthetic_signals(count)
+    candidates = [(f"{510000 + index}", THEMES[index % len(THEMES)]) for index in range(entries)]
+
+    with patch.object(signal_validation, "MAX_SIGNALS", count + entries):
+        started = time.perf_counter()
+        kept = legacy_trim(signals, NOW, count + entries)
+        for code, theme in candidates:
+            if not legacy_is_duplicate(kept, code, theme, NOW):
+                kept.append({"created_at_utc": NOW.isoformat(), "code": code, "theme_key": theme, "theme": theme, "observations": {}})
+        kept = legacy_trim(kept, NOW, count + entries)
+        legacy_rows = legacy_summarize(kept)
+        legacy_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = SignalIndex(signals, NOW)
+        load_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        for code, theme in candidates:
+            if not index.is_duplicate(code, theme, NOW):
+                index.add({"created_at_utc": NOW.isoformat(), "code": code, "theme_key": theme, "theme": theme, "observations": {}}, NOW)
+        index_rows = index.rows()
+        update_seconds = time.perf_counter() - started
+
+    if _comparable(index_rows) != _comparable(legacy_rows) or len(index) != len(kept):
+        raise SystemExit("indexed rows differ from the full-scan summary")
+    per_entry_legacy = legacy_seconds / max(1, entries)
+    per_entry_index = update_seconds / max(1, entries)
+    print(f"{count} signals, {entries} candidate entries, rows identical")
+    print(f"  full scans (trim x2, dedupe, summarize): {legacy_seconds * 1000:9.1f} ms ({per_entry_legacy * 1e6:9.1f} us/entry)")
+    print(f"  index load (once per run):               {load_seconds * 1000:9.1f} ms")
+    print(f"  index dedupe+add+rows:                   {update_seconds * 1000:9.1f} ms ({per_entry_index * 1e6:9.1f} us/entry)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--entries", type=int, default=12)
+    args = parser.parse_args(argv)
+    for size in args.sizes:
+        run(size, args.entries)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
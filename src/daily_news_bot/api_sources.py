@@ -8,6 +8,7 @@ import requests
 
 from .config import Settings
 from .fetchers import clean_text
+from .http_client import http_get
 from .models import Article
 
 
@@ -49,7 +50,7 @@ def _safe_error(message: str) -> str:
 
 def _request_json(url: str, params: dict[str, Any], timeout: int = DEFAULT_TIMEOUT) -> tuple[dict[str, Any] | list[Any] | None, str, int | None]:
     try:
-        response = requests.get(url, params=params, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
+        response = http_get(url, params=params, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
     except requests.RequestException as exc:
         return None, _safe_error(f"{type(exc).__name__}: {exc}"), None
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+from typing import Any, Iterable, Sequence
+
+
+def _close_value(value: Any) -> float:
+    # Missing or unparsable closes become 0.0, which forward returns already treat as "no price".
+    try:
+        if value in (None, "", "-"):
+            return 0.0
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PriceSeries:
+    """One instrument's history as parallel day-ordinal / close columns, sorted by day."""
+
+    __slots__ = ("days", "closes")
+
+    def __init__(self, days: array, closes: array) -> None:
+        self.days = days
+        self.closes = closes
+
+    @classmethod
+    def from_points(cls, points: Iterable[dict[str, Any]]) -> "PriceSeries":
+        """Build from normalized points (ISO ``date`` strings, ascending), parsing each date once."""
+        days = array("l")
+        closes = array("d")
+        for point in points:
+            raw = str(point.get("date") or "")[:10]
+            try:
+                day = date.fromisoformat(raw)
+            except ValueError:
+                continue
+            days.append(day.toordinal())
+            closes.append(_close_value(point.get("close")))
+        return cls(days, closes)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def start_indexes(self, trigger_days: Sequence[int]) -> list[int | None]:
+        """Index of the first trading day on or after each trigger day ordinal."""
+        size = len(self.days)
+        days = self.days
+        result: list[int | None] = []
+        for trigger in trigger_days:
+            index = bisect_left(days, trigger)
+            result.append(index if index < size else None)
+        return result
+
+    def forward_returns(self, trigger_days: Sequence[int], horizons: Sequence[int]) -> dict[int, list[float | None]]:
+        """T+horizon percent returns for every trigger day, aligned with ``trigger_days``; None where unavailable."""
+        starts = self.start_indexes(trigger_days)
+        closes = self.closes
+        size = len(closes)
+        result: dict[int, list[float | None]] = {}
+        for horizon in horizons:
+            limit = size - horizon
+            result[horizon] = [
+                round((closes[start + horizon] - closes[start]) / closes[start] * 100, 3)
+                if start is not None and start < limit and closes[start] and closes[start + horizon]
+                else None
+                for start in starts
+            ]
+        return result
+
+
+def summarize_returns(returns: Iterable[float | None]) -> dict[str, Any] | None:
+    values = [value for value in returns if value is not None]
+    if not values:
+        return None
+    positive = sum(1 for value in values if value > 0)
+    return {
+        "samples": len(values),
+        "avg_return_pct": round(sum(values) / len(values), 3),
+        "win_rate_pct": round(positive / len(values) * 100, 1),
+    }
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+from .models import EventCluster
+
+
+T = TypeVar("T")
+
+
+def _join(parts: list[Any]) -> str:
+    return " ".join(str(part) for part in parts if part)
+
+
+def _squash(value: Any) -> str:
+    return " ".join(str(value or "").split())
+
+
+class ClusterFeatures:
+    """Text variants and derived values of one cluster, each built on first use.
+
+    Variants that embed ``cluster.tags`` are keyed by the current tags, so the
+    values read before ranking assigns tags are not served after it.
+    """
+
+    __slots__ = ("cluster", "signature", "_memo", "_lock")
+
+    def __init__(self, cluster: Any, signature: tuple[Any, ...]) -> None:
+        self.cluster = cluster
+        self.signature = signature
+        self._memo: dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def memo(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Cache a lens-specific value (token set, keyword hits, ...) alongside the shared texts."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = build()
+        with self._lock:
+            return self._memo.setdefault(key, value)
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return tuple(getattr(self.cluster, "tags", None) or ())
+
+    @property
+    def representative(self) -> Any:
+        return self.memo("representative", self._representative)
+
+    def _representative(self) -> Any:
+        if isinstance(self.cluster, EventCluster) and self.cluster.articles:
+            return self.cluster.representative
+        return getattr(self.cluster, "representative", None)
+
+    @property
+    def brief_text(self) -> str:
+        """Theme plus the first five titles and summaries, lowercased; what ranking matches against."""
+        return self.memo("brief_text", self._brief_text)
+
+    def _brief_text(self) -> str:
+        parts: list[Any] = [self.cluster.theme]
+        for article in self.cluster.articles[:5]:
+            parts.extend([article.title, article.summary])
+        return _join(parts).lower()
+
+    @property
+    def detail_text(self) -> str:
+        """Theme, tags and the first five articles in full, casefolded; shared by the strategic lenses."""
+        return self.memo(("detail_text", self.tags), self._detail_text)
+
+    def _detail_text(self) -> str:
+        parts: list[Any] = [self.cluster.theme, " ".join(self.tags)]
+        for article in self.cluster.articles[:5]:
+            parts.extend([article.title, article.summary, article.content, article.category, article.region])
+        return _join(parts).casefold()
+
+    @property
+    def radar_text(self) -> str:
+        return self.memo(("radar_text", self.tags), self._radar_text)
+
+    def _radar_text(self) -> str:
+        representative = self.representative
+        parts = [
+            getattr(self.cluster, "theme", ""),
+            " ".join(self.tags),
+            getattr(representative, "title", "") if representative else "",
+            getattr(representative, "summary", "") if representative else "",
+            getattr(representative, "content", "") if representative else "",
+        ]
+        for article in getattr(self.cluster, "articles", [])[:4]:
+            parts.extend(
+                [
+                    getattr(article, "title", ""),
+                    getattr(article, "summary", ""),
+                    getattr(article, "content", ""),
+                    getattr(article, "category", ""),
+                    getattr(article, "region", ""),
+                ]
+            )
+        return " ".join(_squash(part) for part in parts if _squash(part)).casefold()
+
+    @property
+    def headline_text(self) -> str:
+        """Theme with the representative's title and summary, original case."""
+        return self.memo("headline_text", self._headline_text)
+
+    def _headline_text(self) -> str:
+        representative = self.representative
+        return _join([self.cluster.theme, representative.title, representative.summary])
+
+    @property
+    def watch_text(self) -> str:
+        return self.memo(("watch_text", self.tags), self._watch_text)
+
+    def _watch_text(self) -> str:
+        representative = self.representative
+        return _join(
+            [self.cluster.theme, representative.title, representative.summary, representative.source, " ".join(self.tags)]
+        )
+
+    @property
+    def source_text(self) -> str:
+        """Representative title, summary and source, lowercased; what portfolio themes match against."""
+        return self.memo("source_text", self._source_text)
+
+    def _source_text(self) -> str:
+        representative = self.representative
+        return f"{representative.title} {representative.summary} {representative.source}".lower()
+
+
+_STORE: dict[int, ClusterFeatures] = {}
+_STORE_LOCK = threading.Lock()
+
+
+def _signature(cluster: Any) -> tuple[Any, ...]:
+    return (getattr(cluster, "theme", ""), len(getattr(cluster, "articles", None) or ()))
+
+
+def cluster_features(cluster: Any) -> ClusterFeatures:
+    """Per-run features of ``cluster``; rebuilt if its theme or article count changed since last read."""
+    signature = _signature(cluster)
+    features = _STORE.get(id(cluster))
+    if features is not None and features.cluster is cluster and features.signature == signature:
+        return features
+    with _STORE_LOCK:
+        features = _STORE.get(id(cluster))
+        if features is None or features.cluster is not cluster or features.signature != signature:
+            # The store keeps the cluster alive, so its id cannot be reused while the entry exists.
+            features = ClusterFeatures(cluster, signature)
+            _STORE[id(cluster)] = features
+        return features
+
+
+def clear_cluster_features() -> None:
+    with _STORE_LOCK:
+        _STORE.clear()
@@ -2,6 +2,7 @@
 
 import re
 from collections import Counter
+from dataclasses import dataclass, field
 
 from .models import Article, EventCluster
 
@@ -117,8 +118,11 @@ def article_tokens(article: Article) -> set[str]:
 
 
 def similarity(left: Article, right: Article) -> float:
-    left_tokens = article_tokens(left)
-    right_tokens = article_tokens(right)
+    return _token_similarity(left, article_tokens(left), right, article_tokens(right))
+
+
+
+def _token_similarity(left: Article, left_tokens: set[str], right: Article, right_tokens: set[str]) -> float:
     if not left_tokens or not right_tokens:
         return 0.0
 
@@ -152,48 +156,112 @@ def similarity(left: Article, right: Article) -> float:
 
 
 
+def _representative_key(article: Article) -> tuple[float, float]:
+    return (article.source_weight, article.published_at.timestamp())
+
+
+
+def _theme_from_counts(representative: Article, counter: Counter) -> str:
+    keywords = [token for token, _ in counter.most_common(4)]
+    if keywords:
+        return f"{representative.title} ｜ 关键词：{' / '.join(keywords)}"
+    return representative.title
+
+
+
 def build_theme(articles: list[Article]) -> str:
     if not articles:
         return "未命名事件"
 
-    representative = sorted(
-        articles,
-        key=lambda item: (item.source_weight, item.published_at.timestamp()),
-        reverse=True,
-    )[0]
+    representative = max(articles, key=_representative_key)
 
     counter = Counter()
     for article in articles:
         counter.update(article_tokens(article))
+    return _theme_from_counts(representative, counter)
 
-    keywords = [token for token, _ in counter.most_common(4)]
-    if keywords:
-        return f"{representative.title} ｜ 关键词：{' / '.join(keywords)}"
-    return representative.title
 
 
+@dataclass(slots=True)
+class _ClusterState:
+    cluster: EventCluster
+    representative: Article
+    representative_tokens: set[str]
+    token_counts: Counter = field(default_factory=Counter)
 
-def cluster_articles(articles: list[Article], threshold: float = 0.33) -> list[EventCluster]:
-    clusters: list[EventCluster] = []
 
-    for article in articles:
-        matched_cluster: EventCluster | None = None
+class IncrementalClusterer:
+    """Greedy single-pass clustering that only scores clusters sharing a non-broad token with the article.
+
+    A pair can only clear the threshold when it shares an anchor or at least two
+    non-broad tokens, so indexing representatives by their non-broad tokens finds
+    every cluster the exhaustive scan could have picked, and ties still go to the
+    oldest cluster.
+    """
+
+    def __init__(self, threshold: float = 0.33) -> None:
+        self.threshold = threshold
+        self._states: list[_ClusterState] = []
+        self._index: dict[str, set[int]] = {}
+
+    def add(self, article: Article) -> EventCluster:
+        tokens = article_tokens(article)
+        best_position: int | None = None
         best_score = 0.0
-        for cluster in clusters:
-            score = similarity(article, cluster.representative)
-            if score >= threshold and score > best_score:
-                matched_cluster = cluster
+        candidates: set[int] = set()
+        for token in tokens - BROAD_TOPIC_WORDS:
+            candidates.update(self._index.get(token, ()))
+        for position in sorted(candidates):
+            state = self._states[position]
+            score = _token_similarity(article, tokens, state.representative, state.representative_tokens)
+            if score >= self.threshold and score > best_score:
+                best_position = position
                 best_score = score
 
-        if matched_cluster is None:
+        if best_position is None:
             cluster_id = re.sub(r"[^a-z0-9]", "", representative_id(article.title))[:12]
-            matched_cluster = EventCluster(cluster_id=cluster_id or "event", theme=article.title)
-            clusters.append(matched_cluster)
+            state = _ClusterState(
+                cluster=EventCluster(cluster_id=cluster_id or "event", theme=article.title),
+                representative=article,
+                representative_tokens=tokens,
+            )
+            self._states.append(state)
+            self._index_tokens(len(self._states) - 1, tokens)
+        else:
+            state = self._states[best_position]
+            # Ties keep the earlier member, matching EventCluster.representative.
+            if _representative_key(article) > _representative_key(state.representative):
+                self._unindex_tokens(best_position, state.representative_tokens)
+                state.representative = article
+                state.representative_tokens = tokens
+                self._index_tokens(best_position, tokens)
+
+        state.cluster.articles.append(article)
+        state.token_counts.update(tokens)
+        return state.cluster
+
+    def clusters(self) -> list[EventCluster]:
+        for state in self._states:
+            state.cluster.theme = _theme_from_counts(state.representative, state.token_counts)
+        return [state.cluster for state in self._states]
+
+    def _index_tokens(self, position: int, tokens: set[str]) -> None:
+        for token in tokens - BROAD_TOPIC_WORDS:
+            self._index.setdefault(token, set()).add(position)
+
+    def _unindex_tokens(self, position: int, tokens: set[str]) -> None:
+        for token in tokens - BROAD_TOPIC_WORDS:
+            positions = self._index.get(token)
+            if positions is not None:
+                positions.discard(position)
 
-        matched_cluster.articles.append(article)
-        matched_cluster.theme = build_theme(matched_cluster.articles)
 
-    return clusters
+
+def cluster_articles(articles: list[Article], threshold: float = 0.33) -> list[EventCluster]:
+    clusterer = IncrementalClusterer(threshold)
+    for article in articles:
+        clusterer.add(article)
+    return clusterer.clusters()
 
 
 
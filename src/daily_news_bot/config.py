@@ -43,6 +43,14 @@ class Settings:
     alpha_vantage_api_key: str
     polygon_api_key: str
     marketaux_api_key: str
+    near_duplicate_threshold: float = 0.6
+    llm_cache_ttl_seconds: int = 6 * 3600
+    llm_failure_ttl_seconds: int = 600
+    llm_max_concurrency: int = 2
+    llm_stream: bool = False
+    llm_first_token_timeout: float = 20.0
+    llm_max_output_tokens: int = 0
+    prompt_token_budget: int = 6000
 
 
 def _read_env_file(path: Path) -> dict[str, str]:
@@ -134,6 +142,14 @@ def load_settings() -> Settings:
         alpha_vantage_api_key=_pick(env_file_values, "ALPHA_VANTAGE_API_KEY", "").strip(),
         polygon_api_key=_pick(env_file_values, "POLYGON_API_KEY", "").strip(),
         marketaux_api_key=_pick(env_file_values, "MARKETAUX_API_KEY", "").strip(),
+        near_duplicate_threshold=float(_pick(env_file_values, "NEAR_DUPLICATE_THRESHOLD", "0.6")),
+        llm_cache_ttl_seconds=int(_pick(env_file_values, "NEWS_LLM_CACHE_TTL", str(6 * 3600))),
+        llm_failure_ttl_seconds=int(_pick(env_file_values, "NEWS_LLM_FAILURE_TTL", "600")),
+        llm_max_concurrency=max(1, int(_pick(env_file_values, "NEWS_LLM_CONCURRENCY", "2"))),
+        llm_stream=_env_bool(_pick(env_file_values, "NEWS_LLM_STREAM", "false"), False),
+        llm_first_token_timeout=float(_pick(env_file_values, "NEWS_LLM_FIRST_TOKEN_TIMEOUT", "20")),
+        llm_max_output_tokens=max(0, int(_pick(env_file_values, "NEWS_LLM_MAX_TOKENS", "0"))),
+        prompt_token_budget=max(0, int(_pick(env_file_values, "NEWS_PROMPT_TOKEN_BUDGET", "6000"))),
     )
 
 
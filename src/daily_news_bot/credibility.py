@@ -5,6 +5,7 @@ from statistics import mean
 from typing import Any
 from urllib.parse import urlparse
 
+from .keyword_matcher import KeywordMatcher
 from .models import Article, EventCluster
 
 
@@ -158,6 +159,27 @@ PRESS_RELEASE_TERMS = (
 )
 
 
+SOURCE_MATCHER = KeywordMatcher(
+    {
+        "high": HIGH_TRUST_SOURCE_KEYWORDS,
+        "medium": MEDIUM_TRUST_SOURCE_KEYWORDS,
+        "low": LOW_TRUST_SOURCE_KEYWORDS,
+        "wire": ("globenewswire", "pr newswire", "accesswire", "business wire"),
+    },
+    normalize=str,
+)
+CONTENT_MATCHER = KeywordMatcher(
+    {
+        "hard_block": HARD_BLOCK_TERMS,
+        "rumor": RUMOR_TERMS,
+        "social": SOCIAL_ONLY_TERMS,
+        "commentary": COMMENTARY_TERMS,
+        "press_release": PRESS_RELEASE_TERMS,
+    },
+    normalize=str,
+)
+
+
 def _normalize(text: str | None) -> str:
     return (text or "").strip().lower()
 
@@ -169,10 +191,6 @@ def _source_domain(url: str) -> str:
     return netloc
 
 
-def _matches_any(text: str, keywords: tuple[str, ...]) -> bool:
-    return any(keyword in text for keyword in keywords)
-
-
 def _rootish_domain(domain: str) -> str:
     if not domain:
         return ""
@@ -207,30 +225,32 @@ def assess_article_credibility(article: Article) -> Article:
         flags.append("官方源")
 
     trust_text = f"{source_text} {domain}"
-    if _matches_any(trust_text, HIGH_TRUST_SOURCE_KEYWORDS):
+    source_hits = SOURCE_MATCHER.scan(trust_text)
+    content_hits = CONTENT_MATCHER.scan(joined_text)
+    if source_hits.any("high"):
         score += 0.24
         flags.append("高可信来源")
-    elif _matches_any(trust_text, MEDIUM_TRUST_SOURCE_KEYWORDS):
+    elif source_hits.any("medium"):
         score += 0.10
         flags.append("主流媒体")
 
-    if _matches_any(trust_text, LOW_TRUST_SOURCE_KEYWORDS):
+    if source_hits.any("low"):
         score -= 0.18
         flags.append("低可信来源")
 
-    if _matches_any(joined_text, HARD_BLOCK_TERMS):
+    if content_hits.any("hard_block"):
         score -= 0.35
         flags.append("疑似伪造/恶搞")
-    if _matches_any(joined_text, RUMOR_TERMS):
+    if content_hits.any("rumor"):
         score -= 0.18
         flags.append("传闻/未证实措辞")
-    if _matches_any(joined_text, SOCIAL_ONLY_TERMS):
+    if content_hits.any("social"):
         score -= 0.15
         flags.append("社交平台二手信号")
-    if _matches_any(joined_text, COMMENTARY_TERMS):
+    if content_hits.any("commentary"):
         score -= 0.10
         flags.append("评论/观点内容")
-    if _matches_any(joined_text, PRESS_RELEASE_TERMS) or _matches_any(trust_text, ("globenewswire", "pr newswire", "accesswire", "business wire")):
+    if content_hits.any("press_release") or source_hits.any("wire"):
         score -= 0.14
         flags.append("公告/稿线分发")
 
@@ -307,6 +327,7 @@ def assess_cluster_credibility(cluster: EventCluster) -> EventCluster:
     high_articles = [article for article in articles if article.credibility_label == "高"]
     official_articles = [article for article in articles if article.official_source]
     domains = {_rootish_domain(article.source_domain) for article in reliable_articles if article.source_domain}
+    domains.update(_rootish_domain(domain) for article in articles for domain in article.syndicated_domains)
     scores = [article.credibility_score for article in articles[:6]]
     base_score = mean(scores) if scores else 0.0
 
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from functools import lru_cache
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
 import re
 from html import escape
-from typing import Any
+from typing import Any, Callable, Iterator, Mapping
 
+from src.daily_news_bot import profiling
+from src.daily_news_bot.profiling import format_timings_summary
 from src.daily_news_bot.signal_validation import MIN_ADJUSTMENT_SAMPLES
 
 FIXED_POOL_MIN_WIN_SAMPLES = 8
@@ -432,11 +440,23 @@ def _coverage_body(payload: dict[str, Any]) -> str:
         ["新闻窗口", escape(f'{_compact_time(data_quality.get("window_start_utc") or payload.get("window_start_utc"))} → {_compact_time(data_quality.get("generated_at_utc") or payload.get("generated_at_utc"))}')],
         ["实际新闻", escape(f'{_compact_time(data_quality.get("oldest_article_at_utc") or payload.get("oldest_article_at_utc"))} → {_compact_time(data_quality.get("latest_article_at_utc") or payload.get("latest_article_at_utc"))}')],
         ["RSS 覆盖", escape(f'{coverage.get("rss_sources_with_articles", 0)}/{coverage.get("rss_sources_configured", 0)}')],
+        ["RSS 缓存", escape(f'未变化复用 {coverage.get("feed_cache_hits", 0)}｜重新下载 {coverage.get("feed_cache_misses", 0)}')],
         ["API 覆盖", escape(f'{coverage.get("api_sources_with_articles", 0)}/{coverage.get("api_sources_enabled", 0)}')],
         ["官方源", escape(f'{coverage.get("official_sources_with_articles", 0)}/{coverage.get("configured_official_sources", 0)}；官方网页 {data_quality.get("official_page_articles_count", payload.get("official_page_articles_count", 0))} 条')],
-        ["市场价格", escape(f'{market_coverage.get("returned_assets", 0)}/{market_coverage.get("configured_assets", 0)}')],
+        ["市场价格", escape(f'{market_coverage.get("returned_assets", 0)}/{market_coverage.get("configured_assets", 0)}' + (f'；缓存复用 {market_coverage["cached_assets"]}' if market_coverage.get("cached_assets") else ""))],
         ["低可信过滤", escape(f"{filtered} 条")],
+        ["转载合并", escape(f'{credibility.get("near_duplicates_collapsed", 0)} 条')],
     ]
+    if payload.get("timings"):
+        rows.append(["运行耗时", escape(format_timings_summary(payload["timings"]))])
+    prompt_budget = payload.get("prompt_budget") or {}
+    if prompt_budget:
+        prompt_text = f'约 {prompt_budget.get("estimated_tokens", 0)} token'
+        if prompt_budget.get("trimmed_clusters"):
+            prompt_text += f'｜精简 {prompt_budget["trimmed_clusters"]} 个事件（原约 {prompt_budget.get("untrimmed_estimated_tokens", 0)}）'
+        if prompt_budget.get("token_budget"):
+            prompt_text += f'｜预算 {prompt_budget["token_budget"]}'
+        rows.append(["日报提示词", escape(prompt_text)])
     body = _render_table(["项目", "状态"], rows)
     empty_sample = data_quality.get("empty_sources_sample") or []
     if empty_sample:
@@ -2820,89 +2840,297 @@ a:hover {
 """
 
 
-def render_dashboard_html(payload: dict[str, Any]) -> str:
-    portfolio = payload.get("portfolio") or {}
-    weekly = payload.get("weekly_review") or {}
-    data_quality = payload.get("data_quality") or {}
-    output_paths = payload.get("output_paths") or {}
-    dashboard = payload.get("dashboard") or {}
-    watchlist = payload.get("watchlist") or {}
-    market_snapshot = payload.get("market_snapshot") or {}
-    translations = ((payload.get("translations") or {}).get("items") or {})
-    title_translations = _title_translation_map(payload.get("clusters"), translations)
-    generated = data_quality.get("generated_at_bjt") or payload.get("generated_at_utc") or "未知"
-    global_overview = _translated_overview(payload, translations)
-    archive_url = output_paths.get("archive_index_url") or dashboard.get("archive_index_url")
-    report_url = output_paths.get("report_md_url") or output_paths.get("report_md_uri")
+DASHBOARD_CSS_FILE = "dashboard.css"
+DASHBOARD_RENDER_CACHE_FILE = "dashboard_render_cache.json"
+_RENDER_CACHE_VERSION = 1
+
+
+def dashboard_css() -> str:
+    return _CSS
+
+
+def dashboard_css_href(filename: str = DASHBOARD_CSS_FILE) -> str:
+    """Relative link to the shared stylesheet, versioned by content so browsers refetch it only when it changes."""
+    return f"{filename}?v={hashlib.sha256(_CSS.encode('utf-8')).hexdigest()[:12]}"
+
 
-    hero = _hero_panel(payload, global_overview, market_snapshot)
+def _translation_items(payload: dict[str, Any]) -> dict[str, Any]:
+    return (payload.get("translations") or {}).get("items") or {}
 
+
+def _global_overview(payload: dict[str, Any]) -> str:
+    return _translated_overview(payload, _translation_items(payload))
+
+
+def _archive_index_url(payload: dict[str, Any]) -> Any:
+    return (payload.get("output_paths") or {}).get("archive_index_url") or (payload.get("dashboard") or {}).get("archive_index_url")
+
+
+def _top_actions(payload: dict[str, Any]) -> str:
+    output_paths = payload.get("output_paths") or {}
+    report_url = output_paths.get("report_md_url") or output_paths.get("report_md_uri")
+    archive_url = _archive_index_url(payload)
     actions = []
     if report_url:
         actions.append(_link("打开完整日报", report_url, "button-link"))
     if archive_url:
         actions.append(_link("历史归档", archive_url, "button-link"))
-    top_actions = '<div class="top-actions">' + "".join(actions) + "</div>" if actions else ""
-
-    detail_sections = [
-        _weekly_main_section(payload),
-        _system_boundary_section(payload),
-        _section("今日核心事件", _cluster_rows(payload.get("clusters"), translations), "按重要性、可信度和来源交叉验证排序；外文标题优先转中文，失败时隐藏长英文。", "wide", "events"),
-        _macro_burst_risk_section(payload),
-        _strategic_lens_section(payload),
-        _prediction_lens_section(payload),
-        _signal_validation_section(payload),
-        _logic_playbook_section(payload),
-        _action_guidance_section(payload),
-        _section(
-            "市场快照",
-            _render_table(["资产", "价格", "涨跌", "状态", "行情时间"], _market_rows(market_snapshot)),
-            f'{_text(market_snapshot.get("provider"), "价格源未知")}；用于看新闻是否已被价格确认，数据可能延迟，交易前二次确认实时行情和盘口。',
-            section_id="market",
+    return '<div class="top-actions">' + "".join(actions) + "</div>" if actions else ""
+
+
+def _events_section(payload: dict[str, Any]) -> str:
+    return _section(
+        "今日核心事件",
+        _cluster_rows(payload.get("clusters"), _translation_items(payload)),
+        "按重要性、可信度和来源交叉验证排序；外文标题优先转中文，失败时隐藏长英文。",
+        "wide",
+        "events",
+    )
+
+
+def _market_section(payload: dict[str, Any]) -> str:
+    market_snapshot = payload.get("market_snapshot") or {}
+    return _section(
+        "市场快照",
+        _render_table(["资产", "价格", "涨跌", "状态", "行情时间"], _market_rows(market_snapshot)),
+        f'{_text(market_snapshot.get("provider"), "价格源未知")}；用于看新闻是否已被价格确认，数据可能延迟，交易前二次确认实时行情和盘口。',
+        section_id="market",
+    )
+
+
+def _watchlist_section(payload: dict[str, Any]) -> str:
+    watchlist = payload.get("watchlist") or {}
+    title_translations = _title_translation_map(payload.get("clusters"), _translation_items(payload))
+    return _section(
+        "提醒与记忆",
+        _watchlist_rows(watchlist, title_translations),
+        f'触发 {watchlist.get("triggered_count", 0)} · 新增 {watchlist.get("new_count", 0)} · 有效 {watchlist.get("active_count", 0)}',
+        section_id="watchlist",
+    )
+
+
+_OVERVIEW_KEYS = ("clusters", "global_30s_overview", "translations")
+_RECEIPT_KEYS = ("feishu_receipts",)
+
+# Each cacheable part of the page, the top-level payload keys it reads, and how to render it from them.
+# A part is re-rendered only when the hash of its keys' values (or this module) changes.
+_PAGE_PARTS: tuple[tuple[str, tuple[str, ...], Callable[[dict[str, Any]], str]], ...] = (
+    ("top_actions", ("output_paths", "dashboard"), _top_actions),
+    (
+        "status_bar",
+        ("data_quality", "generated_at_utc", "mode", "watchlist", *_RECEIPT_KEYS),
+        lambda payload: _status_bar(
+            payload,
+            (payload.get("data_quality") or {}).get("generated_at_bjt") or payload.get("generated_at_utc") or "未知",
         ),
-        _section(
-            "提醒与记忆",
-            _watchlist_rows(watchlist, title_translations),
-            f'触发 {watchlist.get("triggered_count", 0)} · 新增 {watchlist.get("new_count", 0)} · 有效 {watchlist.get("active_count", 0)}',
-            section_id="watchlist",
+    ),
+    ("quick_nav", ("output_paths", "dashboard"), lambda payload: _quick_nav(_archive_index_url(payload))),
+    ("translation_notice", ("translations",), _translation_notice),
+    (
+        "hero",
+        ("articles_count", "data_quality", "market_snapshot", "selected_count", "tag_distribution", *_RECEIPT_KEYS, *_OVERVIEW_KEYS),
+        lambda payload: _hero_panel(payload, _global_overview(payload), payload.get("market_snapshot") or {}),
+    ),
+    ("decision_strip", ("clusters", "data_quality", "portfolio", "translations", "watchlist", *_RECEIPT_KEYS), _decision_strip),
+    (
+        "cockpit",
+        ("macro_burst_risk", "market_snapshot", "portfolio", *_OVERVIEW_KEYS),
+        lambda payload: _cockpit_section(
+            payload,
+            _global_overview(payload),
+            payload.get("market_snapshot") or {},
+            _translation_items(payload),
         ),
-        _section("操作回执", _receipt_status_body(payload), "飞书群里有交易才填；没操作不用回复，系统按原仓位继续。", section_id="receipts"),
-        _section("数据质量", _coverage_body(payload), "看覆盖、时效和过滤情况，避免把缺数据误当判断。", section_id="quality"),
-        _section("报告入口", _path_links(output_paths, dashboard), section_id="links"),
-    ]
-    detail_sections.extend(_portfolio_sections(portfolio, weekly))
-    sections = [
-        _cockpit_section(payload, global_overview, market_snapshot, translations),
-        _detail_review_panel(detail_sections),
-    ]
+    ),
+)
+_DETAIL_SECTIONS: tuple[tuple[str, tuple[str, ...], Callable[[dict[str, Any]], str]], ...] = (
+    ("weekly_main", ("output_paths", "portfolio", "signal_validation", "weekly_review"), _weekly_main_section),
+    ("system_boundary", ("signal_validation", "watchlist"), _system_boundary_section),
+    ("events", ("clusters", "translations"), _events_section),
+    ("macro_burst_risk", ("macro_burst_risk",), _macro_burst_risk_section),
+    ("strategic_lens", ("strategic_lens",), _strategic_lens_section),
+    ("prediction_lens", ("prediction_lens",), _prediction_lens_section),
+    ("signal_validation", ("signal_validation",), _signal_validation_section),
+    ("logic_playbook", ("logic_playbook",), _logic_playbook_section),
+    ("action_guidance", ("portfolio",), _action_guidance_section),
+    ("market", ("market_snapshot",), _market_section),
+    ("watchlist", ("clusters", "translations", "watchlist"), _watchlist_section),
+    (
+        "receipts",
+        _RECEIPT_KEYS,
+        lambda payload: _section("操作回执", _receipt_status_body(payload), "飞书群里有交易才填；没操作不用回复，系统按原仓位继续。", section_id="receipts"),
+    ),
+    (
+        "quality",
+        (
+            "credibility_summary",
+            "data_quality",
+            "generated_at_utc",
+            "latest_article_at_utc",
+            "market_snapshot",
+            "official_page_articles_count",
+            "oldest_article_at_utc",
+            "prompt_budget",
+            "source_coverage",
+            "timings",
+            "window_start_utc",
+        ),
+        lambda payload: _section("数据质量", _coverage_body(payload), "看覆盖、时效和过滤情况，避免把缺数据误当判断。", section_id="quality"),
+    ),
+    (
+        "links",
+        ("output_paths", "dashboard"),
+        lambda payload: _section("报告入口", _path_links(payload.get("output_paths") or {}, payload.get("dashboard") or {}), section_id="links"),
+    ),
+    (
+        "portfolio",
+        ("portfolio", "weekly_review"),
+        lambda payload: "".join(_portfolio_sections(payload.get("portfolio") or {}, payload.get("weekly_review") or {})),
+    ),
+)
+
+
+@lru_cache(maxsize=1)
+def _render_version() -> str:
+    # Rendering code lives here and in the timing formatter; editing either invalidates every cached part.
+    digest = hashlib.sha256(f"{_RENDER_CACHE_VERSION}:{MIN_ADJUSTMENT_SAMPLES}".encode("utf-8"))
+    for path in (Path(__file__), Path(profiling.__file__)):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class _SectionView(Mapping[str, Any]):
+    """The payload keys one page part declared; reading any other key raises instead of rendering empty."""
+
+    def __init__(self, name: str, keys: tuple[str, ...], payload: dict[str, Any]) -> None:
+        self._name = name
+        self._keys = frozenset(keys)
+        self._payload = payload
+
+    def _check(self, key: Any) -> None:
+        if key not in self._keys:
+            raise KeyError(f"dashboard part {self._name!r} reads undeclared payload key {key!r}")
+
+    def __getitem__(self, key: Any) -> Any:
+        self._check(key)
+        return self._payload[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        # Mapping.get would swallow the KeyError from an undeclared key.
+        self._check(key)
+        return self._payload.get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        self._check(key)
+        return key in self._payload
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._payload if key in self._keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class SectionCache:
+    """Rendered page parts from the previous run, keyed by a hash of the payload slice each one reads."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path else None
+        self.version = _render_version() if self.path else ""
+        self.hits = 0
+        self.misses = 0
+        self._previous: dict[str, dict[str, str]] = {}
+        self._current: dict[str, dict[str, str]] = {}
+        self._digests: dict[str, str | None] = {}
+        if self.path is None:
+            return
+        try:
+            stored = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(stored, dict) and stored.get("version") == self.version and isinstance(stored.get("parts"), dict):
+            self._previous = stored["parts"]
+
+    def begin(self) -> None:
+        """Forget the per-key digests of the previous payload; called once per rendered page."""
+        self._digests: dict[str, str | None] = {}
+
+    def _digest(self, payload: dict[str, Any], key: str) -> str | None:
+        # Several parts read the same keys (clusters, translations), so each value is serialized once per page.
+        if key not in self._digests:
+            try:
+                encoded = json.dumps(payload.get(key), ensure_ascii=False, sort_keys=True, default=str)
+            except (TypeError, ValueError):
+                self._digests[key] = None
+            else:
+                self._digests[key] = hashlib.sha256(f"{key in payload}:{encoded}".encode("utf-8")).hexdigest()
+        return self._digests[key]
+
+    def render(self, name: str, keys: tuple[str, ...], render: Callable[[dict[str, Any]], str], payload: dict[str, Any]) -> str:
+        # Sections only ever see their own slice, so an undeclared read fails instead of going stale in the cache.
+        view = _SectionView(name, keys, payload)
+        if self.path is None:
+            return render(view)
+        digests = [self._digest(payload, key) for key in keys]
+        if None in digests:
+            self.misses += 1
+            return render(view)
+        key = hashlib.sha256("|".join(digests).encode("ascii")).hexdigest()
+        previous = self._previous.get(name) or {}
+        if previous.get("key") == key and isinstance(previous.get("html"), str):
+            self.hits += 1
+            html = previous["html"]
+        else:
+            self.misses += 1
+            html = render(view)
+        self._current[name] = {"key": key, "html": html}
+        return html
 
-    html = f"""<!doctype html>
-<html lang="zh-CN">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <title>每日投资雷达</title>
-  <style>{_CSS}</style>
-</head>
-<body>
-  <div class="wrap">
-    <header class="topbar">
-      <div>
-        <div class="eyebrow">投资雷达</div>
-        <h1>每日投资雷达</h1>
-        <div class="subtitle">公开页看结论和证据；具体组合动作走飞书私密推送；本页不是交易指令，不保证收益。</div>
-      </div>
-      {top_actions}
-    </header>
-    {_status_bar(payload, generated)}
-    {_quick_nav(archive_url)}
-    {_translation_notice(payload)}
-    {hero}
-    {_decision_strip(payload)}
-    <main class="grid">{''.join(sections)}</main>
-    <div class="footer">本页不是交易指令，不保证收益；公开 RSS/API/官方网页抓取有覆盖边界，重大交易前请二次确认官方源、实时行情和个人组合约束。</div>
-  </div>
-</body>
-</html>
-"""
-    return html
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        temp_path.write_text(json.dumps({"version": self.version, "parts": self._current}, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+def render_dashboard_html(
+    payload: dict[str, Any],
+    cache: SectionCache | None = None,
+    css_href: str | None = None,
+) -> str:
+    """Render the dashboard page.
+
+    With a ``cache``, parts whose payload slice is unchanged since the cached run are reused. With a
+    ``css_href`` the stylesheet is linked (see ``dashboard_css``) instead of inlined.
+    """
+    cache = cache or SectionCache()
+    cache.begin()
+    parts = {name: cache.render(name, keys, render, payload) for name, keys, render in _PAGE_PARTS}
+    detail_sections = [cache.render(name, keys, render, payload) for name, keys, render in _DETAIL_SECTIONS]
+    cache.save()
+
+    style = f'<link rel="stylesheet" href="{escape(css_href)}">' if css_href else f"<style>{_CSS}</style>"
+    out = io.StringIO()
+    out.write(
+        '<!doctype html>\n<html lang="zh-CN">\n<head>\n  <meta charset="utf-8">\n'
+        '  <meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"  <title>每日投资雷达</title>\n  {style}\n</head>\n<body>\n"
+        '  <div class="wrap">\n    <header class="topbar">\n      <div>\n'
+        '        <div class="eyebrow">投资雷达</div>\n        <h1>每日投资雷达</h1>\n'
+        '        <div class="subtitle">公开页看结论和证据；具体组合动作走飞书私密推送；本页不是交易指令，不保证收益。</div>\n'
+        "      </div>\n"
+    )
+    out.write(f"      {parts['top_actions']}\n    </header>\n")
+    for name in ("status_bar", "quick_nav", "translation_notice", "hero", "decision_strip"):
+        out.write(f"    {parts[name]}\n")
+    out.write('    <main class="grid">')
+    out.write(parts["cockpit"])
+    out.write(_detail_review_panel(detail_sections))
+    out.write(
+        "</main>\n"
+        '    <div class="footer">本页不是交易指令，不保证收益；公开 RSS/API/官方网页抓取有覆盖边界，重大交易前请二次确认官方源、实时行情和个人组合约束。</div>\n'
+        "  </div>\n</body>\n</html>\n"
+    )
+    return out.getvalue()
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
 from typing import Any
 
 from .config import ROOT_DIR
+from .state_store import append_state_records, load_state, save_state
 
 
 JOURNAL_PATH = ROOT_DIR / "outputs" / "decision_journal.json"
@@ -97,18 +97,12 @@ def _build_advice_items(generated_at: datetime, action_lines: list[str]) -> list
 
 
 def load_decision_journal(path: Path = JOURNAL_PATH) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return []
+    payload = load_state(path)
     return payload if isinstance(payload, list) else []
 
 
 def save_decision_journal(records: list[dict[str, Any]], path: Path = JOURNAL_PATH) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_state(path, records)
 
 
 def build_decision_snapshot(
@@ -183,19 +177,8 @@ def update_decision_journal(
     path: Path = JOURNAL_PATH,
     keep_days: int = 120,
 ) -> None:
-    records = load_decision_journal(path)
     cutoff = datetime.utcnow() - timedelta(days=keep_days)
-    kept: list[dict[str, Any]] = []
-    for item in records:
-        try:
-            ts = datetime.fromisoformat(str(item.get("generated_at_utc") or ""))
-        except ValueError:
-            continue
-        if ts >= cutoff:
-            kept.append(item)
-    kept.append(snapshot)
-    kept.sort(key=lambda item: str(item.get("generated_at_utc") or ""))
-    save_decision_journal(kept, path)
+    append_state_records(path, [snapshot], keep_from=cutoff.isoformat())
 
 
 def build_advice_tracking(
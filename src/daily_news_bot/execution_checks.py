@@ -5,7 +5,7 @@ import json
 import re
 from typing import Any
 
-import requests
+from .http_client import http_get
 
 
 EASTMONEY_QUOTE_URL = "https://push2.eastmoney.com/api/qt/stock/get"
@@ -33,7 +33,7 @@ def _secid(code: str) -> str:
 
 
 def fetch_intraday_nav_estimate(code: str, timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
-    response = requests.get(
+    response = http_get(
         FUND_ESTIMATE_URL.format(code=code),
         headers={"User-Agent": "Mozilla/5.0", "Referer": "https://fund.eastmoney.com/"},
         timeout=timeout,
@@ -54,7 +54,7 @@ def fetch_intraday_nav_estimate(code: str, timeout: int = DEFAULT_TIMEOUT) -> di
 
 
 def fetch_etf_execution_quote(code: str, timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
-    response = requests.get(
+    response = http_get(
         EASTMONEY_QUOTE_URL,
         params={"secid": _secid(code), "fields": "f43,f44,f45,f46,f47,f48,f57,f58,f60,f116,f168,f169,f170,f171"},
         headers={"User-Agent": "Mozilla/5.0"},
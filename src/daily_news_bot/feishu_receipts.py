@@ -9,9 +9,9 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any
 
-import requests
 import yaml
 
+from .http_client import http_request
 from .trade_ledger import load_trade_ledger
 from .trade_receipts import is_trade_receipt_text, parse_trade_receipt
 
@@ -31,7 +31,7 @@ def _request_json(
     headers = {"content-type": "application/json; charset=utf-8"}
     if token:
         headers["authorization"] = f"Bearer {token}"
-    response = requests.request(
+    response = http_request(
         method,
         f"{API_BASE}{path}",
         headers=headers,
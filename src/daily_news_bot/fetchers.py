@@ -1,17 +1,29 @@
 from __future__ import annotations
 
 import html
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from pathlib import Path
 from time import struct_time
 from typing import Any
 
 import feedparser
+import requests
 
+from .config import ROOT_DIR
+from .http_client import http_get
 from .models import Article, SourceDef
 
 
+FEED_CACHE_PATH = ROOT_DIR / "outputs" / "feed_cache.json"
+FEED_CACHE_MAX_ENTRIES = 60
+DEFAULT_TIMEOUT = 15
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TOTAL_BUDGET = 90
 TAG_RE = re.compile(r"<[^>]+>")
 WHITESPACE_RE = re.compile(r"\s+")
 
@@ -66,6 +78,15 @@ def extract_summary(entry: dict) -> str:
     return ""
 
 
+def _parse_cached_datetime(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
 def _new_status(source: SourceDef) -> dict[str, Any]:
     return {
         "name": source.name,
@@ -83,33 +104,113 @@ def _new_status(source: SourceDef) -> dict[str, Any]:
         "skipped_invalid": 0,
         "latest_published_at": None,
         "oldest_published_at": None,
+        "cache_hits": 0,
+        "cache_misses": 0,
         "ok": True,
         "error": "",
     }
 
 
+def load_feed_cache(path: str | Path | None = None) -> dict[str, Any]:
+    target = Path(path) if path else FEED_CACHE_PATH
+    if not target.exists():
+        return {}
+    try:
+        payload = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_feed_cache(payload: dict[str, Any], path: str | Path | None = None) -> None:
+    target = Path(path) if path else FEED_CACHE_PATH
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _entry_record(entry: dict) -> dict[str, Any]:
+    published_at = parse_datetime(entry)
+    return {
+        "title": clean_text(entry.get("title", "")),
+        "link": entry.get("link", "").strip(),
+        "summary": extract_summary(entry),
+        "published_at": published_at.isoformat() if published_at else None,
+    }
+
+
+def _download_feed(
+    source: SourceDef,
+    timeout: int,
+    cached: dict[str, Any] | None = None,
+) -> tuple[Any | None, requests.Response | None]:
+    # feedparser's own HTTP client has no socket timeout, so a stalled endpoint
+    # could hold a worker forever; download with a deadline and parse the body.
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = str(cached["etag"])
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = str(cached["modified"])
+    # One attempt only: retries would stretch the per-source deadline. Like feedparser's own client, a
+    # network error or an HTTP error page comes back as a bozo feed, so the source still counts as reached.
+    try:
+        response = http_get(source.url, headers=headers, timeout=timeout, retries=0)
+    except requests.RequestException as exc:
+        return feedparser.FeedParserDict(bozo=1, bozo_exception=exc, entries=[]), None
+    if response.status_code == 304 and cached:
+        return None, response
+    feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+    if response.status_code >= 400:
+        feed["bozo"] = 1
+        feed["bozo_exception"] = f"HTTP {response.status_code}"
+    return feed, response
+
+
 def fetch_source_articles(
     source: SourceDef,
     hours_back: int,
     per_source_limit: int,
     now: datetime | None = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    cache: dict[str, Any] | None = None,
 ) -> tuple[list[Article], dict[str, Any]]:
     current = (now or datetime.utcnow()).replace(tzinfo=None)
     cutoff = current - timedelta(hours=hours_back)
     status = _new_status(source)
 
-    feed = feedparser.parse(source.url)
-    if getattr(feed, "bozo", 0):
-        bozo_exception = getattr(feed, "bozo_exception", "")
-        if bozo_exception:
-            status["error"] = str(bozo_exception)[:300]
-
-    entries = list(getattr(feed, "entries", []) or [])[:per_source_limit]
-    status["raw_entries"] = len(entries)
+    cached = (cache or {}).get(source.url)
+    if not isinstance(cached, dict) or not isinstance(cached.get("entries"), list):
+        cached = None
+    feed, response = _download_feed(source, timeout, cached)
+    if feed is None:
+        records = list(cached["entries"])
+        if cache is not None:
+            status["cache_hits"] += 1
+            cache[source.url] = {**cached, "checked_at_utc": current.isoformat()}
+    else:
+        if getattr(feed, "bozo", 0):
+            bozo_exception = getattr(feed, "bozo_exception", "")
+            if bozo_exception:
+                status["error"] = str(bozo_exception)[:300]
+        raw_entries = list(getattr(feed, "entries", []) or [])
+        records = [_entry_record(entry) for entry in raw_entries[: max(per_source_limit, FEED_CACHE_MAX_ENTRIES)]]
+        if cache is not None:
+            status["cache_misses"] += 1
+            # A failed download keeps the last good copy for the next conditional request.
+            if response is not None and response.status_code < 400:
+                cache[source.url] = {
+                    "etag": response.headers.get("ETag") or "",
+                    "modified": response.headers.get("Last-Modified") or "",
+                    "checked_at_utc": current.isoformat(),
+                    "entries": records,
+                }
+
+    records = records[:per_source_limit]
+    status["raw_entries"] = len(records)
 
     articles: list[Article] = []
-    for entry in entries:
-        published_at = parse_datetime(entry)
+    for record in records:
+        published_at = _parse_cached_datetime(record.get("published_at"))
         if published_at is None:
             status["skipped_undated"] += 1
             continue
@@ -117,13 +218,13 @@ def fetch_source_articles(
             status["skipped_old"] += 1
             continue
 
-        title = clean_text(entry.get("title", ""))
-        link = entry.get("link", "").strip()
+        title = str(record.get("title") or "")
+        link = str(record.get("link") or "")
         if not title or not link:
             status["skipped_invalid"] += 1
             continue
 
-        summary = extract_summary(entry)
+        summary = str(record.get("summary") or "")
         article = Article(
             title=title,
             url=link,
@@ -146,26 +247,60 @@ def fetch_source_articles(
     return articles, status
 
 
+def _failed_status(source: SourceDef, error: str) -> dict[str, Any]:
+    status = _new_status(source)
+    status["ok"] = False
+    status["error"] = error[:300]
+    return status
+
+
 def collect_articles_with_status(
     sources: list[SourceDef],
     hours_back: int,
     per_source_limit: int,
     now: datetime | None = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    total_budget: float = DEFAULT_TOTAL_BUDGET,
+    cache_path: str | Path | None = FEED_CACHE_PATH,
 ) -> tuple[list[Article], list[dict[str, Any]]]:
     current = (now or datetime.utcnow()).replace(tzinfo=None)
     articles: list[Article] = []
     statuses: list[dict[str, Any]] = []
-
-    for source in sources:
+    if not sources:
+        return articles, statuses
+
+    cache = load_feed_cache(cache_path) if cache_path else None
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources))), thread_name_prefix="feed")
+    # Each worker runs in a copy of the caller's context so request counters reach the calling stage.
+    futures = [
+        executor.submit(copy_context().run, fetch_source_articles, source, hours_back, per_source_limit, current, timeout, cache)
+        for source in sources
+    ]
+    try:
+        # Sources still running when the overall budget expires are reported as failed, not waited on.
+        done, _ = wait(futures, timeout=total_budget)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for source, future in zip(sources, futures):
+        if future not in done:
+            statuses.append(_failed_status(source, f"TimeoutError: exceeded {total_budget:g}s feed fetch budget"))
+            continue
         try:
-            source_articles, status = fetch_source_articles(source, hours_back, per_source_limit, current)
-            articles.extend(source_articles)
-            statuses.append(status)
+            source_articles, status = future.result()
         except Exception as exc:
-            status = _new_status(source)
-            status["ok"] = False
-            status["error"] = f"{type(exc).__name__}: {exc}"[:300]
-            statuses.append(status)
+            statuses.append(_failed_status(source, f"{type(exc).__name__}: {exc}"))
+            continue
+        articles.extend(source_articles)
+        statuses.append(status)
+
+    if cache is not None:
+        # Only configured feeds are kept, so removed sources age out of the cache file.
+        try:
+            save_feed_cache({source.url: cache[source.url] for source in sources if source.url in cache}, cache_path)
+        except OSError:
+            pass
 
     deduped: dict[str, Article] = {}
     for article in articles:
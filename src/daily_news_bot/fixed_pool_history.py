@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-import json
+from bisect import bisect_left
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 import requests
 
+from .backtest import PriceSeries, summarize_returns
 from .config import ROOT_DIR
-from .tracking import load_event_history
+from .http_client import http_get
+from .keyword_matcher import KeywordMatcher
+from .price_store import append_prices, bars_to_fetch, load_prices
+from .state_store import load_state, save_state
+from .tracking import iter_event_history
 
 
 ETF_KLINE_URL = "https://push2his.eastmoney.com/api/qt/stock/kline/get"
@@ -17,6 +22,7 @@ DEFAULT_TIMEOUT = 12
 HISTORY_PATH = ROOT_DIR / "outputs" / "fixed_buy_pool_history.json"
 BACKFILL_WINDOWS = (20, 60, 120, 250)
 WIN_LOOKBACK_WINDOWS = (60, 120, 250)
+WIN_HORIZONS = (1, 3, 5)
 DEFAULT_HISTORY_LIMIT = 320
 
 THEME_KEYWORDS: dict[str, tuple[str, ...]] = {
@@ -26,6 +32,7 @@ THEME_KEYWORDS: dict[str, tuple[str, ...]] = {
     "china_macro": ("china", "chinese", "pboc", "yuan", "cnh", "trade", "tariff", "stimulus", "中国", "人民币", "政策", "贸易", "关税", "刺激"),
     "new_energy": ("ev", "battery", "lithium", "solar", "renewable", "新能源", "锂电", "光伏"),
 }
+THEME_MATCHER = KeywordMatcher(THEME_KEYWORDS, normalize=str.lower)
 
 EVENT_THEME_TO_FIXED_POOL_THEME_KEYS: dict[str, tuple[str, ...]] = {
     "ai": ("ai_attack", "semiconductor", "growth_core"),
@@ -58,7 +65,7 @@ def _secid(code: str) -> str:
 
 
 def _request(url: str, *, params: dict[str, Any] | None = None, timeout: int = DEFAULT_TIMEOUT) -> requests.Response:
-    response = requests.get(
+    response = http_get(
         url,
         params=params,
         timeout=timeout,
@@ -137,21 +144,15 @@ def _normalize_history_item(item: dict[str, Any]) -> dict[str, Any]:
 
 
 def _load_cache(path: Path = HISTORY_PATH) -> dict[str, Any]:
-    if not path.exists():
-        return {}
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    payload = load_state(path)
     return payload if isinstance(payload, dict) else {}
 
 
 def _save_cache(payload: dict[str, Any], path: Path = HISTORY_PATH) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_state(path, payload)
 
 
-def fetch_etf_history(code: str, name: str, theme_key: str, timeout: int = DEFAULT_TIMEOUT, limit: int = DEFAULT_HISTORY_LIMIT) -> dict[str, Any]:
+def _fetch_etf_bars(code: str, count: int, timeout: int) -> list[dict[str, Any]]:
     response = _request(
         ETF_KLINE_URL,
         params={
@@ -160,7 +161,7 @@ def fetch_etf_history(code: str, name: str, theme_key: str, timeout: int = DEFAU
             "fields2": "f51,f52,f53,f54,f55,f56,f57,f58,f59,f60,f61",
             "klt": "101",
             "fqt": "1",
-            "lmt": str(limit),
+            "lmt": str(count),
             "end": "20500101",
         },
         timeout=timeout,
@@ -182,7 +183,20 @@ def fetch_etf_history(code: str, name: str, theme_key: str, timeout: int = DEFAU
             "volume": _safe_float(parts[5]) if len(parts) > 5 else None,
             "amount": _safe_float(parts[6]) if len(parts) > 6 else None,
         })
-    points = _normalize_points(points)
+    return points
+
+
+def update_etf_price_history(code: str, timeout: int = DEFAULT_TIMEOUT, limit: int = DEFAULT_HISTORY_LIMIT) -> str:
+    """Download the daily bars missing from the local price store; returns the series key."""
+    key = f"etf_kline/{code}"
+    requested = bars_to_fetch(key, limit)
+    append_prices(key, _fetch_etf_bars(code, requested, timeout), depth=limit if requested >= limit else None)
+    return key
+
+
+def fetch_etf_history(code: str, name: str, theme_key: str, timeout: int = DEFAULT_TIMEOUT, limit: int = DEFAULT_HISTORY_LIMIT) -> dict[str, Any]:
+    key = update_etf_price_history(code, timeout=timeout, limit=limit)
+    points = _normalize_points(load_prices(key).tail(limit).rows())
     return {
         "code": code,
         "name": name,
@@ -195,12 +209,14 @@ def fetch_etf_history(code: str, name: str, theme_key: str, timeout: int = DEFAU
 
 
 def fetch_fund_history_item(code: str, name: str, theme_key: str, timeout: int = DEFAULT_TIMEOUT, limit: int = DEFAULT_HISTORY_LIMIT) -> dict[str, Any]:
+    key = f"fund_nav/{code}"
+    requested = bars_to_fetch(key, limit)
     rows: list[dict[str, Any]] = []
     page_index = 1
-    page_size = 50
+    page_size = min(50, requested)
     total_count = 0
 
-    while len(rows) < limit:
+    while len(rows) < requested:
         response = _request(
             FUND_HISTORY_URL,
             params={"fundCode": code, "pageIndex": page_index, "pageSize": page_size},
@@ -221,21 +237,20 @@ def fetch_fund_history_item(code: str, name: str, theme_key: str, timeout: int =
         if page_index > 8:
             break
 
-    points = _normalize_points(
-        list(
-            reversed(
-                [
-                    {
-                        "date": row.get("FSRQ") or "",
-                        "close": _safe_float(row.get("DWJZ")),
-                        "day_change_pct": _safe_float(row.get("JZZZL")),
-                    }
-                    for row in rows[:limit]
-                    if row.get("FSRQ")
-                ]
-            )
-        )
+    append_prices(
+        key,
+        [
+            {
+                "date": row.get("FSRQ") or "",
+                "close": _safe_float(row.get("DWJZ")),
+                "day_change_pct": _safe_float(row.get("JZZZL")),
+            }
+            for row in rows[:requested]
+            if row.get("FSRQ")
+        ],
+        depth=limit if requested >= limit else None,
     )
+    points = _normalize_points(load_prices(key).tail(limit).rows())
     return {
         "code": code,
         "name": name,
@@ -282,12 +297,7 @@ def fetch_fixed_pool_history(portfolio: dict[str, Any], timeout: int = DEFAULT_T
 
 
 def _match_theme_keys(text: str) -> set[str]:
-    lowered = text.lower()
-    matched: set[str] = set()
-    for theme_key, keywords in THEME_KEYWORDS.items():
-        if any(keyword.lower() in lowered for keyword in keywords):
-            matched.add(theme_key)
-    return matched
+    return set(THEME_MATCHER.scan(text.lower()).keys())
 
 
 def _history_points_by_code(fixed_pool_history: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
@@ -316,25 +326,6 @@ def _theme_to_codes(portfolio: dict[str, Any]) -> dict[str, list[dict[str, Any]]
     return result
 
 
-def _find_start_index(points: list[dict[str, Any]], trigger_day: date) -> int | None:
-    for index, point in enumerate(points):
-        point_day = _parse_day(point.get("date") or "")
-        if point_day and point_day >= trigger_day:
-            return index
-    return None
-
-
-def _compute_forward_return(points: list[dict[str, Any]], start_index: int, horizon: int) -> float | None:
-    end_index = start_index + horizon
-    if start_index < 0 or end_index >= len(points):
-        return None
-    start_close = _safe_float(points[start_index].get("close"))
-    end_close = _safe_float(points[end_index].get("close"))
-    if start_close in (None, 0) or end_close in (None, 0):
-        return None
-    return round((end_close - start_close) / start_close * 100, 3)
-
-
 def _leader_from_stats(stats: list[dict[str, Any]]) -> dict[str, Any] | None:
     ranked = sorted(
         stats,
@@ -418,20 +409,19 @@ def build_fixed_pool_60d_panel(
                 + "。"
             )
 
-    event_records = load_event_history()
-    event_days = [
-        parsed
-        for item in event_records
-        if (parsed := _parse_day(item.get("generated_at_utc") or "")) is not None
-    ]
-    latest_day = max(event_days, default=None)
-    latest_reference_day = latest_day or date.today()
-    cutoff_day = latest_reference_day - timedelta(days=lookback_days)
+    # Newest first: the first dated record fixes the window, and the stream stops once it is passed.
+    latest_day: date | None = None
+    cutoff_day: date | None = None
     daily_themes: dict[date, set[str]] = {}
-    for record in event_records:
+    for record in iter_event_history(newest_first=True):
         record_day = _parse_day(record.get("generated_at_utc") or "")
-        if not record_day or record_day < cutoff_day:
+        if not record_day:
             continue
+        if latest_day is None:
+            latest_day = record_day
+            cutoff_day = latest_day - timedelta(days=lookback_days)
+        if record_day < cutoff_day:
+            break
         text = " ".join(
             str(record.get(key) or "")
             for key in ("theme", "title", "summary")
@@ -440,13 +430,14 @@ def build_fixed_pool_60d_panel(
         if not matched:
             continue
         daily_themes.setdefault(record_day, set()).update(matched)
+    latest_reference_day = latest_day or date.today()
 
     relevant_event_themes = list(dict.fromkeys(str(item.get("theme_key") or "") for item in event_route_rows if item.get("theme_key")))
     if not relevant_event_themes:
         relevant_event_themes = list(EVENT_THEME_TO_FIXED_POOL_THEME_KEYS.keys())
 
-    points_by_code = {
-        str(item.get("code") or ""): list(item.get("history") or [])
+    series_by_code = {
+        str(item.get("code") or ""): PriceSeries.from_points(item.get("history") or [])
         for item in history_items
         if item.get("code")
     }
@@ -463,48 +454,30 @@ def build_fixed_pool_60d_panel(
             "selected_leaders": {},
         }
         theme_label = THEME_LABELS.get(event_theme, event_theme)
+        # Forward returns are computed once per ref over every theme day; each window is a suffix of them.
+        theme_days = sorted(day.toordinal() for day, themes in daily_themes.items() if event_theme in themes)
+        ref_returns: list[tuple[dict[str, Any], dict[int, list[float | None]]]] = []
+        for ref in theme_refs:
+            series = series_by_code.get(str(ref.get("code") or ""))
+            if series:
+                ref_returns.append((ref, series.forward_returns(theme_days, WIN_HORIZONS)))
         sample_counts: dict[int, int] = {}
         for window in WIN_LOOKBACK_WINDOWS:
-            window_cutoff = latest_reference_day - timedelta(days=window)
-            theme_days = sorted(
-                day
-                for day, themes in daily_themes.items()
-                if event_theme in themes and day >= window_cutoff
-            )
-            sample_counts[window] = len(theme_days)
-            row["sample_days"][f"d{window}"] = len(theme_days)
+            first = bisect_left(theme_days, (latest_reference_day - timedelta(days=window)).toordinal())
+            sample_counts[window] = len(theme_days) - first
+            row["sample_days"][f"d{window}"] = sample_counts[window]
 
-            horizon_stats: dict[int, list[dict[str, Any]]] = {1: [], 3: [], 5: []}
-            for ref in theme_refs:
+            horizon_stats: dict[int, list[dict[str, Any]]] = {horizon: [] for horizon in WIN_HORIZONS}
+            for ref, returns_by_horizon in ref_returns:
                 code = str(ref.get("code") or "")
-                points = points_by_code.get(code) or []
-                if not points:
-                    continue
-                for horizon in (1, 3, 5):
-                    returns: list[float] = []
-                    for trigger_day in theme_days:
-                        start_index = _find_start_index(points, trigger_day)
-                        if start_index is None:
-                            continue
-                        result = _compute_forward_return(points, start_index, horizon)
-                        if result is not None:
-                            returns.append(result)
-                    if not returns:
-                        continue
-                    positive = [item for item in returns if item > 0]
-                    horizon_stats[horizon].append(
-                        {
-                            "code": code,
-                            "name": ref.get("name") or code,
-                            "samples": len(returns),
-                            "avg_return_pct": round(sum(returns) / len(returns), 3),
-                            "win_rate_pct": round(len(positive) / len(returns) * 100, 1),
-                        }
-                    )
+                for horizon in WIN_HORIZONS:
+                    stats = summarize_returns(returns_by_horizon[horizon][first:])
+                    if stats:
+                        horizon_stats[horizon].append({"code": code, "name": ref.get("name") or code, **stats})
 
             row["leaders"][f"d{window}"] = {
                 f"t{horizon}": _leader_from_stats(horizon_stats[horizon])
-                for horizon in (1, 3, 5)
+                for horizon in WIN_HORIZONS
             }
 
         preferred_window = _preferred_window(sample_counts)
@@ -518,7 +491,7 @@ def build_fixed_pool_60d_panel(
 
         line_parts: list[str] = []
         small_sample = sample_counts.get(preferred_window, 0) < 8
-        for horizon in (1, 3, 5):
+        for horizon in WIN_HORIZONS:
             leader = (row["selected_leaders"] or {}).get(f"t{horizon}")
             if leader:
                 if small_sample:
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
 import html
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import requests
-
 from .config import ROOT_DIR
+from .http_client import http_get
+from .state_store import load_state, save_state
 
 
 FUND_HOLDINGS_URL = "https://fundf10.eastmoney.com/FundArchivesDatas.aspx"
@@ -83,7 +82,7 @@ def _attach_portfolio_context(
 
 
 def fetch_fund_top_holdings(code: str, timeout: int = DEFAULT_TIMEOUT, top_n: int = 10) -> dict[str, Any]:
-    response = requests.get(
+    response = http_get(
         FUND_HOLDINGS_URL,
         params={"type": "jjcc", "code": code, "topline": str(top_n), "year": "", "month": ""},
         headers={"User-Agent": "Mozilla/5.0", "Referer": "https://fundf10.eastmoney.com/"},
@@ -133,20 +132,12 @@ def fetch_fund_top_holdings(code: str, timeout: int = DEFAULT_TIMEOUT, top_n: in
 
 
 def load_fund_holdings_cache(path: str | Path | None = None) -> dict[str, Any]:
-    target = Path(path) if path else CACHE_PATH
-    if not target.exists():
-        return {}
-    try:
-        payload = json.loads(target.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    payload = load_state(Path(path) if path else CACHE_PATH)
     return payload if isinstance(payload, dict) else {}
 
 
 def save_fund_holdings_cache(payload: dict[str, Any], path: str | Path | None = None) -> None:
-    target = Path(path) if path else CACHE_PATH
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_state(Path(path) if path else CACHE_PATH, payload)
 
 
 def fetch_portfolio_fund_holdings(
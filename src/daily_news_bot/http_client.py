@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Iterator
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .profiling import record_request
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 8.0
+DEFAULT_HOST_LIMIT = 8
+# Domain suffix -> max in-flight requests shared by every host under it.
+HOST_LIMITS = {
+    "eastmoney.com": 4,
+}
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+USER_AGENT = "Mozilla/5.0"
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=DEFAULT_HOST_LIMIT)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _session = session
+        return _session
+
+
+def close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _host_key(url: str) -> tuple[str, int]:
+    host = (urlparse(url).hostname or "").lower()
+    for suffix, limit in HOST_LIMITS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return suffix, limit
+    return host, DEFAULT_HOST_LIMIT
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    key, limit = _host_key(url)
+    with _host_slots_lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            slot = threading.BoundedSemaphore(limit)
+            _host_slots[key] = slot
+        return slot
+
+
+def _retry_after_seconds(response: requests.Response | None) -> float | None:
+    value = str((response.headers if response is not None else {}).get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _backoff_delay(attempt: int, backoff: float, response: requests.Response | None = None) -> float:
+    retry_after = _retry_after_seconds(response)
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF)
+    # Full jitter keeps parallel workers from retrying a throttled host in lockstep.
+    return random.uniform(0, min(backoff * (2**attempt), MAX_BACKOFF))
+
+
+def http_request(
+    method: str,
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int | None = None,
+    backoff: float = DEFAULT_BACKOFF,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send through the shared session; only idempotent methods retry unless ``retries`` is given."""
+    method = method.upper()
+    if retries is None:
+        retries = DEFAULT_RETRIES if method in IDEMPOTENT_METHODS else 0
+    session = get_session()
+    slot = _host_slot(url)
+    attempt = 0
+    while True:
+        response: requests.Response | None = None
+        try:
+            with slot:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+        else:
+            record_request(len(response.content))
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+        time.sleep(_backoff_delay(attempt, backoff, response))
+        attempt += 1
+
+
+@contextmanager
+def http_stream(method: str, url: str, *, timeout: Any = DEFAULT_TIMEOUT, **kwargs: Any) -> Iterator[requests.Response]:
+    """Open a streamed response on the shared session without retries; the host slot is held until it closes."""
+    with _host_slot(url):
+        response = get_session().request(method.upper(), url, timeout=timeout, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            response.close()
+            # Bytes pulled off the socket so far; the body may have been abandoned part-way.
+            raw_tell = getattr(response.raw, "tell", None)
+            record_request(int(raw_tell()) if callable(raw_tell) else 0)
+
+
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs: Any) -> requests.Response:
+    return http_request("POST", url, **kwargs)
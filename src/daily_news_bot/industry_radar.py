@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime
-import json
 from pathlib import Path
 from typing import Any
 
+from .cluster_features import cluster_features
+from .keyword_matcher import keyword_matcher
+from .state_store import load_state, save_state
+
 
 INDUSTRY_RADAR_STATE_PATH = Path(__file__).resolve().parents[2] / "outputs" / "industry_radar_state.json"
 
@@ -683,28 +686,6 @@ def _configured_entries(config: Any) -> tuple[bool, list[dict[str, Any]]]:
     return False, []
 
 
-def _cluster_text(cluster: Any) -> str:
-    representative = getattr(cluster, "representative", None)
-    parts = [
-        getattr(cluster, "theme", ""),
-        " ".join(getattr(cluster, "tags", []) or []),
-        getattr(representative, "title", "") if representative else "",
-        getattr(representative, "summary", "") if representative else "",
-        getattr(representative, "content", "") if representative else "",
-    ]
-    for article in getattr(cluster, "articles", [])[:4]:
-        parts.extend(
-            [
-                getattr(article, "title", ""),
-                getattr(article, "summary", ""),
-                getattr(article, "content", ""),
-                getattr(article, "category", ""),
-                getattr(article, "region", ""),
-            ]
-        )
-    return " ".join(_text(part) for part in parts if _text(part)).casefold()
-
-
 def _normalize_entries(config: Any) -> list[dict[str, Any]]:
     configured, custom_entries = _configured_entries(config)
     if configured and not custom_entries:
@@ -723,15 +704,13 @@ def _normalize_entries(config: Any) -> list[dict[str, Any]]:
     return entries
 
 
+def _fold_keyword(keyword: str) -> str:
+    return keyword.casefold().strip()
+
+
 def _keyword_hits(entry: dict[str, Any], cluster_texts: list[str]) -> list[str]:
-    hits: list[str] = []
-    for keyword in entry.get("keywords") or []:
-        needle = str(keyword or "").casefold().strip()
-        if not needle:
-            continue
-        if any(needle in text for text in cluster_texts):
-            hits.append(str(keyword))
-    return hits[:5]
+    keywords = tuple(str(keyword or "") for keyword in entry.get("keywords") or [])
+    return keyword_matcher(keywords, normalize=_fold_keyword).scan_many(cluster_texts).hits()[:5]
 
 
 def _theme_hit(entry: dict[str, Any], event_theme_keys: set[str], candidate_theme_keys: set[str]) -> bool:
@@ -820,12 +799,7 @@ def _binding_with_coverage(binding_summary: str, coverage_status: str, coverage_
 
 
 def _load_streak_state(path: Path = INDUSTRY_RADAR_STATE_PATH) -> dict[str, Any]:
-    if not path.exists():
-        return {"version": 1, "items": {}}
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return {"version": 1, "items": {}}
+    payload = load_state(path)
     if not isinstance(payload, dict):
         return {"version": 1, "items": {}}
     items = payload.get("items")
@@ -835,8 +809,7 @@ def _load_streak_state(path: Path = INDUSTRY_RADAR_STATE_PATH) -> dict[str, Any]
 
 
 def _save_streak_state(payload: dict[str, Any], path: Path = INDUSTRY_RADAR_STATE_PATH) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_state(path, payload, export=True)
 
 
 def load_industry_radar_state(path: Path = INDUSTRY_RADAR_STATE_PATH) -> dict[str, Any]:
@@ -971,8 +944,7 @@ def apply_industry_hit_streaks(
 
 
 def _component_score(text: str, keywords: tuple[str, ...]) -> int:
-    lowered = text.casefold()
-    hits = sum(1 for keyword in keywords if keyword in lowered)
+    hits = keyword_matcher(keywords, normalize=str).scan(text.casefold()).count()
     return min(5, hits * 2)
 
 
@@ -1054,7 +1026,7 @@ def build_industry_radar(
     if not entries:
         return {"enabled": False, "rows": [], "summary_lines": ["行业雷达未启用。"]}
 
-    cluster_texts = [_cluster_text(cluster) for cluster in clusters]
+    cluster_texts = [cluster_features(cluster).radar_text for cluster in clusters]
     event_theme_keys = {str(key) for impact in event_impacts for key in impact.get("theme_keys", [])}
     candidate_theme_keys = {
         str(row.get("theme_key"))
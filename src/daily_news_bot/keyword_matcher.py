@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Iterable, Mapping
+
+
+# How a keyword must sit in the text:
+# SUBSTRING: anywhere, like ``keyword in text``.
+# WORD: keywords with Latin letters need ``\b`` on both sides; CJK keywords stay substrings.
+# TOKEN: single-token keywords must be a whole [a-z0-9] run; phrases with spaces stay substrings.
+SUBSTRING = "substring"
+WORD = "word"
+TOKEN = "token"
+_DEFAULT_KEY = "keywords"
+
+
+@lru_cache(maxsize=512)
+def _bigrams(text: str) -> frozenset[str]:
+    # Shared across every matcher, so each distinct text is indexed once per run.
+    return frozenset(map("".join, zip(text, text[1:])))
+
+
+def _needle_pattern(needle: str, mode: str) -> re.Pattern[str] | None:
+    if mode == WORD and any("a" <= char <= "z" for char in needle):
+        return re.compile(rf"\b{re.escape(needle)}\b")
+    if mode == TOKEN and " " not in needle:
+        return re.compile(rf"(?<![a-z0-9]){re.escape(needle)}(?![a-z0-9])")
+    return None
+
+
+class KeywordHits:
+    def __init__(self, matcher: KeywordMatcher, found: set[str]) -> None:
+        self._matcher = matcher
+        self.found = found
+
+    def hits(self, key: Hashable = _DEFAULT_KEY) -> list[str]:
+        """Original keywords of one table that occur in the text, in table order."""
+        return [keyword for keyword, needle in self._matcher.tables[key] if needle in self.found]
+
+    def count(self, key: Hashable = _DEFAULT_KEY) -> int:
+        return sum(1 for _, needle in self._matcher.tables[key] if needle in self.found)
+
+    def any(self, key: Hashable = _DEFAULT_KEY) -> bool:
+        return any(needle in self.found for _, needle in self._matcher.tables[key])
+
+    def keys(self) -> list[Hashable]:
+        """Tables with at least one hit, in table order."""
+        return [key for key in self._matcher.tables if self.any(key)]
+
+
+class KeywordMatcher:
+    """Keyword tables compiled once; ``scan`` checks every table against a text in one pass.
+
+    Each keyword is first filtered by whether all of its character bigrams occur in
+    the text's (cached) bigram set, so only a handful of needles reach the real
+    substring or boundary check.
+    """
+
+    def __init__(
+        self,
+        tables: Mapping[Hashable, Iterable[Any]] | Iterable[Any],
+        *,
+        mode: str = SUBSTRING,
+        normalize: Callable[[str], str] = str.casefold,
+    ) -> None:
+        if not isinstance(tables, Mapping):
+            tables = {_DEFAULT_KEY: tables}
+        self.mode = mode
+        self.tables: dict[Hashable, list[tuple[str, str]]] = {}
+        needles: dict[str, tuple[frozenset[str], re.Pattern[str] | None]] = {}
+        for key, keywords in tables.items():
+            entries: list[tuple[str, str]] = []
+            for keyword in keywords:
+                needle = normalize(str(keyword))
+                if not needle:
+                    continue
+                entries.append((str(keyword), needle))
+                if needle not in needles:
+                    needles[needle] = (_bigrams(needle), _needle_pattern(needle, mode))
+            self.tables[key] = entries
+        self._needles = [(needle, grams, pattern) for needle, (grams, pattern) in needles.items()]
+
+    def scan(self, text: str) -> KeywordHits:
+        grams = _bigrams(text)
+        found = {
+            needle
+            for needle, needle_grams, pattern in self._needles
+            if needle_grams <= grams and (needle in text if pattern is None else pattern.search(text) is not None)
+        }
+        return KeywordHits(self, found)
+
+    def scan_many(self, texts: Iterable[str]) -> KeywordHits:
+        """Hits found in any of ``texts``."""
+        found: set[str] = set()
+        for text in texts:
+            found |= self.scan(text).found
+        return KeywordHits(self, found)
+
+
+@lru_cache(maxsize=256)
+def keyword_matcher(
+    keywords: tuple[str, ...],
+    mode: str = SUBSTRING,
+    normalize: Callable[[str], str] = str.casefold,
+) -> KeywordMatcher:
+    """Cached single-table matcher for keyword lists that come from config at runtime."""
+    return KeywordMatcher(keywords, mode=mode, normalize=normalize)
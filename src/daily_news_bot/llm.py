@@ -1,13 +1,19 @@
 ﻿from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
+import threading
+import time
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any
 
 import requests
 
 from .config import ROOT_DIR, Settings
+from .http_client import http_post, http_stream
 
 
 DEBUG_DIR = ROOT_DIR / "outputs"
@@ -15,11 +21,29 @@ DEBUG_JSON_PATH = DEBUG_DIR / "llm_last_response.json"
 DEBUG_TEXT_PATH = DEBUG_DIR / "llm_last_response.txt"
 DEBUG_REQUEST_PATH = DEBUG_DIR / "llm_last_request.json"
 DEBUG_STATUS_PATH = DEBUG_DIR / "llm_last_status.json"
+RESPONSE_CACHE_PATH = DEBUG_DIR / "llm_response_cache.json"
+RESPONSE_CACHE_MAX_ENTRIES = 64
+# Transport errors, rate limits and server errors say the provider is down, not that this prompt is bad.
+PROVIDER_FAILURE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+_CACHE_LOCK = threading.Lock()
+_CALL_SLOTS: dict[int, threading.BoundedSemaphore] = {}
 THINK_BLOCK_RE = re.compile(r"<think>.*?</think>", re.IGNORECASE | re.DOTALL)
 FENCED_BLOCK_RE = re.compile(r"^```(?:markdown|md)?\s*(.*?)\s*```$", re.IGNORECASE | re.DOTALL)
 
 
 
+def _debug_paths(debug_name: str) -> tuple[Path, Path, Path, Path]:
+    """Response JSON, response text, request and status paths; named calls get their own ``llm_<name>_*`` files."""
+    if not debug_name:
+        return DEBUG_JSON_PATH, DEBUG_TEXT_PATH, DEBUG_REQUEST_PATH, DEBUG_STATUS_PATH
+    return tuple(DEBUG_DIR / f"llm_{debug_name}_{suffix}" for suffix in ("response.json", "response.txt", "request.json", "status.json"))
+
+
+def _call_slots(limit: int) -> threading.BoundedSemaphore:
+    with _CACHE_LOCK:
+        return _CALL_SLOTS.setdefault(max(1, limit), threading.BoundedSemaphore(max(1, limit)))
+
+
 def _save_debug(
     payload: dict[str, Any],
     raw_text: str = "",
@@ -30,15 +54,18 @@ def _save_debug(
     error: str = "",
     attempts: list[dict[str, Any]] | None = None,
     selected_model: str = "",
+    cache: dict[str, Any] | None = None,
+    debug_name: str = "",
 ) -> None:
+    json_path, text_path, request_path, status_path = _debug_paths(debug_name)
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
     request_payload = dict(payload)
     if endpoint:
         request_payload["endpoint"] = endpoint
-    DEBUG_REQUEST_PATH.write_text(json.dumps(request_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    DEBUG_TEXT_PATH.write_text(raw_text or "", encoding="utf-8")
+    request_path.write_text(json.dumps(request_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    text_path.write_text(raw_text or "", encoding="utf-8")
     if data is not None:
-        DEBUG_JSON_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        json_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
     status_payload: dict[str, Any] = {
         "ok": not error and (status_code is None or 200 <= status_code < 300),
         "status_code": status_code,
@@ -48,7 +75,9 @@ def _save_debug(
         status_payload["selected_model"] = selected_model
     if attempts is not None:
         status_payload["attempts"] = attempts
-    DEBUG_STATUS_PATH.write_text(json.dumps(status_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    if cache is not None:
+        status_payload["cache"] = cache
+    status_path.write_text(json.dumps(status_payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
 
@@ -121,25 +150,255 @@ def _extract_content(data: dict[str, Any]) -> str | None:
 
 
 def _build_payload(model: str, settings: Settings, system_prompt: str, user_prompt: str) -> dict[str, Any]:
-    return {
+    payload: dict[str, Any] = {
         "model": model,
         "temperature": settings.temperature,
-        "stream": False,
+        "stream": settings.llm_stream,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
     }
+    if settings.llm_max_output_tokens:
+        payload["max_tokens"] = settings.llm_max_output_tokens
+    return payload
+
+
+class _StreamStalled(Exception):
+    """The provider went quiet before its first token, or the stream outlived ``settings.timeout``."""
+
+
+def _delta_text(chunk: dict[str, Any]) -> tuple[str, bool]:
+    """Answer text carried by one SSE chunk, and whether the chunk carried any token (reasoning included)."""
+    choices = chunk.get("choices") or []
+    first_choice = choices[0] if isinstance(choices, list) and choices and isinstance(choices[0], dict) else {}
+    delta = first_choice.get("delta") if isinstance(first_choice.get("delta"), dict) else {}
+    content = delta.get("content") if "content" in delta else first_choice.get("text")
+    text = content if isinstance(content, str) else ""
+    reasoning = delta.get("reasoning_content") or delta.get("reasoning")
+    return text, bool(text) or (isinstance(reasoning, str) and bool(reasoning))
+
+
+def _set_read_timeout(response: requests.Response, seconds: float) -> None:
+    """Re-arm the socket read timeout of an open streamed response; the one given to ``http_stream`` only covers the first token."""
+    connection = getattr(response.raw, "connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        sock.settimeout(seconds)
+
+
+def _stream_completion(
+    endpoint: str, headers: dict[str, str], payload: dict[str, Any], settings: Settings
+) -> tuple[int, str, str | None, dict[str, Any]]:
+    """POST a streaming request and read its SSE chunks as they arrive.
+
+    Returns the status code, the raw body (when the provider answered with something other than an event
+    stream), the streamed answer text and per-attempt speed stats. Raises ``_StreamStalled`` when no token
+    arrives within ``settings.llm_first_token_timeout``; a silent socket trips the same deadline as a read
+    timeout. Once tokens flow, a gap between chunks may last up to ``settings.timeout``. Reading stops once
+    ``settings.llm_max_output_tokens`` tokens have arrived.
+    """
+    first_token_timeout = max(0.1, min(float(settings.llm_first_token_timeout), float(settings.timeout)))
+    started = time.monotonic()
+    with ExitStack() as stack:
+        try:
+            response = stack.enter_context(
+                http_stream("POST", endpoint, headers=headers, json=payload, timeout=(first_token_timeout, first_token_timeout))
+            )
+        except requests.Timeout as exc:
+            raise _StreamStalled(f"no response within {first_token_timeout:g}s") from exc
+        if not response.ok or "text/event-stream" not in str(response.headers.get("Content-Type") or ""):
+            return response.status_code, response.text, None, {}
+
+        parts: list[str] = []
+        first_token_at: float | None = None
+        deltas = 0
+        completion_tokens = 0
+        truncated = False
+        lines = response.iter_lines(chunk_size=None)
+        while True:
+            try:
+                line = next(lines, None)
+            except requests.RequestException as exc:
+                if first_token_at is None:
+                    raise _StreamStalled(f"no token within {first_token_timeout:g}s") from exc
+                raise
+            if line is None:
+                break
+            elapsed = time.monotonic() - started
+            # Keep-alive comments reset the socket timeout, so the first-token deadline is also checked by wall clock.
+            if first_token_at is None and elapsed > first_token_timeout:
+                raise _StreamStalled(f"no token within {first_token_timeout:g}s")
+            if elapsed > settings.timeout:
+                raise _StreamStalled(f"stream exceeded {settings.timeout}s")
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(chunk, dict):
+                continue
+            usage = chunk.get("usage")
+            if isinstance(usage, dict) and usage.get("completion_tokens"):
+                completion_tokens = int(usage["completion_tokens"])
+            text, has_token = _delta_text(chunk)
+            if not has_token:
+                continue
+            if first_token_at is None:
+                first_token_at = elapsed
+                _set_read_timeout(response, float(settings.timeout))
+            deltas += 1
+            parts.append(text)
+            if settings.llm_max_output_tokens and deltas >= settings.llm_max_output_tokens:
+                truncated = True
+                break
+        if first_token_at is None:
+            raise _StreamStalled("stream ended before the first token")
+
+        total = time.monotonic() - started
+        # Providers that report usage are exact; otherwise each content delta counts as one token.
+        tokens = completion_tokens or deltas
+        generating = total - first_token_at
+        stats: dict[str, Any] = {
+            "ttft_ms": round(first_token_at * 1000),
+            "elapsed_ms": round(total * 1000),
+            "tokens": tokens,
+            "tokens_per_sec": round(tokens / generating, 1) if generating > 0 else None,
+        }
+        if truncated:
+            stats["truncated"] = True
+        return response.status_code, "", "".join(parts), stats
+
+
+
+def _cache_key(endpoint: str, settings: Settings, system_prompt: str, user_prompt: str) -> str:
+    # The primary model names the chain; a hit may have been served by one of its fallbacks.
+    material = json.dumps(
+        [endpoint, settings.model, list(settings.fallback_models), settings.temperature, system_prompt, user_prompt],
+        ensure_ascii=False,
+    )
+    if settings.llm_max_output_tokens:
+        material += f"|max_tokens={settings.llm_max_output_tokens}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _load_response_cache(path: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    return {
+        "responses": payload.get("responses") if isinstance(payload.get("responses"), dict) else {},
+        "failures": payload.get("failures") if isinstance(payload.get("failures"), dict) else {},
+    }
 
 
+def _save_response_cache(path: Path, cache: dict[str, Any], settings: Settings, now: float) -> None:
+    responses = {
+        key: entry
+        for key, entry in cache["responses"].items()
+        if now - float(entry.get("created_at") or 0) < settings.llm_cache_ttl_seconds
+    }
+    # Least recently used entries go first once the cache is full.
+    newest = sorted(responses, key=lambda key: float(responses[key].get("used_at") or 0), reverse=True)
+    failures = {
+        key: entry
+        for key, entry in cache["failures"].items()
+        if now - float(entry.get("failed_at") or 0) < settings.llm_failure_ttl_seconds
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(
+        json.dumps({"responses": {key: responses[key] for key in newest[:RESPONSE_CACHE_MAX_ENTRIES]}, "failures": failures}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(temp_path, path)
+
 
-def generate_report(settings: Settings, system_prompt: str, user_prompt: str) -> str | None:
+def _cached_response(key: str, settings: Settings, now: float) -> dict[str, Any] | None:
+    if settings.llm_cache_ttl_seconds <= 0:
+        return None
+    with _CACHE_LOCK:
+        cache = _load_response_cache(RESPONSE_CACHE_PATH)
+        entry = cache["responses"].get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("content"), str):
+            return None
+        if now - float(entry.get("created_at") or 0) >= settings.llm_cache_ttl_seconds:
+            return None
+        entry["used_at"] = now
+        try:
+            _save_response_cache(RESPONSE_CACHE_PATH, cache, settings, now)
+        except OSError:
+            pass
+    return entry
+
+
+def _recent_failures(endpoint: str, settings: Settings, now: float) -> dict[str, dict[str, Any]]:
+    if settings.llm_failure_ttl_seconds <= 0:
+        return {}
+    with _CACHE_LOCK:
+        failures = _load_response_cache(RESPONSE_CACHE_PATH)["failures"]
+    prefix = f"{endpoint}|"
+    return {
+        key[len(prefix):]: entry
+        for key, entry in failures.items()
+        if key.startswith(prefix) and isinstance(entry, dict) and now - float(entry.get("failed_at") or 0) < settings.llm_failure_ttl_seconds
+    }
+
+
+def _record_outcome(
+    key: str,
+    endpoint: str,
+    settings: Settings,
+    now: float,
+    content: str | None,
+    model_name: str,
+    failed: list[dict[str, Any]],
+) -> None:
+    if settings.llm_cache_ttl_seconds <= 0 and settings.llm_failure_ttl_seconds <= 0:
+        return
+    with _CACHE_LOCK:
+        cache = _load_response_cache(RESPONSE_CACHE_PATH)
+        if content and settings.llm_cache_ttl_seconds > 0:
+            cache["responses"][key] = {"content": content, "model": model_name, "created_at": now, "used_at": now}
+        if settings.llm_failure_ttl_seconds > 0:
+            for attempt in failed:
+                cache["failures"][f"{endpoint}|{attempt['model']}"] = {"failed_at": now, "error": str(attempt.get("error") or "")[:300]}
+        if content:
+            cache["failures"].pop(f"{endpoint}|{model_name}", None)
+        try:
+            _save_response_cache(RESPONSE_CACHE_PATH, cache, settings, now)
+        except OSError:
+            pass
+
+
+def _is_provider_failure(attempt: dict[str, Any]) -> bool:
+    return "status_code" not in attempt or attempt["status_code"] in PROVIDER_FAILURE_STATUS
+
+
+def generate_report(settings: Settings, system_prompt: str, user_prompt: str, *, debug_name: str = "") -> str | None:
+    """Ask the configured model chain for a completion.
+
+    Identical requests within ``settings.llm_cache_ttl_seconds`` are answered from
+    ``llm_response_cache.json``; a model whose provider failed within ``settings.llm_failure_ttl_seconds``
+    is skipped instead of being retried. Both show up under ``cache`` in ``llm_last_status.json``
+    (``llm_<debug_name>_status.json`` for named calls, so concurrent callers keep separate debug files).
+    Calls are safe to run from several threads; at most ``settings.llm_max_concurrency`` requests are in flight.
+    With ``settings.llm_stream`` a model that sends no token within ``settings.llm_first_token_timeout`` is
+    abandoned for the next fallback, and each attempt records its time to first token and tokens/sec.
+    """
     endpoint = settings.base_url.rstrip("/") + "/chat/completions"
 
     if not settings.api_key or not settings.model:
         missing = "NEWS_API_KEY" if not settings.api_key else "NEWS_MODEL"
         payload = _build_payload(settings.model or "", settings, system_prompt, user_prompt)
-        _save_debug(payload, endpoint=endpoint, error=f"Missing {missing}")
+        _save_debug(payload, endpoint=endpoint, error=f"Missing {missing}", debug_name=debug_name)
         return None
 
     headers = {
@@ -147,44 +406,97 @@ def generate_report(settings: Settings, system_prompt: str, user_prompt: str) ->
         "Content-Type": "application/json",
     }
 
+    now = time.time()
+    cache_key = _cache_key(endpoint, settings, system_prompt, user_prompt)
+    cached = _cached_response(cache_key, settings, now)
+    if cached is not None:
+        model_name = str(cached.get("model") or settings.model)
+        _save_debug(
+            _build_payload(model_name, settings, system_prompt, user_prompt),
+            cached["content"],
+            endpoint=endpoint,
+            attempts=[{"model": model_name, "ok": True, "cached": True}],
+            selected_model=model_name,
+            cache={"hit": True, "key": cache_key[:16], "age_seconds": round(now - float(cached.get("created_at") or now), 1)},
+            debug_name=debug_name,
+        )
+        return cached["content"]
+
     attempts: list[dict[str, Any]] = []
     models_to_try = [settings.model, *settings.fallback_models]
+    recent_failures = _recent_failures(endpoint, settings, now)
+    cache_status: dict[str, Any] = {"hit": False, "key": cache_key[:16]}
+
+    def finish(content: str | None, model_name: str = "") -> None:
+        failed = [item for item in attempts if not item.get("ok") and not item.get("skipped") and _is_provider_failure(item)]
+        _record_outcome(cache_key, endpoint, settings, now, content, model_name, failed)
 
     for model_name in models_to_try:
         payload = _build_payload(model_name, settings, system_prompt, user_prompt)
+        recent_failure = recent_failures.get(model_name)
+        if recent_failure is not None:
+            attempts.append(
+                {
+                    "model": model_name,
+                    "ok": False,
+                    "skipped": True,
+                    "error": f"provider failed {round(now - float(recent_failure.get('failed_at') or now))}s ago: {recent_failure.get('error') or ''}",
+                }
+            )
+            cache_status.setdefault("skipped_models", []).append(model_name)
+            continue
+        streamed_text: str | None = None
+        stats: dict[str, Any] = {}
         try:
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=settings.timeout)
-        except requests.RequestException as exc:
-            attempts.append({"model": model_name, "ok": False, "error": f"{type(exc).__name__}: {exc}"})
+            with _call_slots(settings.llm_max_concurrency):
+                if settings.llm_stream:
+                    status_code, raw_text, streamed_text, stats = _stream_completion(endpoint, headers, payload, settings)
+                else:
+                    response = http_post(endpoint, headers=headers, json=payload, timeout=settings.timeout)
+                    status_code, raw_text = response.status_code, response.text
+        except (requests.RequestException, _StreamStalled) as exc:
+            attempts.append({"model": model_name, "ok": False, "error": f"{type(exc).__name__.lstrip('_')}: {exc}"})
+            continue
+        response_ok = 200 <= status_code < 300
+
+        if streamed_text is not None:
+            content = _sanitize_model_text(streamed_text)
+            if content:
+                finish(content, model_name)
+                _save_debug(payload, streamed_text, endpoint=endpoint, status_code=status_code, attempts=attempts + [{"model": model_name, "ok": True, **stats}], selected_model=model_name, cache=cache_status, debug_name=debug_name)
+                return content
+            attempts.append({"model": model_name, "ok": False, "status_code": status_code, "error": "stream carried no answer text", **stats})
             continue
 
-        raw_text = response.text
         try:
-            data = response.json()
+            data = json.loads(raw_text)
         except ValueError:
-            if response.ok:
+            if response_ok:
                 content = _sanitize_model_text(raw_text)
                 if content:
-                    _save_debug(payload, raw_text, endpoint=endpoint, status_code=response.status_code, attempts=attempts + [{"model": model_name, "ok": True}], selected_model=model_name)
+                    finish(content, model_name)
+                    _save_debug(payload, raw_text, endpoint=endpoint, status_code=status_code, attempts=attempts + [{"model": model_name, "ok": True}], selected_model=model_name, cache=cache_status, debug_name=debug_name)
                     return content
-            attempts.append({"model": model_name, "ok": False, "status_code": response.status_code, "error": raw_text[:300]})
+            attempts.append({"model": model_name, "ok": False, "status_code": status_code, "error": raw_text[:300]})
             continue
 
-        content = _extract_content(data) if response.ok else None
-        if response.ok and content:
-            _save_debug(payload, raw_text, data, endpoint=endpoint, status_code=response.status_code, attempts=attempts + [{"model": model_name, "ok": True}], selected_model=model_name)
+        content = _extract_content(data) if response_ok and isinstance(data, dict) else None
+        if response_ok and content:
+            finish(content, model_name)
+            _save_debug(payload, raw_text, data, endpoint=endpoint, status_code=status_code, attempts=attempts + [{"model": model_name, "ok": True}], selected_model=model_name, cache=cache_status, debug_name=debug_name)
             return content
 
         attempts.append(
             {
                 "model": model_name,
                 "ok": False,
-                "status_code": response.status_code,
+                "status_code": status_code,
                 "error": (data.get("error") if isinstance(data, dict) else None) or raw_text[:300],
             }
         )
 
     final_payload = _build_payload(models_to_try[0], settings, system_prompt, user_prompt)
     final_error = attempts[-1]["error"] if attempts else "No model attempts were made"
-    _save_debug(final_payload, endpoint=endpoint, error=str(final_error), attempts=attempts)
+    finish(None)
+    _save_debug(final_payload, endpoint=endpoint, error=str(final_error), attempts=attempts, cache=cache_status, debug_name=debug_name)
     return None
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from .cluster_features import cluster_features
+from .keyword_matcher import KeywordMatcher
 from .models import EventCluster
 
 
@@ -110,13 +112,7 @@ NEWS_RULES: dict[str, dict[str, Any]] = {
         "invalidate": "业绩和现金流继续兑现，纳指相对强势，信用利差没有扩大。",
     },
 }
-
-
-def _cluster_text(cluster: EventCluster) -> str:
-    parts: list[str] = [cluster.theme, " ".join(cluster.tags or [])]
-    for article in cluster.articles[:5]:
-        parts.extend([article.title, article.summary, article.content, article.category, article.region])
-    return " ".join(part for part in parts if part).casefold()
+NEWS_MATCHER = KeywordMatcher({key: rule["keywords"] for key, rule in NEWS_RULES.items()})
 
 
 def _fmt_pct(value: Any) -> str:
@@ -192,9 +188,9 @@ def _add_row(
 def _news_rows(clusters: list[EventCluster]) -> tuple[list[dict[str, Any]], int]:
     rows: list[dict[str, Any]] = []
     score = 0
-    combined = " ".join(_cluster_text(cluster) for cluster in clusters[:8])
+    news_hits = NEWS_MATCHER.scan(" ".join(cluster_features(cluster).detail_text for cluster in clusters[:8]))
     for key, rule in NEWS_RULES.items():
-        hits = [word for word in rule["keywords"] if str(word).casefold() in combined]
+        hits = news_hits.hits(key)
         if not hits:
             continue
         fact = "新闻命中：" + " / ".join(str(word) for word in hits[:4])
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import argparse
-import copy
 import json
 import os
 import re
@@ -10,10 +9,11 @@ from pathlib import Path
 from typing import Any
 
 from .api_sources import collect_api_articles_with_status
+from .cluster_features import clear_cluster_features
 from .clustering import cluster_articles
 from .config import load_settings, load_sources
 from .credibility import annotate_and_filter_articles, credibility_summary_to_dict
-from .dashboard import render_dashboard_html
+from .dashboard import DASHBOARD_CSS_FILE, DASHBOARD_RENDER_CACHE_FILE, SectionCache, dashboard_css, dashboard_css_href, render_dashboard_html
 from .decision_journal import build_advice_tracking, build_decision_snapshot, update_decision_journal
 from .execution_checks import fetch_execution_checks
 from .fixed_pool_history import fetch_fixed_pool_history
@@ -22,15 +22,24 @@ from .fund_holdings import fetch_portfolio_fund_holdings
 from .logic_playbook import build_logic_playbook, render_logic_playbook_markdown
 from .macro_burst_risk import build_macro_burst_risk, render_macro_burst_risk_markdown
 from .market_data import fetch_market_snapshot
+from .near_duplicates import collapse_near_duplicates
 from .official_pages import collect_official_page_articles_with_status
 from .portfolio import build_portfolio_brief, load_portfolio
 from .portfolio_quotes import fetch_portfolio_quotes, update_portfolio_history
 from .portfolio_weekly import build_weekly_portfolio_review
 from .prediction_lens import build_prediction_lens, render_prediction_lens_markdown
+from .profiling import RunTimings, format_timings_summary
 from .ranking import rank_clusters, summarize_tag_distribution
 from .report import render_report, save_json, save_text
+from .scheduler import Stage, run_stages
 from .senders import send_feishu_message
-from .signal_validation import MIN_ADJUSTMENT_SAMPLES, build_signal_validation, render_signal_validation_markdown
+from .signal_validation import (
+    MIN_ADJUSTMENT_SAMPLES,
+    build_signal_validation,
+    refresh_signal_price_history,
+    render_signal_validation_markdown,
+)
+from .state_store import export_state_json
 from .strategic_lens import build_strategic_lens, render_strategic_lens_markdown
 from .trade_ledger import aggregate_trade_ledger, apply_trade_ledger_to_portfolio, build_trade_sync_status, load_trade_ledger
 from .tracking import build_tracking_summary, update_event_history
@@ -47,13 +56,19 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--sources", default=None, help="sources.yaml 路径")
     parser.add_argument("--output", default="outputs/report.md")
     parser.add_argument("--json-output", default="outputs/report.json")
+    parser.add_argument("--json-compact", action="store_true", help="report.json 不缩进，按顶层字段流式写出")
+    parser.add_argument("--json-side-files", action="store_true", help="把长 history 数组拆到 report_files/ 旁路文件")
+    parser.add_argument("--json-gzip", action="store_true", help="同时写出 report.json.gz 预压缩副本")
     parser.add_argument("--portfolio", default="config/portfolio.yaml", help="个人组合配置 YAML 路径")
     parser.add_argument("--portfolio-output", default="outputs/portfolio_brief.md")
     parser.add_argument("--no-portfolio", action="store_true", help="不生成个人组合影响速览")
     parser.add_argument("--weekly-review", action="store_true", help="额外生成周日组合复盘")
     parser.add_argument("--weekly-review-output", default="outputs/portfolio_weekly.md")
     parser.add_argument("--dashboard-output", default="outputs/dashboard.html")
+    parser.add_argument("--dashboard-render-cache", action="store_true", help="复用上次渲染中输入未变的 Dashboard 区块")
     parser.add_argument("--send-feishu", action="store_true")
+    parser.add_argument("--profile", action="store_true", help="额外输出本次运行的 cProfile/pstats 文件")
+    parser.add_argument("--profile-output", default="outputs/profile.pstats")
     return parser
 
 
@@ -99,6 +114,8 @@ def _build_source_coverage(statuses: list[dict[str, Any]]) -> dict[str, int]:
     api_key_configured = sum(1 for item in api_statuses if item.get("key_configured"))
     api_enabled = sum(1 for item in api_statuses if item.get("enabled"))
     api_with_articles = sum(1 for item in api_statuses if item.get("returned_articles", 0) > 0)
+    feed_cache_hits = sum(int(item.get("cache_hits", 0)) for item in rss_statuses)
+    feed_cache_misses = sum(int(item.get("cache_misses", 0)) for item in rss_statuses)
 
     return {
         "configured_sources": configured,
@@ -116,6 +133,8 @@ def _build_source_coverage(statuses: list[dict[str, Any]]) -> dict[str, int]:
         "api_keys_configured": api_key_configured,
         "api_sources_enabled": api_enabled,
         "api_sources_with_articles": api_with_articles,
+        "feed_cache_hits": feed_cache_hits,
+        "feed_cache_misses": feed_cache_misses,
     }
 
 
@@ -1159,15 +1178,17 @@ def _env_flag(name: str, default: bool = False) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+# The public-output helpers below return shallow copies: they replace whole subtrees instead of editing them,
+# so untouched branches are shared with the run payload and private ones are dropped without being copied.
 def _public_payload_without_private_portfolio(payload: dict[str, Any]) -> dict[str, Any]:
-    public_payload = copy.deepcopy(payload)
+    public_payload = dict(payload)
     portfolio = public_payload.get("portfolio") or {}
     if portfolio.get("enabled"):
         sync = portfolio.get("trade_sync_status") or {}
         fixed_pool_rows = []
         for row in portfolio.get("fixed_buy_pool_rows") or []:
             public_row = {
-                key: copy.deepcopy(row.get(key))
+                key: row.get(key)
                 for key in (
                     "name",
                     "code",
@@ -1210,7 +1231,7 @@ def _public_payload_without_private_portfolio(payload: dict[str, Any]) -> dict[s
         }
         public_payload["weekly_review_markdown"] = ""
 
-    output_paths = public_payload.get("output_paths") or {}
+    output_paths = dict(public_payload.get("output_paths") or {})
     output_paths.update(
         {
             "portfolio_md_generated": False,
@@ -1226,7 +1247,7 @@ def _public_payload_without_private_portfolio(payload: dict[str, Any]) -> dict[s
 
 
 def _sanitize_public_feishu_receipts(payload: dict[str, Any]) -> dict[str, Any]:
-    public_payload = copy.deepcopy(payload)
+    public_payload = dict(payload)
     receipt_status = public_payload.get("feishu_receipts") or {}
     if receipt_status:
         public_payload["feishu_receipts"] = {
@@ -1244,10 +1265,23 @@ def _sanitize_public_feishu_receipts(payload: dict[str, Any]) -> dict[str, Any]:
 
 
 def _strip_internal_path_values(value: Any) -> Any:
+    """Return ``value`` with internal paths removed, copying only the containers that hold one."""
     if isinstance(value, dict):
-        return {key: _strip_internal_path_values(item) for key, item in value.items()}
+        stripped: dict[Any, Any] | None = None
+        for key, item in value.items():
+            public_item = _strip_internal_path_values(item)
+            if public_item is not item:
+                stripped = stripped if stripped is not None else dict(value)
+                stripped[key] = public_item
+        return value if stripped is None else stripped
     if isinstance(value, list):
-        return [_strip_internal_path_values(item) for item in value]
+        stripped_items: list[Any] | None = None
+        for index, item in enumerate(value):
+            public_item = _strip_internal_path_values(item)
+            if public_item is not item:
+                stripped_items = stripped_items if stripped_items is not None else list(value)
+                stripped_items[index] = public_item
+        return value if stripped_items is None else stripped_items
     if not isinstance(value, str):
         return value
 
@@ -1263,7 +1297,7 @@ def _strip_internal_path_values(value: Any) -> Any:
 
 
 def _sanitize_public_output_references(payload: dict[str, Any]) -> dict[str, Any]:
-    public_payload = copy.deepcopy(payload)
+    public_payload = dict(payload)
     output_paths = dict(public_payload.get("output_paths") or {})
     public_labels = {
         "report_md_path": "report.md",
@@ -1294,7 +1328,147 @@ def _sanitize_public_output_references(payload: dict[str, Any]) -> dict[str, Any
     return public_payload
 
 
-def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
+def _public_output_payload(payload: dict[str, Any], redact_portfolio_outputs: bool, dashboard_public_url: str) -> dict[str, Any]:
+    """The payload written to report.json and the dashboard; shares every branch it does not rewrite with ``payload``."""
+    output_payload = _public_payload_without_private_portfolio(payload) if redact_portfolio_outputs else dict(payload)
+    if dashboard_public_url:
+        output_payload = _sanitize_public_output_references(output_payload)
+    return _sanitize_public_feishu_receipts(output_payload)
+
+
+def _empty_portfolio_quotes(portfolio: dict[str, Any], generated_at: datetime, error: str) -> dict[str, Any]:
+    holdings_count = len(portfolio.get("holdings") or [])
+    return {
+        "provider": "Eastmoney fundgz + Eastmoney fund history",
+        "captured_at_utc": generated_at.isoformat(),
+        "items": [],
+        "failures": [{"holding_name": "portfolio", "code": "", "error": error[:300]}],
+        "coverage": {"configured_holdings": holdings_count, "returned_holdings": 0, "failed_holdings": holdings_count},
+        "portfolio_estimated_day_change_pct": None,
+        "portfolio_week_change_pct": None,
+        "leaders": {"top_positive": [], "top_negative": []},
+    }
+
+
+def _empty_fund_holdings(portfolio: dict[str, Any], error: str) -> dict[str, Any]:
+    holdings_count = len(portfolio.get("holdings") or [])
+    return {
+        "provider": "Eastmoney fund quarterly top holdings",
+        "items": [],
+        "overlaps": [],
+        "failures": [{"holding_name": "portfolio", "code": "", "error": error[:300]}],
+        "coverage": {"configured_holdings": holdings_count, "returned_holdings": 0, "failed_holdings": holdings_count},
+    }
+
+
+def _empty_execution_checks(error: str) -> dict[str, Any]:
+    return {
+        "provider": "Eastmoney ETF execution checks",
+        "items": [],
+        "failures": [{"code": "portfolio", "name": "portfolio", "error": error[:300]}],
+        "coverage": {"configured_assets": 0, "returned_assets": 0, "failed_assets": 1},
+    }
+
+
+def _empty_fixed_pool_history(fixed_pool_size: int, error: str) -> dict[str, Any]:
+    return {
+        "provider": "Eastmoney fixed buy pool history",
+        "items": [],
+        "failures": [{"code": "fixed_buy_pool", "name": "fixed_buy_pool", "error": error[:300]}],
+        "coverage": {"configured_assets": fixed_pool_size, "returned_assets": 0, "failed_assets": fixed_pool_size},
+    }
+
+
+def _build_portfolio_outputs(
+    portfolio: dict[str, Any],
+    trade_ledger: dict[str, Any],
+    top_clusters: list[Any],
+    *,
+    market_snapshot: dict[str, Any],
+    tracking_summary: dict[str, Any],
+    portfolio_quotes: dict[str, Any],
+    fund_holdings: dict[str, Any],
+    execution_checks: dict[str, Any],
+    fixed_pool_history: dict[str, Any],
+    generated_at: datetime,
+    weekly_review: bool,
+) -> tuple[str, dict[str, Any], str, dict[str, Any], dict[str, Any]]:
+    weekly_review_markdown = ""
+    weekly_review_payload: dict[str, Any] = {"enabled": False}
+    portfolio_brief, portfolio_payload = build_portfolio_brief(
+        portfolio,
+        top_clusters,
+        market_snapshot=market_snapshot,
+        tracking_summary=tracking_summary,
+        portfolio_quotes=portfolio_quotes,
+        fund_holdings=fund_holdings,
+        execution_checks=execution_checks,
+        trade_ledger=trade_ledger,
+        fixed_pool_history=fixed_pool_history,
+        generated_at=generated_at,
+    )
+    portfolio_payload["enabled"] = True
+    portfolio_payload["quotes"] = portfolio_quotes
+    portfolio_payload["fund_holdings"] = fund_holdings
+    portfolio_payload["execution_checks"] = execution_checks
+    portfolio_payload["trade_ledger"] = trade_ledger
+    portfolio_payload["fixed_pool_history"] = fixed_pool_history
+    if weekly_review:
+        weekly_review_markdown, weekly_review_payload = build_weekly_portfolio_review(
+            portfolio,
+            top_clusters,
+            portfolio_quotes=portfolio_quotes,
+            fund_holdings=fund_holdings,
+            execution_checks=execution_checks,
+            trade_ledger=trade_ledger,
+            tracking_summary=tracking_summary,
+            market_snapshot=market_snapshot,
+            fixed_pool_history=fixed_pool_history,
+        )
+        weekly_review_payload["enabled"] = True
+    try:
+        decision_snapshot = build_decision_snapshot(
+            generated_at=generated_at,
+            summary=portfolio_payload.get("summary") or {},
+            event_impacts=portfolio_payload.get("event_impacts") or [],
+            candidate_scores=portfolio_payload.get("candidate_scores") or [],
+            action_board_lines=portfolio_payload.get("action_board_lines") or [],
+            execution_checks=execution_checks,
+            action_slot_lines=portfolio_payload.get("action_slot_lines") or [],
+        )
+        update_decision_journal(decision_snapshot)
+        advice_tracking = build_advice_tracking(decision_snapshot)
+        portfolio_payload["decision_snapshot"] = decision_snapshot
+        portfolio_payload["advice_tracking"] = advice_tracking
+        if advice_tracking.get("lines"):
+            portfolio_brief = portfolio_brief.rstrip() + "\n\n## 建议追踪\n\n" + "\n".join(advice_tracking["lines"]) + "\n"
+            if weekly_review_markdown:
+                weekly_review_markdown = weekly_review_markdown.rstrip() + "\n\n## 建议追踪\n\n" + "\n".join(advice_tracking["lines"]) + "\n"
+            if weekly_review_payload.get("enabled"):
+                weekly_review_payload["advice_tracking"] = advice_tracking
+    except Exception as exc:
+        portfolio_payload["decision_snapshot_error"] = f"{type(exc).__name__}: {exc}"[:300]
+    try:
+        signal_validation = build_signal_validation(
+            generated_at=generated_at,
+            portfolio_payload=portfolio_payload,
+            execution_checks=execution_checks,
+        )
+        signal_validation["enabled"] = True
+        _apply_signal_validation_adjustments(portfolio_payload, signal_validation)
+        portfolio_payload["signal_validation"] = signal_validation
+    except Exception as exc:
+        signal_validation = {
+            "enabled": False,
+            "error": f"{type(exc).__name__}: {exc}"[:300],
+            "lines": [f"- 事后验算暂不可用：{type(exc).__name__}: {exc}"[:500]],
+        }
+        portfolio_payload["signal_validation"] = signal_validation
+    return portfolio_brief, portfolio_payload, weekly_review_markdown, weekly_review_payload, signal_validation
+
+
+def run_pipeline(args: argparse.Namespace, timings: RunTimings | None = None) -> tuple[str, dict[str, Any]]:
+    timings = timings or RunTimings()
     settings = load_settings()
     generated_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
     hours_back = args.hours if args.hours is not None else settings.hours_back
@@ -1307,54 +1481,214 @@ def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
     api_source_limit = settings.api_source_limit
     window_start = generated_at - timedelta(hours=hours_back)
 
-    sources = load_sources(args.sources)
-    rss_articles, rss_source_status = collect_articles_with_status(
-        sources,
-        hours_back=hours_back,
-        per_source_limit=per_source_limit,
-        now=generated_at,
-    )
-    official_page_articles, official_page_status = collect_official_page_articles_with_status(
-        hours_back=hours_back,
-        per_source_limit=min(per_source_limit, 6),
-        now=generated_at,
-        timeout=min(settings.timeout, 15),
-    )
-    api_articles, api_source_status = collect_api_articles_with_status(
-        settings,
-        hours_back=hours_back,
-        per_source_limit=api_source_limit,
-        now=generated_at,
-        timeout=min(settings.timeout, 20),
-    )
-
-    articles = _dedupe_articles(rss_articles + official_page_articles + api_articles)
-    source_status = rss_source_status + official_page_status + api_source_status
-    articles, credibility_summary = annotate_and_filter_articles(articles)
-
-    clusters = cluster_articles(articles)
-    ranked = rank_clusters(clusters)
-    preferred_clusters = [
-        cluster
-        for cluster in ranked
-        if not (cluster.credibility_label == "低" and cluster.confirmed_source_count == 0 and not cluster.official_confirmation)
-    ]
-    fallback_clusters = [
-        cluster
-        for cluster in ranked
-        if cluster.credibility_label == "低" and cluster.confirmed_source_count == 0 and not cluster.official_confirmation
+    with timings.stage("load_config"):
+        sources = load_sources(args.sources)
+        portfolio: dict[str, Any] = {}
+        trade_ledger: dict[str, Any] = {}
+        if not args.no_portfolio:
+            portfolio = load_portfolio(args.portfolio) or {}
+            if portfolio:
+                trade_ledger = aggregate_trade_ledger(load_trade_ledger())
+                portfolio = apply_trade_ledger_to_portfolio(portfolio, trade_ledger)
+
+    def analyze_news(
+        rss_articles: list[Any],
+        official_page_articles: list[Any],
+        api_articles: list[Any],
+    ) -> tuple[list[Any], Any, list[Any], list[Any], list[Any]]:
+        # Each lens reads cluster texts from the feature store; drop entries from any previous run.
+        clear_cluster_features()
+        articles = _dedupe_articles(rss_articles + official_page_articles + api_articles)
+        articles, credibility_summary = annotate_and_filter_articles(articles)
+        credible_count = len(articles)
+        articles = collapse_near_duplicates(articles, settings.near_duplicate_threshold)
+        credibility_summary["near_duplicates_collapsed"] = credible_count - len(articles)
+        clusters = cluster_articles(articles)
+        ranked = rank_clusters(clusters)
+        preferred_clusters = [
+            cluster
+            for cluster in ranked
+            if not (cluster.credibility_label == "低" and cluster.confirmed_source_count == 0 and not cluster.official_confirmation)
+        ]
+        fallback_clusters = [
+            cluster
+            for cluster in ranked
+            if cluster.credibility_label == "低" and cluster.confirmed_source_count == 0 and not cluster.official_confirmation
+        ]
+        top_clusters = (preferred_clusters + fallback_clusters)[:top_events]
+        return articles, credibility_summary, clusters, ranked, top_clusters
+
+    stages = [
+        Stage(
+            "rss",
+            lambda: collect_articles_with_status(
+                sources,
+                hours_back=hours_back,
+                per_source_limit=per_source_limit,
+                now=generated_at,
+                timeout=min(settings.timeout, 15),
+            ),
+            outputs=("rss_articles", "rss_source_status"),
+        ),
+        Stage(
+            "official_pages",
+            lambda: collect_official_page_articles_with_status(
+                hours_back=hours_back,
+                per_source_limit=min(per_source_limit, 6),
+                now=generated_at,
+                timeout=min(settings.timeout, 15),
+            ),
+            outputs=("official_page_articles", "official_page_status"),
+        ),
+        Stage(
+            "api",
+            lambda: collect_api_articles_with_status(
+                settings,
+                hours_back=hours_back,
+                per_source_limit=api_source_limit,
+                now=generated_at,
+                timeout=min(settings.timeout, 20),
+            ),
+            outputs=("api_articles", "api_source_status"),
+        ),
+        Stage(
+            "news",
+            analyze_news,
+            inputs=("rss_articles", "official_page_articles", "api_articles"),
+            outputs=("articles", "credibility_summary", "clusters", "ranked", "top_clusters"),
+        ),
+        Stage(
+            "market_snapshot",
+            lambda: fetch_market_snapshot(timeout=min(settings.timeout, 10)),
+            fallback=lambda exc: _empty_market_snapshot(generated_at, f"{type(exc).__name__}: {exc}"),
+        ),
+        Stage(
+            "tracking_summary",
+            lambda top_clusters: build_tracking_summary(top_clusters, generated_at),
+            inputs=("top_clusters",),
+            fallback=lambda exc: _empty_tracking_summary(generated_at, f"{type(exc).__name__}: {exc}"),
+        ),
+        Stage(
+            "translations",
+            lambda top_clusters: translate_cluster_highlights(settings, top_clusters),
+            inputs=("top_clusters",),
+            fallback=lambda exc: {
+                "enabled": False,
+                "items": {},
+                "error": f"{type(exc).__name__}: {exc}"[:300],
+            },
+        ),
+        Stage(
+            "global_report",
+            lambda top_clusters, market_snapshot, tracking_summary: render_report(
+                settings,
+                top_clusters,
+                args.mode,
+                market_snapshot=market_snapshot,
+                tracking_summary=tracking_summary,
+            ),
+            inputs=("top_clusters", "market_snapshot", "tracking_summary"),
+            outputs=("global_report", "llm_used", "prompt_budget"),
+        ),
     ]
-    top_clusters = (preferred_clusters + fallback_clusters)[:top_events]
-
-    try:
-        market_snapshot = fetch_market_snapshot(timeout=min(settings.timeout, 10))
-    except Exception as exc:
-        market_snapshot = _empty_market_snapshot(generated_at, f"{type(exc).__name__}: {exc}")
+    if portfolio:
+        fixed_pool_size = len(((portfolio.get("decision_cockpit") or {}).get("fixed_buy_pool") or []))
+
+        def fetch_quotes() -> dict[str, Any]:
+            portfolio_quotes = fetch_portfolio_quotes(portfolio, timeout=min(settings.timeout, 12))
+            update_portfolio_history(portfolio_quotes)
+            return portfolio_quotes
+
+        stages.extend(
+            [
+                Stage(
+                    "portfolio_quotes",
+                    fetch_quotes,
+                    fallback=lambda exc: _empty_portfolio_quotes(portfolio, generated_at, f"{type(exc).__name__}: {exc}"),
+                ),
+                Stage(
+                    "fund_holdings",
+                    lambda portfolio_quotes: fetch_portfolio_fund_holdings(
+                        portfolio, timeout=min(settings.timeout, 12), top_n=10, portfolio_quotes=portfolio_quotes
+                    ),
+                    inputs=("portfolio_quotes",),
+                    fallback=lambda exc: _empty_fund_holdings(portfolio, f"{type(exc).__name__}: {exc}"),
+                ),
+                Stage(
+                    "execution_checks",
+                    lambda: fetch_execution_checks(portfolio, timeout=min(settings.timeout, 10)),
+                    fallback=lambda exc: _empty_execution_checks(f"{type(exc).__name__}: {exc}"),
+                ),
+                Stage(
+                    "fixed_pool_history",
+                    lambda: fetch_fixed_pool_history(portfolio, timeout=min(settings.timeout, 15)),
+                    fallback=lambda exc: _empty_fixed_pool_history(fixed_pool_size, f"{type(exc).__name__}: {exc}"),
+                ),
+                Stage(
+                    "signal_prices",
+                    lambda: refresh_signal_price_history(timeout=min(settings.timeout, 10)),
+                    fallback=lambda exc: {"error": f"{type(exc).__name__}: {exc}"[:300]},
+                ),
+                Stage(
+                    "portfolio_outputs",
+                    lambda top_clusters, market_snapshot, tracking_summary, portfolio_quotes, fund_holdings, execution_checks, fixed_pool_history: _build_portfolio_outputs(
+                        portfolio,
+                        trade_ledger,
+                        top_clusters,
+                        market_snapshot=market_snapshot,
+                        tracking_summary=tracking_summary,
+                        portfolio_quotes=portfolio_quotes,
+                        fund_holdings=fund_holdings,
+                        execution_checks=execution_checks,
+                        fixed_pool_history=fixed_pool_history,
+                        generated_at=generated_at,
+                        weekly_review=args.weekly_review,
+                    ),
+                    inputs=(
+                        "top_clusters",
+                        "market_snapshot",
+                        "tracking_summary",
+                        "portfolio_quotes",
+                        "fund_holdings",
+                        "execution_checks",
+                        "fixed_pool_history",
+                    ),
+                    outputs=(
+                        "portfolio_brief",
+                        "portfolio_payload",
+                        "weekly_review_markdown",
+                        "weekly_review_payload",
+                        "signal_validation",
+                    ),
+                    # Signal horizons resolve against the daily closes this stage brings up to date.
+                    after=("signal_prices",),
+                ),
+            ]
+        )
 
-    try:
-        tracking_summary = build_tracking_summary(top_clusters, generated_at)
-    except Exception as exc:
-        tracking_summary = _empty_tracking_summary(generated_at, f"{type(exc).__name__}: {exc}")
+    results = run_stages(stages, timings=timings)
+    rss_articles = results["rss_articles"]
+    official_page_articles = results["official_page_articles"]
+    api_articles = results["api_articles"]
+    rss_source_status = results["rss_source_status"]
+    api_source_status = results["api_source_status"]
+    source_status = rss_source_status + results["official_page_status"] + api_source_status
+    articles = results["articles"]
+    credibility_summary = results["credibility_summary"]
+    clusters = results["clusters"]
+    ranked = results["ranked"]
+    top_clusters = results["top_clusters"]
+    market_snapshot = results["market_snapshot"]
+    tracking_summary = results["tracking_summary"]
+    translations = results["translations"]
+    global_report = results["global_report"]
+    llm_used = results["llm_used"]
+    prompt_budget = results["prompt_budget"]
+    portfolio_brief: str = results.get("portfolio_brief", "")
+    portfolio_payload: dict[str, Any] = results.get("portfolio_payload") or {"enabled": False}
+    weekly_review_markdown: str = results.get("weekly_review_markdown", "")
+    weekly_review_payload: dict[str, Any] = results.get("weekly_review_payload") or {"enabled": False}
+    signal_validation: dict[str, Any] = results.get("signal_validation") or {"enabled": False, "lines": []}
 
     published_values = [article.published_at for article in articles]
     latest_article_at = max(published_values) if published_values else None
@@ -1370,149 +1704,11 @@ def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
         official_page_articles_count=len(official_page_articles),
         credibility_summary=credibility_summary,
     )
-    strategic_lens = build_strategic_lens(top_clusters, market_snapshot)
-    prediction_lens = build_prediction_lens(top_clusters, market_snapshot)
-    macro_burst_risk = build_macro_burst_risk(top_clusters, market_snapshot)
-    logic_playbook = build_logic_playbook()
-
-    portfolio_brief = ""
-    portfolio_payload: dict[str, Any] = {"enabled": False}
-    weekly_review_markdown = ""
-    weekly_review_payload: dict[str, Any] = {"enabled": False}
-    signal_validation: dict[str, Any] = {"enabled": False, "lines": []}
-    if not args.no_portfolio:
-        portfolio = load_portfolio(args.portfolio)
-        if portfolio:
-            trade_ledger = aggregate_trade_ledger(load_trade_ledger())
-            portfolio = apply_trade_ledger_to_portfolio(portfolio, trade_ledger)
-            try:
-                portfolio_quotes = fetch_portfolio_quotes(portfolio, timeout=min(settings.timeout, 12))
-                update_portfolio_history(portfolio_quotes)
-            except Exception as exc:
-                portfolio_quotes = {
-                    "provider": "Eastmoney fundgz + Eastmoney fund history",
-                    "captured_at_utc": generated_at.isoformat(),
-                    "items": [],
-                    "failures": [{"holding_name": "portfolio", "code": "", "error": f"{type(exc).__name__}: {exc}"[:300]}],
-                    "coverage": {"configured_holdings": len(portfolio.get("holdings") or []), "returned_holdings": 0, "failed_holdings": len(portfolio.get("holdings") or [])},
-                    "portfolio_estimated_day_change_pct": None,
-                    "portfolio_week_change_pct": None,
-                    "leaders": {"top_positive": [], "top_negative": []},
-                }
-            try:
-                fund_holdings = fetch_portfolio_fund_holdings(portfolio, timeout=min(settings.timeout, 12), top_n=10, portfolio_quotes=portfolio_quotes)
-            except Exception as exc:
-                fund_holdings = {
-                    "provider": "Eastmoney fund quarterly top holdings",
-                    "items": [],
-                    "overlaps": [],
-                    "failures": [{"holding_name": "portfolio", "code": "", "error": f"{type(exc).__name__}: {exc}"[:300]}],
-                    "coverage": {"configured_holdings": len(portfolio.get("holdings") or []), "returned_holdings": 0, "failed_holdings": len(portfolio.get("holdings") or [])},
-                }
-            try:
-                execution_checks = fetch_execution_checks(portfolio, timeout=min(settings.timeout, 10))
-            except Exception as exc:
-                execution_checks = {
-                    "provider": "Eastmoney ETF execution checks",
-                    "items": [],
-                    "failures": [{"code": "portfolio", "name": "portfolio", "error": f"{type(exc).__name__}: {exc}"[:300]}],
-                    "coverage": {"configured_assets": 0, "returned_assets": 0, "failed_assets": 1},
-                }
-            fixed_pool_size = len(((portfolio.get("decision_cockpit") or {}).get("fixed_buy_pool") or []))
-            try:
-                fixed_pool_history = fetch_fixed_pool_history(portfolio, timeout=min(settings.timeout, 15))
-            except Exception as exc:
-                fixed_pool_history = {
-                    "provider": "Eastmoney fixed buy pool history",
-                    "items": [],
-                    "failures": [{"code": "fixed_buy_pool", "name": "fixed_buy_pool", "error": f"{type(exc).__name__}: {exc}"[:300]}],
-                    "coverage": {"configured_assets": fixed_pool_size, "returned_assets": 0, "failed_assets": fixed_pool_size},
-                }
-            portfolio_brief, portfolio_payload = build_portfolio_brief(
-                portfolio,
-                top_clusters,
-                market_snapshot=market_snapshot,
-                tracking_summary=tracking_summary,
-                portfolio_quotes=portfolio_quotes,
-                fund_holdings=fund_holdings,
-                execution_checks=execution_checks,
-                trade_ledger=trade_ledger,
-                fixed_pool_history=fixed_pool_history,
-                generated_at=generated_at,
-            )
-            portfolio_payload["enabled"] = True
-            portfolio_payload["quotes"] = portfolio_quotes
-            portfolio_payload["fund_holdings"] = fund_holdings
-            portfolio_payload["execution_checks"] = execution_checks
-            portfolio_payload["trade_ledger"] = trade_ledger
-            portfolio_payload["fixed_pool_history"] = fixed_pool_history
-            if args.weekly_review:
-                weekly_review_markdown, weekly_review_payload = build_weekly_portfolio_review(
-                    portfolio,
-                    top_clusters,
-                    portfolio_quotes=portfolio_quotes,
-                    fund_holdings=fund_holdings,
-                    execution_checks=execution_checks,
-                    trade_ledger=trade_ledger,
-                    tracking_summary=tracking_summary,
-                    market_snapshot=market_snapshot,
-                    fixed_pool_history=fixed_pool_history,
-                )
-                weekly_review_payload["enabled"] = True
-            try:
-                decision_snapshot = build_decision_snapshot(
-                    generated_at=generated_at,
-                    summary=portfolio_payload.get("summary") or {},
-                    event_impacts=portfolio_payload.get("event_impacts") or [],
-                    candidate_scores=portfolio_payload.get("candidate_scores") or [],
-                    action_board_lines=portfolio_payload.get("action_board_lines") or [],
-                    execution_checks=execution_checks,
-                    action_slot_lines=portfolio_payload.get("action_slot_lines") or [],
-                )
-                update_decision_journal(decision_snapshot)
-                advice_tracking = build_advice_tracking(decision_snapshot)
-                portfolio_payload["decision_snapshot"] = decision_snapshot
-                portfolio_payload["advice_tracking"] = advice_tracking
-                if advice_tracking.get("lines"):
-                    portfolio_brief = portfolio_brief.rstrip() + "\n\n## 建议追踪\n\n" + "\n".join(advice_tracking["lines"]) + "\n"
-                    if weekly_review_markdown:
-                        weekly_review_markdown = weekly_review_markdown.rstrip() + "\n\n## 建议追踪\n\n" + "\n".join(advice_tracking["lines"]) + "\n"
-                    if weekly_review_payload.get("enabled"):
-                        weekly_review_payload["advice_tracking"] = advice_tracking
-            except Exception as exc:
-                portfolio_payload["decision_snapshot_error"] = f"{type(exc).__name__}: {exc}"[:300]
-            try:
-                signal_validation = build_signal_validation(
-                    generated_at=generated_at,
-                    portfolio_payload=portfolio_payload,
-                    execution_checks=execution_checks,
-                )
-                signal_validation["enabled"] = True
-                _apply_signal_validation_adjustments(portfolio_payload, signal_validation)
-                portfolio_payload["signal_validation"] = signal_validation
-            except Exception as exc:
-                signal_validation = {
-                    "enabled": False,
-                    "error": f"{type(exc).__name__}: {exc}"[:300],
-                    "lines": [f"- 事后验算暂不可用：{type(exc).__name__}: {exc}"[:500]],
-                }
-                portfolio_payload["signal_validation"] = signal_validation
-
-    try:
-        translations = translate_cluster_highlights(settings, top_clusters)
-    except Exception as exc:
-        translations = {
-            "enabled": False,
-            "items": {},
-            "error": f"{type(exc).__name__}: {exc}"[:300],
-        }
-    global_report, llm_used = render_report(
-        settings,
-        top_clusters,
-        args.mode,
-        market_snapshot=market_snapshot,
-        tracking_summary=tracking_summary,
-    )
+    with timings.stage("lenses"):
+        strategic_lens = build_strategic_lens(top_clusters, market_snapshot)
+        prediction_lens = build_prediction_lens(top_clusters, market_snapshot)
+        macro_burst_risk = build_macro_burst_risk(top_clusters, market_snapshot)
+        logic_playbook = build_logic_playbook()
     macro_burst_risk_markdown = render_macro_burst_risk_markdown(macro_burst_risk)
     if macro_burst_risk_markdown:
         global_report = global_report.rstrip() + "\n\n" + macro_burst_risk_markdown + "\n"
@@ -1531,12 +1727,13 @@ def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
     global_report = global_report.rstrip() + "\n\n" + _render_data_quality_section(data_quality) + "\n"
     report = f"{portfolio_brief}\n\n---\n\n{global_report}" if portfolio_brief else global_report
 
-    history_update_error = ""
-    try:
-        history_clusters = ranked[: max(top_events, 8)]
-        update_event_history(history_clusters, generated_at)
-    except Exception as exc:
-        history_update_error = f"{type(exc).__name__}: {exc}"
+    with timings.stage("event_history"):
+        history_update_error = ""
+        try:
+            history_clusters = ranked[: max(top_events, 8)]
+            update_event_history(history_clusters, generated_at)
+        except Exception as exc:
+            history_update_error = f"{type(exc).__name__}: {exc}"
 
     payload = {
         "mode": args.mode,
@@ -1546,6 +1743,7 @@ def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
         "per_source_limit": per_source_limit,
         "api_source_limit": api_source_limit,
         "llm_used": llm_used,
+        "prompt_budget": prompt_budget,
         "articles_count": len(articles),
         "rss_articles_count": len(rss_articles),
         "official_page_articles_count": len(official_page_articles),
@@ -1578,26 +1776,27 @@ def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
         "translations": translations,
         "clusters": [cluster.to_dict() for cluster in top_clusters],
     }
-    try:
-        watchlist_summary = evaluate_watchlist(
-            generated_at=generated_at,
-            clusters=top_clusters,
-            market_snapshot=market_snapshot,
-            portfolio_payload=portfolio_payload,
-        )
-    except Exception as exc:
-        watchlist_summary = {
-            "generated_at_utc": generated_at.isoformat(),
-            "active_count": 0,
-            "triggered_count": 0,
-            "expired_count": 0,
-            "new_count": 0,
-            "triggered_items": [],
-            "new_items": [],
-            "active_items": [],
-            "error": f"{type(exc).__name__}: {exc}"[:300],
-            "lines": [f"- watchlist 检查失败：{type(exc).__name__}: {exc}"[:500]],
-        }
+    with timings.stage("watchlist"):
+        try:
+            watchlist_summary = evaluate_watchlist(
+                generated_at=generated_at,
+                clusters=top_clusters,
+                market_snapshot=market_snapshot,
+                portfolio_payload=portfolio_payload,
+            )
+        except Exception as exc:
+            watchlist_summary = {
+                "generated_at_utc": generated_at.isoformat(),
+                "active_count": 0,
+                "triggered_count": 0,
+                "expired_count": 0,
+                "new_count": 0,
+                "triggered_items": [],
+                "new_items": [],
+                "active_items": [],
+                "error": f"{type(exc).__name__}: {exc}"[:300],
+                "lines": [f"- watchlist 检查失败：{type(exc).__name__}: {exc}"[:500]],
+            }
     payload["watchlist"] = watchlist_summary
     receipt_status = _load_feishu_receipt_status()
     payload["feishu_receipts"] = receipt_status
@@ -1626,6 +1825,7 @@ def run_pipeline(args: argparse.Namespace) -> tuple[str, dict[str, Any]]:
             payload["portfolio_brief_markdown"] = portfolio_brief
             payload["portfolio"]["watchlist_lines"] = watchlist_summary.get("lines") or []
             payload["portfolio"]["watchlist"] = watchlist_summary
+    payload["timings"] = timings.to_dict()
     return report, payload
 
 
@@ -1633,7 +1833,8 @@ def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    report, payload = run_pipeline(args)
+    timings = RunTimings(profile=args.profile)
+    report, payload = run_pipeline(args, timings)
     global_report = str(payload.pop("_global_report_markdown", "") or "")
 
     report_path = Path(args.output).resolve()
@@ -1679,30 +1880,36 @@ def main(argv: list[str] | None = None) -> int:
         "archive_index_url": payload["output_paths"]["archive_index_url"],
     }
 
-    output_payload = _public_payload_without_private_portfolio(payload) if redact_portfolio_outputs else copy.deepcopy(payload)
-    if dashboard_public_url:
-        output_payload = _sanitize_public_output_references(output_payload)
-    output_payload = _sanitize_public_feishu_receipts(output_payload)
+    with timings.stage("redaction"):
+        output_payload = _public_output_payload(payload, redact_portfolio_outputs, dashboard_public_url)
     output_report = global_report if redact_portfolio_outputs and global_report else report
 
-    save_text(args.output, output_report)
-    if not redact_portfolio_outputs and payload.get("portfolio_brief_markdown"):
-        save_text(args.portfolio_output, payload["portfolio_brief_markdown"])
-    if not redact_portfolio_outputs and payload.get("weekly_review_markdown"):
-        save_text(args.weekly_review_output, payload["weekly_review_markdown"])
+    with timings.stage("save_markdown"):
+        save_text(args.output, output_report)
+        if not redact_portfolio_outputs and payload.get("portfolio_brief_markdown"):
+            save_text(args.portfolio_output, payload["portfolio_brief_markdown"])
+        if not redact_portfolio_outputs and payload.get("weekly_review_markdown"):
+            save_text(args.weekly_review_output, payload["weekly_review_markdown"])
 
     dashboard_error = ""
-    try:
-        dashboard_html = render_dashboard_html(output_payload)
-        save_text(args.dashboard_output, dashboard_html)
-    except Exception as exc:
-        dashboard_error = f"{type(exc).__name__}: {exc}"
-        output_payload["dashboard"]["enabled"] = False
-        output_payload["dashboard"]["error"] = dashboard_error
-
-    save_json(args.json_output, output_payload)
+    with timings.stage("dashboard"):
+        try:
+            # The stylesheet is a shared file next to the page so archived runs don't each carry a copy.
+            render_cache = SectionCache(dashboard_path.with_name(DASHBOARD_RENDER_CACHE_FILE) if args.dashboard_render_cache else None)
+            dashboard_html = render_dashboard_html(output_payload, cache=render_cache, css_href=dashboard_css_href())
+            save_text(dashboard_path.with_name(DASHBOARD_CSS_FILE), dashboard_css())
+            save_text(args.dashboard_output, dashboard_html)
+        except Exception as exc:
+            dashboard_error = f"{type(exc).__name__}: {exc}"
+            output_payload["dashboard"] = {**output_payload["dashboard"], "enabled": False, "error": dashboard_error}
+
+    # State lives in outputs/state.sqlite3; the JSON copies feed the Pages archive and the next CI restore.
+    with timings.stage("state_export"):
+        exported_state = export_state_json()
 
     settings = load_settings()
+    sender = ""
+    feishu_error: Exception | None = None
     if args.send_feishu and (
         settings.feishu_webhook_url
         or (
@@ -1711,21 +1918,48 @@ def main(argv: list[str] | None = None) -> int:
             and (settings.feishu_send_chat_id or settings.feishu_send_chat_name)
         )
     ):
-        feishu_content = _build_feishu_digest(payload, settings.feishu_receipt_form_url)
-        sender = send_feishu_message(
-            webhook_url=settings.feishu_webhook_url,
-            app_id=settings.feishu_app_id,
-            app_secret=settings.feishu_app_secret,
-            chat_id=settings.feishu_send_chat_id,
-            chat_name=settings.feishu_send_chat_name,
-            title="每日投资雷达",
-            content=feishu_content,
-            allow_webhook_fallback=settings.feishu_allow_webhook_fallback,
+        # Sent before the timings snapshot so report.json includes it; a failure is re-raised once report.json is saved.
+        with timings.stage("feishu"):
+            try:
+                feishu_content = _build_feishu_digest(payload, settings.feishu_receipt_form_url)
+                sender = send_feishu_message(
+                    webhook_url=settings.feishu_webhook_url,
+                    app_id=settings.feishu_app_id,
+                    app_secret=settings.feishu_app_secret,
+                    chat_id=settings.feishu_send_chat_id,
+                    chat_name=settings.feishu_send_chat_name,
+                    title="每日投资雷达",
+                    content=feishu_content,
+                    allow_webhook_fallback=settings.feishu_allow_webhook_fallback,
+                )
+            except Exception as exc:
+                feishu_error = exc
+
+    output_payload["timings"] = timings.to_dict()
+    if args.profile:
+        output_payload["timings"]["profile_path"] = args.profile_output
+    with timings.stage("save_json"):
+        json_stats = save_json(
+            args.json_output,
+            output_payload,
+            compact=args.json_compact,
+            side_files=args.json_side_files,
+            gzip_copy=args.json_gzip,
         )
+    if feishu_error is not None:
+        raise feishu_error
+    if sender:
         print(f"Feishu message sent via {sender}.")
 
     print(f"Markdown report saved to: {report_path}")
-    print(f"JSON metadata saved to: {json_path}")
+    json_size = f"{json_stats['bytes'] / 1024:.1f} KB"
+    if json_stats["side_files"]:
+        json_size += f" + {json_stats['side_files']} side files {json_stats['side_file_bytes'] / 1024:.1f} KB"
+    if "gzip_bytes" in json_stats:
+        json_size += f", gzip {json_stats['gzip_bytes'] / 1024:.1f} KB"
+    print(f"JSON metadata saved to: {json_path} ({json_size})")
+    if exported_state:
+        print(f"State exported: {', '.join(path.name for path in exported_state)}")
     if redact_portfolio_outputs:
         print("Portfolio outputs redacted from public dashboard/report; private action lines sent to Feishu.")
     elif payload.get("portfolio", {}).get("enabled"):
@@ -1737,6 +1971,12 @@ def main(argv: list[str] | None = None) -> int:
     elif dashboard_error:
         print(f"Dashboard skipped: {dashboard_error}")
     print(f"LLM used: {payload['llm_used']}")
+    prompt_budget = payload["prompt_budget"]
+    print(
+        f"Report prompt: ~{prompt_budget['estimated_tokens']} tokens"
+        f" (budget {prompt_budget['token_budget'] or 'off'}, trimmed clusters {prompt_budget['trimmed_clusters']},"
+        f" untrimmed ~{prompt_budget['untrimmed_estimated_tokens']})"
+    )
     print(
         "RSS sources with articles: "
         f"{payload['source_coverage']['rss_sources_with_articles']}/"
@@ -1770,6 +2010,9 @@ def main(argv: list[str] | None = None) -> int:
         f"actual articles: {payload['oldest_article_at_utc']} -> {payload['latest_article_at_utc']}"
     )
     print(f"Credibility-filtered articles: {payload.get('credibility_summary', {}).get('filtered_articles', 0)}")
+    print(f"Run timings: {format_timings_summary(timings.to_dict())}")
+    if args.profile and timings.dump_profile(args.profile_output):
+        print(f"Profile saved to: {Path(args.profile_output).resolve()}")
     return 0
 
 if __name__ == "__main__":
@@ -1,13 +1,23 @@
 ﻿from __future__ import annotations
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
-import requests
+from .config import ROOT_DIR
+from .http_client import http_get
+from .price_store import append_prices
 
 
 YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
 DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_WORKERS = 6
+QUOTE_CACHE_PATH = ROOT_DIR / "outputs" / "market_quote_cache.json"
+QUOTE_CACHE_TTL_SECONDS = 300
 ASSETS = (
     {"name": "WTI原油", "symbol": "CL=F", "group": "energy"},
     {"name": "布伦特原油", "symbol": "BZ=F", "group": "energy"},
@@ -53,9 +63,23 @@ def _movement(change_pct: float | None) -> str:
 
 
 
+def _record_daily_closes(symbol: str, result: dict[str, Any], closes: list[Any]) -> None:
+    # Yahoo bar timestamps are exchange-local session starts; shift by the exchange offset before taking the day.
+    offset = int((result.get("meta") or {}).get("gmtoffset") or 0)
+    rows = [
+        {"date": datetime.fromtimestamp(stamp + offset, tz=timezone.utc).date(), "close": _safe_float(close)}
+        for stamp, close in zip(result.get("timestamp") or [], closes)
+        if isinstance(stamp, int) and _safe_float(close) is not None
+    ]
+    try:
+        append_prices(f"yahoo/{symbol}", rows)
+    except OSError:
+        pass
+
+
 def fetch_quote(symbol: str, timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
     endpoint = YAHOO_CHART_URL.format(symbol=symbol)
-    response = requests.get(
+    response = http_get(
         endpoint,
         params={"interval": "1d", "range": "5d", "includePrePost": "false"},
         timeout=timeout,
@@ -69,6 +93,7 @@ def fetch_quote(symbol: str, timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
     indicators = result.get("indicators") or {}
     quotes = (indicators.get("quote") or [{}])[0]
     closes = quotes.get("close") or []
+    _record_daily_closes(symbol, result, closes)
     previous_close, latest_close = _latest_two(closes)
     market_price = _safe_float(meta.get("regularMarketPrice")) or latest_close
     previous_close = previous_close or _safe_float(meta.get("chartPreviousClose")) or _safe_float(meta.get("previousClose"))
@@ -99,21 +124,84 @@ def fetch_quote(symbol: str, timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
 
 
 
-def fetch_market_snapshot(timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
+def load_quote_cache(path: str | Path | None = None) -> dict[str, Any]:
+    target = Path(path) if path else QUOTE_CACHE_PATH
+    if not target.exists():
+        return {}
+    try:
+        payload = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_quote_cache(payload: dict[str, Any], path: str | Path | None = None) -> None:
+    target = Path(path) if path else QUOTE_CACHE_PATH
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _fresh_cached_quote(cache: dict[str, Any], symbol: str, now: float, ttl: float) -> dict[str, Any] | None:
+    entry = cache.get(symbol)
+    if not isinstance(entry, dict) or not isinstance(entry.get("quote"), dict):
+        return None
+    try:
+        age = now - float(entry.get("fetched_at") or 0)
+    except (TypeError, ValueError):
+        return None
+    if age < 0 or age > ttl:
+        return None
+    return dict(entry["quote"])
+
+
+def fetch_market_snapshot(
+    timeout: int = DEFAULT_TIMEOUT,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cache_path: str | Path | None = QUOTE_CACHE_PATH,
+    cache_ttl: float = QUOTE_CACHE_TTL_SECONDS,
+) -> dict[str, Any]:
+    now = time.time()
+    cache = load_quote_cache(cache_path) if cache_path else {}
+    quotes: dict[str, dict[str, Any]] = {}
+    errors: dict[str, Exception] = {}
+    for asset in ASSETS:
+        cached = _fresh_cached_quote(cache, asset["symbol"], now, cache_ttl)
+        if cached is not None:
+            cached["cached"] = True
+            quotes[asset["symbol"]] = cached
+
+    missing = [asset["symbol"] for asset in ASSETS if asset["symbol"] not in quotes]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing))), thread_name_prefix="quote") as executor:
+            futures = {symbol: executor.submit(copy_context().run, fetch_quote, symbol, timeout) for symbol in missing}
+        for symbol, future in futures.items():
+            try:
+                quotes[symbol] = future.result()
+            except Exception as exc:
+                errors[symbol] = exc
+                continue
+            cache[symbol] = {"fetched_at": now, "quote": quotes[symbol]}
+        if cache_path and len(errors) < len(missing):
+            try:
+                save_quote_cache({asset["symbol"]: cache[asset["symbol"]] for asset in ASSETS if asset["symbol"] in cache}, cache_path)
+            except OSError:
+                pass
+
     items: list[dict[str, Any]] = []
     failures: list[dict[str, str]] = []
     for asset in ASSETS:
-        try:
-            quote = fetch_quote(asset["symbol"], timeout=timeout)
-            quote["name"] = asset["name"]
-            quote["group"] = asset["group"]
-            items.append(quote)
-        except Exception as exc:
+        if asset["symbol"] in errors:
+            exc = errors[asset["symbol"]]
             failures.append({
                 "name": asset["name"],
                 "symbol": asset["symbol"],
                 "error": f"{type(exc).__name__}: {exc}"[:300],
             })
+            continue
+        quote = quotes[asset["symbol"]]
+        quote["name"] = asset["name"]
+        quote["group"] = asset["group"]
+        items.append(quote)
 
     return {
         "provider": "Yahoo Finance chart API",
@@ -124,5 +212,6 @@ def fetch_market_snapshot(timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
             "configured_assets": len(ASSETS),
             "returned_assets": len(items),
             "failed_assets": len(failures),
+            "cached_assets": sum(1 for item in items if item.get("cached")),
         },
     }
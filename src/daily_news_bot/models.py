@@ -31,6 +31,9 @@ class Article:
     credibility_score: float = 0.0
     credibility_label: str = "未知"
     credibility_flags: list[str] = field(default_factory=list)
+    syndicated_count: int = 1
+    syndicated_sources: list[str] = field(default_factory=list)
+    syndicated_domains: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
@@ -54,13 +57,20 @@ class EventCluster:
     official_confirmation: bool = False
     credibility_notes: list[str] = field(default_factory=list)
 
+    @property
+    def source_names(self) -> set[str]:
+        names = {item.source for item in self.articles}
+        for item in self.articles:
+            names.update(item.syndicated_sources)
+        return names
+
+    @property
+    def coverage_count(self) -> int:
+        return sum(item.syndicated_count for item in self.articles)
+
     @property
     def representative(self) -> Article:
-        return sorted(
-            self.articles,
-            key=lambda item: (item.source_weight, item.published_at.timestamp()),
-            reverse=True,
-        )[0]
+        return max(self.articles, key=lambda item: (item.source_weight, item.published_at.timestamp()))
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Iterable
+
+from .models import Article
+
+
+DEFAULT_THRESHOLD = 0.6
+SHINGLE_SIZE = 2
+NUM_PERMUTATIONS = 16
+BANDS = 8
+RELIABLE_CREDIBILITY = 0.56
+# Fixed 32-bit masks keep signatures, and therefore collapses, identical across runs.
+# XOR-ing crc32 values stays in small-int arithmetic; candidates are verified with exact Jaccard anyway.
+_MASKS = tuple((index * 0x9E3779B1 + 0x7F4A7C15) & 0xFFFFFFFF for index in range(1, NUM_PERMUTATIONS + 1))
+TOKEN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+
+
+def shingles(article: Article, size: int = SHINGLE_SIZE) -> set[int]:
+    tokens = TOKEN_RE.findall(f"{article.title} {article.summary}".lower())
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {zlib.crc32(" ".join(tokens[index : index + size]).encode("utf-8")) for index in range(len(tokens) - size + 1)}
+
+
+def minhash_signature(shingle_hashes: Iterable[int]) -> tuple[int, ...]:
+    values = tuple(shingle_hashes)
+    return tuple(min([value ^ mask for value in values]) for mask in _MASKS)
+
+
+def _jaccard(left: set[int], right: set[int]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _keeper_key(article: Article) -> tuple[bool, float, float, float]:
+    return (article.official_source, article.credibility_score, article.source_weight, -article.published_at.timestamp())
+
+
+def _find(parents: list[int], index: int) -> int:
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def near_duplicate_groups(articles: list[Article], threshold: float = DEFAULT_THRESHOLD) -> list[list[int]]:
+    """Groups of article positions whose shingle Jaccard reaches ``threshold``; LSH bands only propose pairs."""
+    shingle_sets = [shingles(article) for article in articles]
+    rows = NUM_PERMUTATIONS // BANDS
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    for position, shingle_set in enumerate(shingle_sets):
+        if not shingle_set:
+            continue
+        signature = minhash_signature(shingle_set)
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows : (band + 1) * rows])].append(position)
+
+    parents = list(range(len(articles)))
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for offset, left in enumerate(members):
+            for right in members[offset + 1 :]:
+                if (left, right) in checked:
+                    continue
+                checked.add((left, right))
+                if _find(parents, left) == _find(parents, right):
+                    continue
+                if _jaccard(shingle_sets[left], shingle_sets[right]) >= threshold:
+                    parents[_find(parents, right)] = _find(parents, left)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for position in range(len(articles)):
+        groups[_find(parents, position)].append(position)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def collapse_near_duplicates(articles: list[Article], threshold: float = DEFAULT_THRESHOLD) -> list[Article]:
+    """Keep one article per wire story; the keeper carries the other copies' sources so spread is not lost."""
+    if threshold <= 0 or threshold > 1 or len(articles) < 2:
+        return list(articles)
+
+    result = list(articles)
+    dropped: set[int] = set()
+    for members in near_duplicate_groups(articles, threshold):
+        keeper_position = max(members, key=lambda position: _keeper_key(articles[position]))
+        keeper = articles[keeper_position]
+        sources = list(keeper.syndicated_sources)
+        domains = list(keeper.syndicated_domains)
+        count = keeper.syndicated_count
+        for position in members:
+            if position == keeper_position:
+                continue
+            copy = articles[position]
+            dropped.add(position)
+            count += copy.syndicated_count
+            for source in [copy.source, *copy.syndicated_sources]:
+                if source != keeper.source and source not in sources:
+                    sources.append(source)
+            reliable_domains = [copy.source_domain] if copy.source_domain and copy.credibility_score >= RELIABLE_CREDIBILITY else []
+            for domain in reliable_domains + list(copy.syndicated_domains):
+                if domain not in domains:
+                    domains.append(domain)
+        keeper.syndicated_count = count
+        keeper.syndicated_sources = sources
+        keeper.syndicated_domains = domains
+        # The keeper takes the slot of the earliest copy so downstream ordering is unchanged.
+        first_position = min(members)
+        if keeper_position != first_position:
+            dropped.discard(first_position)
+            dropped.add(keeper_position)
+            result[first_position] = keeper
+
+    return [article for position, article in enumerate(result) if position not in dropped]
@@ -7,9 +7,9 @@ from datetime import datetime, timedelta
 from typing import Any
 from urllib.parse import urljoin
 
-import requests
 from dateutil import parser as date_parser
 
+from .http_client import http_get
 from .models import Article
 
 
@@ -100,7 +100,7 @@ def fetch_official_page_articles(
     cutoff = current - timedelta(hours=hours_back)
     future_cutoff = current + timedelta(hours=18)
     status = _status(source)
-    response = requests.get(source.url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout)
+    response = http_get(source.url, headers={"User-Agent": "Mozilla/5.0"}, timeout=timeout)
     response.raise_for_status()
     response.encoding = response.apparent_encoding or response.encoding
     text = response.text
@@ -3,7 +3,6 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-import re
 from typing import Any
 
 import yaml
@@ -19,6 +18,8 @@ from .industry_radar import (
     render_industry_radar_lines,
     save_industry_radar_state,
 )
+from .cluster_features import cluster_features
+from .keyword_matcher import WORD, KeywordHits, KeywordMatcher
 from .models import EventCluster
 
 
@@ -181,6 +182,11 @@ THEME_RULES: dict[str, dict[str, Any]] = {
 }
 
 
+THEME_MATCHER = KeywordMatcher(
+    {theme_key: rule["keywords"] for theme_key, rule in THEME_RULES.items()},
+    mode=WORD,
+    normalize=lambda keyword: keyword.lower().strip(),
+)
 DEFAULT_LONG_TERM_CANDIDATE_ETF_POOL: list[dict[str, Any]] = [
     {
         "theme": "AI电力底座",
@@ -307,27 +313,13 @@ def _fmt_pct_or_unknown(value: float | None) -> str:
     return _fmt_pct(value)
 
 
-def _text_for_cluster(cluster: EventCluster) -> str:
-    representative = cluster.representative
-    return f"{representative.title} {representative.summary} {representative.source}".lower()
-
-
-def _keyword_in_text(keyword: str, text: str) -> bool:
-    lowered = keyword.lower().strip()
-    if not lowered:
-        return False
-    if any("a" <= char <= "z" for char in lowered):
-        return re.search(rf"\b{re.escape(lowered)}\b", text) is not None
-    return lowered in text
+def _theme_hits(cluster: EventCluster) -> KeywordHits:
+    features = cluster_features(cluster)
+    return features.memo("portfolio.theme_hits", lambda: THEME_MATCHER.scan(features.source_text))
 
 
 def _match_event_themes(cluster: EventCluster) -> list[str]:
-    text = _text_for_cluster(cluster)
-    matched: list[str] = []
-    for theme_key, rule in THEME_RULES.items():
-        if any(_keyword_in_text(keyword, text) for keyword in rule["keywords"]):
-            matched.append(theme_key)
-    return matched
+    return _theme_hits(cluster).keys()
 
 
 def _holding_themes(holding: dict[str, Any]) -> str:
@@ -2961,10 +2953,10 @@ def _event_impacts(clusters: list[EventCluster], portfolio: dict[str, Any]) -> l
     for cluster in clusters:
         matched_theme_keys = _match_event_themes(cluster)
         if not matched_theme_keys:
-            text = _text_for_cluster(cluster)
-            if any(_keyword_in_text(keyword, text) for keyword in THEME_RULES["gold"]["keywords"]):
+            hits = _theme_hits(cluster)
+            if hits.any("gold"):
                 matched_theme_keys = ["gold"]
-            elif any(_keyword_in_text(keyword, text) for keyword in THEME_RULES["china_macro"]["keywords"]):
+            elif hits.any("china_macro"):
                 matched_theme_keys = ["china_macro"]
             else:
                 matched_theme_keys = []
@@ -3003,7 +2995,7 @@ def _event_impacts(clusters: list[EventCluster], portfolio: dict[str, Any]) -> l
 
         impacts.append(
             {
-                "title": cluster.representative.title,
+                "title": cluster_features(cluster).representative.title,
                 "cluster_id": cluster.cluster_id,
                 "score": cluster.score,
                 "direction": cluster.direction,
@@ -3106,9 +3098,9 @@ def _watchlist_lines(portfolio: dict[str, Any], event_impacts: list[dict[str, An
 def _china_view(clusters: list[EventCluster]) -> list[str]:
     china_related = []
     for cluster in clusters:
-        text = _text_for_cluster(cluster)
-        if any(keyword in text for keyword in THEME_RULES["china_macro"]["keywords"]):
-            china_related.append(cluster.representative.title)
+        features = cluster_features(cluster)
+        if any(keyword in features.source_text for keyword in THEME_RULES["china_macro"]["keywords"]):
+            china_related.append(features.representative.title)
     if china_related:
         return [
             "- 今日中国视角优先看：" + "；".join(china_related[:3]),
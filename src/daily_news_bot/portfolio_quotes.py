@@ -9,6 +9,9 @@ from typing import Any
 import requests
 
 from .config import ROOT_DIR
+from .http_client import http_get
+from .price_store import append_prices, bars_to_fetch, load_prices
+from .state_store import append_state_records, load_state
 
 
 FUND_ESTIMATE_URL = "https://fundgz.1234567.com.cn/js/{code}.js"
@@ -38,7 +41,7 @@ def _movement(change_pct: float | None) -> str:
 
 
 def _request(url: str, *, params: dict[str, Any] | None = None, timeout: int = DEFAULT_TIMEOUT) -> requests.Response:
-    response = requests.get(
+    response = http_get(
         url,
         params=params,
         timeout=timeout,
@@ -80,23 +83,32 @@ def fetch_fund_estimate(code: str, timeout: int = DEFAULT_TIMEOUT) -> dict[str,
 
 
 def fetch_fund_history(code: str, page_size: int = 10, timeout: int = DEFAULT_TIMEOUT) -> list[dict[str, Any]]:
+    """The latest ``page_size`` NAVs, newest first; only the days missing from the local price store are downloaded."""
+    key = f"fund_nav/{code}"
+    requested = bars_to_fetch(key, page_size)
     response = _request(
         FUND_HISTORY_URL,
-        params={"fundCode": code, "pageIndex": 1, "pageSize": page_size},
+        params={"fundCode": code, "pageIndex": 1, "pageSize": requested},
         timeout=timeout,
     )
     payload = response.json()
     rows = ((payload.get("Data") or {}).get("LSJZList") or [])
-    result: list[dict[str, Any]] = []
-    for row in rows:
-        result.append(
+    append_prices(
+        key,
+        [
             {
                 "date": row.get("FSRQ") or "",
-                "nav": _safe_float(row.get("DWJZ")),
+                "close": _safe_float(row.get("DWJZ")),
                 "day_change_pct": _safe_float(row.get("JZZZL")),
             }
-        )
-    return result
+            for row in rows
+        ],
+        depth=page_size if requested >= page_size else None,
+    )
+    return [
+        {"date": row["date"], "nav": row.get("close"), "day_change_pct": row.get("day_change_pct")}
+        for row in reversed(load_prices(key).tail(page_size).rows())
+    ]
 
 
 def fetch_holding_quote(holding: dict[str, Any], total_value_cny: float, timeout: int = DEFAULT_TIMEOUT) -> dict[str, Any]:
@@ -291,13 +303,7 @@ def fetch_portfolio_quotes(portfolio: dict[str, Any], timeout: int = DEFAULT_TIM
 
 
 def load_portfolio_history(path: str | Path | None = None) -> list[dict[str, Any]]:
-    target = Path(path) if path else HISTORY_PATH
-    if not target.exists():
-        return []
-    try:
-        payload = json.loads(target.read_text(encoding="utf-8"))
-    except Exception:
-        return []
+    payload = load_state(Path(path) if path else HISTORY_PATH)
     if isinstance(payload, list):
         return payload
     return []
@@ -305,11 +311,7 @@ def load_portfolio_history(path: str | Path | None = None) -> list[dict[str, Any
 
 def update_portfolio_history(snapshot: dict[str, Any], path: str | Path | None = None, max_entries: int = 180) -> list[dict[str, Any]]:
     target = Path(path) if path else HISTORY_PATH
-    target.parent.mkdir(parents=True, exist_ok=True)
-    history = load_portfolio_history(target)
-
     captured = str(snapshot.get("captured_at_utc") or "")
-    day_key = captured[:10]
     compact = {
         "captured_at_utc": captured,
         "portfolio_estimated_day_change_pct": snapshot.get("portfolio_estimated_day_change_pct"),
@@ -327,15 +329,6 @@ def update_portfolio_history(snapshot: dict[str, Any], path: str | Path | None =
         ],
     }
 
-    replaced = False
-    for index, item in enumerate(history):
-        if str(item.get("captured_at_utc") or "")[:10] == day_key:
-            history[index] = compact
-            replaced = True
-            break
-    if not replaced:
-        history.append(compact)
-
-    history = sorted(history, key=lambda item: item.get("captured_at_utc") or "")[-max_entries:]
-    target.write_text(json.dumps(history, ensure_ascii=False, indent=2), encoding="utf-8")
-    return history
+    # Rows are keyed by capture day, so a rerun on the same day replaces that day's entry.
+    append_state_records(target, [compact], keep_last=max_entries)
+    return load_portfolio_history(target)
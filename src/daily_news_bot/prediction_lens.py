@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from .cluster_features import cluster_features
+from .keyword_matcher import KeywordHits, KeywordMatcher
 from .models import EventCluster
 
 
@@ -271,6 +273,8 @@ PREDICTION_RULES: dict[str, dict[str, Any]] = {
 }
 
 
+RULE_MATCHER = KeywordMatcher({key: rule.get("keywords", ()) for key, rule in PREDICTION_RULES.items()})
+
 FRAMEWORK_LINES = [
     "左侧线索：先找约束变化，不等所有人都确认后再追。",
     "预测对象：只预测可能发酵的主线和验证条件，不预测必涨必跌。",
@@ -280,15 +284,8 @@ FRAMEWORK_LINES = [
 ]
 
 
-def _cluster_text(cluster: EventCluster) -> str:
-    parts: list[str] = [cluster.theme, " ".join(cluster.tags or [])]
-    for article in cluster.articles[:5]:
-        parts.extend([article.title, article.summary, article.content, article.category, article.region])
-    return " ".join(part for part in parts if part).casefold()
-
-
-def _rule_score(rule: dict[str, Any], text: str, tags: set[str]) -> int:
-    keyword_score = sum(2 for keyword in rule.get("keywords", ()) if str(keyword).casefold() in text)
+def _rule_score(key: str, rule: dict[str, Any], hits: KeywordHits, tags: set[str]) -> int:
+    keyword_score = 2 * hits.count(key)
     tag_score = sum(1 for tag in rule.get("tags", ()) if str(tag).casefold() in tags)
     return keyword_score + tag_score
 
@@ -302,13 +299,13 @@ def _confidence(score: int, cluster: EventCluster) -> str:
 
 
 def _best_rule(cluster: EventCluster) -> tuple[str, dict[str, Any], int] | None:
-    text = _cluster_text(cluster)
+    hits = RULE_MATCHER.scan(cluster_features(cluster).detail_text)
     tags = {str(tag).casefold() for tag in cluster.tags or []}
     best_key = ""
     best_rule: dict[str, Any] = {}
     best_score = 0
     for key, rule in PREDICTION_RULES.items():
-        score = _rule_score(rule, text, tags)
+        score = _rule_score(key, rule, hits, tags)
         if score > best_score:
             best_key = key
             best_rule = rule
@@ -365,7 +362,7 @@ def build_prediction_lens(
         if not best:
             continue
         rule_key, rule, score = best
-        representative = cluster.representative
+        representative = cluster_features(cluster).representative
         confidence = _confidence(score, cluster)
         card = {
             "cluster_id": cluster.cluster_id,
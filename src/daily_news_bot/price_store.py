@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from array import array
+from datetime import date
+import json
+import math
+import os
+from pathlib import Path
+import re
+import sys
+import threading
+from typing import Any, Iterable
+
+from .config import ROOT_DIR
+
+
+PRICE_STORE_DIR = ROOT_DIR / "outputs" / "price_history"
+DAY_FILE = "day.i4"
+COLUMN_SUFFIX = ".f8"
+META_FILE = "meta.json"
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+# One lock for every series: portfolio and fixed-pool stages can refresh the same fund from different threads.
+_LOCK = threading.RLock()
+
+
+class PriceWindow:
+    """A series as parallel columns: ``days`` (date ordinals) and float64 ``columns``, with NaN for missing values."""
+
+    __slots__ = ("days", "columns")
+
+    def __init__(self, days: array, columns: dict[str, array]) -> None:
+        self.days = days
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def last_day(self) -> date | None:
+        return date.fromordinal(self.days[-1]) if self.days else None
+
+    def tail(self, count: int) -> "PriceWindow":
+        start = max(0, len(self.days) - max(0, count))
+        return PriceWindow(self.days[start:], {name: values[start:] for name, values in self.columns.items()})
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Oldest-first ``{"date": ISO day, column: value or None}`` dicts."""
+        names = list(self.columns)
+        result: list[dict[str, Any]] = []
+        for index, ordinal in enumerate(self.days):
+            row: dict[str, Any] = {"date": date.fromordinal(ordinal).isoformat()}
+            for name in names:
+                value = self.columns[name][index]
+                row[name] = None if math.isnan(value) else value
+            result.append(row)
+        return result
+
+
+def _series_dir(key: str, root: str | Path | None) -> Path:
+    parts = [_UNSAFE_RE.sub("_", part) for part in key.split("/") if part.strip(" .")]
+    if not parts:
+        raise ValueError(f"Invalid price series key: {key!r}")
+    return Path(root or PRICE_STORE_DIR).joinpath(*parts)
+
+
+def _read_column(path: Path, typecode: str) -> array:
+    values = array(typecode)
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return values
+    # A torn append leaves a partial item at the end; drop it.
+    values.frombytes(raw[: len(raw) - len(raw) % values.itemsize])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _column_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _parse_row_day(value: Any) -> int | None:
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value or "").strip()[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def _float_or_nan(value: Any) -> float:
+    try:
+        if value in (None, "", "-"):
+            return math.nan
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def load_prices(key: str, root: str | Path | None = None) -> PriceWindow:
+    directory = _series_dir(key, root)
+    with _LOCK:
+        days = _read_column(directory / DAY_FILE, "i")
+        columns = {
+            path.name[: -len(COLUMN_SUFFIX)]: _read_column(path, "d")
+            for path in sorted(directory.glob(f"*{COLUMN_SUFFIX}"))
+        }
+    size = min([len(days), *(len(values) for values in columns.values())])
+    if size < len(days) or any(len(values) != size for values in columns.values()):
+        days = days[:size]
+        columns = {name: values[:size] for name, values in columns.items()}
+    return PriceWindow(days, columns)
+
+
+def price_depth(key: str, root: str | Path | None = None) -> int:
+    """How many bars the deepest fetch recorded in this series asked the provider for."""
+    try:
+        meta = json.loads((_series_dir(key, root) / META_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return 0
+    return int(meta.get("depth") or 0) if isinstance(meta, dict) else 0
+
+
+def bars_to_fetch(key: str, limit: int, root: str | Path | None = None, today: date | None = None) -> int:
+    """How many of the newest bars to request so the stored series covers the last ``limit`` bars.
+
+    Once a fetch at least ``limit`` deep has been stored, only the calendar days since the last stored
+    bar (plus that bar, which may have been an intraday value) are requested.
+    """
+    last_day = load_prices(key, root).last_day
+    if last_day is None or price_depth(key, root) < limit:
+        return limit
+    gap = ((today or date.today()) - last_day).days
+    return max(1, min(limit, gap + 1))
+
+
+def _aligned(directory: Path, window: PriceWindow) -> bool:
+    # Column files left at different lengths by an interrupted write must be rewritten, not appended to.
+    expected = [(directory / DAY_FILE, len(window) * 4)]
+    expected += [(directory / f"{name}{COLUMN_SUFFIX}", len(window) * 8) for name in window.columns]
+    return all((path.stat().st_size if path.exists() else 0) == size for path, size in expected)
+
+
+def _write_column(path: Path, values: array) -> None:
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_bytes(_column_bytes(values))
+    os.replace(temp_path, path)
+
+
+def append_prices(
+    key: str,
+    rows: Iterable[dict[str, Any]],
+    root: str | Path | None = None,
+    depth: int | None = None,
+) -> int:
+    """Store bars given as ``{"date": ..., column: value}`` dicts; returns how many new days were added.
+
+    Bars after the last stored day are appended to the column files and a bar on the last stored day
+    overwrites it in place; anything older (a deeper backfill) merges and rewrites the series.
+    """
+    by_day: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        ordinal = _parse_row_day(row.get("date"))
+        if ordinal is not None:
+            by_day[ordinal] = row
+    directory = _series_dir(key, root)
+    with _LOCK:
+        current = load_prices(key, root)
+        names = list(current.columns)
+        names += sorted({name for row in by_day.values() for name in row if name != "date" and name not in names})
+        new_days = sorted(by_day)
+        last = current.days[-1] if current.days else None
+        added = len(set(new_days).difference(current.days))
+        directory.mkdir(parents=True, exist_ok=True)
+
+        appendable = not current.days or (new_days and new_days[0] >= last and set(names) == set(current.columns))
+        if new_days and appendable and _aligned(directory, current):
+            if new_days[0] == last:
+                offset = len(current.days) - 1
+                for name in names:
+                    with open(directory / f"{name}{COLUMN_SUFFIX}", "r+b") as handle:
+                        handle.seek(offset * 8)
+                        handle.write(_column_bytes(array("d", [_float_or_nan(by_day[last].get(name))])))
+                new_days = new_days[1:]
+            if new_days:
+                with open(directory / DAY_FILE, "ab") as handle:
+                    handle.write(_column_bytes(array("i", new_days)))
+                for name in names:
+                    with open(directory / f"{name}{COLUMN_SUFFIX}", "ab") as handle:
+                        handle.write(_column_bytes(array("d", [_float_or_nan(by_day[ordinal].get(name)) for ordinal in new_days])))
+        elif new_days:
+            merged: dict[int, dict[str, float]] = {
+                ordinal: {name: current.columns[name][index] for name in current.columns}
+                for index, ordinal in enumerate(current.days)
+            }
+            for ordinal, row in by_day.items():
+                merged[ordinal] = {name: _float_or_nan(row.get(name)) for name in names}
+            ordered = sorted(merged)
+            for name in names:
+                _write_column(directory / f"{name}{COLUMN_SUFFIX}", array("d", [merged[ordinal].get(name, math.nan) for ordinal in ordered]))
+            _write_column(directory / DAY_FILE, array("i", ordered))
+
+        if depth and depth > price_depth(key, root):
+            (directory / META_FILE).write_text(json.dumps({"depth": depth}), encoding="utf-8")
+    return added
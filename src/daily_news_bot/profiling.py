@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+
+@dataclass(slots=True)
+class StageTiming:
+    name: str
+    started_offset_ms: float = 0.0
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    requests: int = 0
+    bytes_downloaded: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "started_offset_ms": round(self.started_offset_ms, 1),
+            "wall_ms": round(self.wall_ms, 1),
+            "cpu_ms": round(self.cpu_ms, 1),
+            "requests": self.requests,
+            "bytes_downloaded": self.bytes_downloaded,
+        }
+
+
+_CURRENT_STAGE: ContextVar[StageTiming | None] = ContextVar("daily_news_bot_stage_timing", default=None)
+_COUNTER_LOCK = threading.Lock()
+
+
+def record_request(bytes_downloaded: int = 0) -> None:
+    """Attribute one HTTP request to the stage running in the current context, if any."""
+    timing = _CURRENT_STAGE.get()
+    if timing is None:
+        return
+    with _COUNTER_LOCK:
+        timing.requests += 1
+        timing.bytes_downloaded += max(int(bytes_downloaded or 0), 0)
+
+
+class RunTimings:
+    def __init__(self, profile: bool = False) -> None:
+        self.profile = profile
+        self.stages: list[StageTiming] = []
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageTiming]:
+        timing = StageTiming(name=name, started_offset_ms=(time.perf_counter() - self._started_wall) * 1000)
+        token = _CURRENT_STAGE.set(timing)
+        profiler = self._start_profiler()
+        wall_start = time.perf_counter()
+        # thread_time only covers this stage's own thread, not pools it fans out to.
+        cpu_start = time.thread_time()
+        try:
+            yield timing
+        finally:
+            timing.cpu_ms = (time.thread_time() - cpu_start) * 1000
+            timing.wall_ms = (time.perf_counter() - wall_start) * 1000
+            if profiler is not None:
+                profiler.disable()
+            _CURRENT_STAGE.reset(token)
+            with self._lock:
+                self.stages.append(timing)
+                if profiler is not None:
+                    self._profiles.append(profiler)
+
+    def _start_profiler(self) -> cProfile.Profile | None:
+        if not self.profile:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Newer interpreters allow only one active profiler; skip overlapping stages.
+            return None
+        return profiler
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            stages = sorted(self.stages, key=lambda item: item.started_offset_ms)
+        return {
+            "total_wall_ms": round((time.perf_counter() - self._started_wall) * 1000, 1),
+            "total_cpu_ms": round((time.process_time() - self._started_cpu) * 1000, 1),
+            "requests": sum(item.requests for item in stages),
+            "bytes_downloaded": sum(item.bytes_downloaded for item in stages),
+            "stages": [item.to_dict() for item in stages],
+        }
+
+    def dump_profile(self, path: str | Path) -> bool:
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return False
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(str(target))
+        return True
+
+
+def format_timings_summary(timings: dict[str, Any] | None, slowest: int = 3) -> str:
+    timings = timings or {}
+    stages = sorted(timings.get("stages") or [], key=lambda item: item.get("wall_ms", 0), reverse=True)
+    parts = [f'总 {float(timings.get("total_wall_ms") or 0) / 1000:.1f}s']
+    if stages:
+        parts.append(
+            "最慢 " + "、".join(f'{item.get("name")} {float(item.get("wall_ms") or 0) / 1000:.1f}s' for item in stages[:slowest])
+        )
+    parts.append(f'请求 {int(timings.get("requests") or 0)} 次 / {int(timings.get("bytes_downloaded") or 0) / 1_000_000:.1f} MB')
+    return "｜".join(parts)
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 from datetime import datetime
+import math
+import re
 from typing import Any
 
 from .models import EventCluster
 
 
 WEEKDAY_ZH = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+# Pieces a byte-pair tokenizer mostly keeps whole: one CJK character, a Latin word, up to three digits,
+# or a run of other symbols.
+_TOKEN_PIECE_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]|[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d\u3400-\u9fff\uf900-\ufaff]+")
+# (articles kept, summary characters, keep credibility notes) per cluster, from untouched to barest.
+CLUSTER_TRIM_LEVELS = ((5, 220, True), (5, 120, True), (3, 120, True), (3, 60, True), (2, 0, True), (1, 0, False))
 
 
 SYSTEM_PROMPT = """
@@ -67,29 +74,50 @@ def _format_number(value: float | None) -> str:
     return f"{value:.4f}"
 
 
-def serialize_clusters(clusters: list[EventCluster]) -> str:
+def estimate_tokens(text: str) -> int:
+    """Approximate a byte-pair tokenizer locally: CJK characters count one each, long Latin words split every four letters."""
+    tokens = 0
+    for piece in _TOKEN_PIECE_RE.findall(text):
+        if piece.isascii() and piece.isalpha():
+            tokens += 1 if len(piece) <= 6 else math.ceil(len(piece) / 4)
+        elif piece.isascii() and not piece.isdigit():
+            tokens += math.ceil(len(piece) / 2)
+        else:
+            tokens += 1 if len(piece) == 1 or piece.isdigit() else len(piece)
+    return tokens
+
+
+def _serialize_cluster(index: int, cluster: EventCluster, level: int = 0) -> list[str]:
+    max_articles, summary_chars, with_notes = CLUSTER_TRIM_LEVELS[level]
     lines: list[str] = []
-    for index, cluster in enumerate(clusters, start=1):
-        representative = cluster.representative
-        lines.append(f"## 事件 {index}")
-        lines.append(f"主题：{cluster.theme}")
-        lines.append(
-            f"评分：{cluster.score} | 重要性：{cluster.importance} | 方向：{cluster.direction} | 确定性：{cluster.certainty}"
-        )
+    representative = cluster.representative
+    lines.append(f"## 事件 {index}")
+    lines.append(f"主题：{cluster.theme}")
+    lines.append(
+        f"评分：{cluster.score} | 重要性：{cluster.importance} | 方向：{cluster.direction} | 确定性：{cluster.certainty}"
+    )
+    lines.append(
+        f"真实性/可信度：{cluster.credibility_label} ({cluster.credibility_score:.2f}) | 交叉验证来源：{cluster.confirmed_source_count} | 官方确认：{'是' if cluster.official_confirmation else '否'}"
+    )
+    if cluster.credibility_notes and with_notes:
+        lines.append("真实性说明：" + "；".join(cluster.credibility_notes))
+    lines.append(f"标签：{', '.join(cluster.tags) or '未识别'}")
+    for article in cluster.articles[:max_articles]:
+        source_label = f"{article.source}（官方源）" if article.official_source else article.source
+        summary_text = f" | {article.summary[:summary_chars]}" if summary_chars else ""
         lines.append(
-            f"真实性/可信度：{cluster.credibility_label} ({cluster.credibility_score:.2f}) | 交叉验证来源：{cluster.confirmed_source_count} | 官方确认：{'是' if cluster.official_confirmation else '否'}"
+            f"- [{source_label}] {article.published_at.isoformat()} | 可信度 {article.credibility_label}({article.credibility_score:.2f}) | {article.title}{summary_text}"
         )
-        if cluster.credibility_notes:
-            lines.append("真实性说明：" + "；".join(cluster.credibility_notes))
-        lines.append(f"标签：{', '.join(cluster.tags) or '未识别'}")
-        for article in cluster.articles[:5]:
-            source_label = f"{article.source}（官方源）" if article.official_source else article.source
-            lines.append(
-                f"- [{source_label}] {article.published_at.isoformat()} | 可信度 {article.credibility_label}({article.credibility_score:.2f}) | {article.title} | {article.summary[:220]}"
-            )
-        if representative.official_source:
-            lines.append("- 备注：该事件的代表性素材来自官方源。")
-        lines.append("")
+    if representative.official_source:
+        lines.append("- 备注：该事件的代表性素材来自官方源。")
+    lines.append("")
+    return lines
+
+
+def serialize_clusters(clusters: list[EventCluster], levels: list[int] | None = None) -> str:
+    lines: list[str] = []
+    for index, cluster in enumerate(clusters, start=1):
+        lines.extend(_serialize_cluster(index, cluster, levels[index - 1] if levels else 0))
     return "\n".join(lines).strip()
 
 
@@ -147,19 +175,11 @@ def serialize_tracking_summary(tracking_summary: dict[str, Any] | None) -> str:
     return "\n".join(lines)
 
 
-def build_user_prompt(
-    mode: str,
-    clusters: list[EventCluster],
-    market_snapshot: dict[str, Any] | None = None,
-    tracking_summary: dict[str, Any] | None = None,
-) -> str:
+def _assemble_user_prompt(mode: str, cluster_block: str, market_block: str, tracking_block: str) -> str:
     guidance = MODE_GUIDANCE.get(mode, MODE_GUIDANCE["comprehensive"])
     now_dt = datetime.utcnow()
     now_text = now_dt.strftime("%Y-%m-%d %H:%M UTC")
     weekday = WEEKDAY_ZH[now_dt.weekday()]
-    cluster_block = serialize_clusters(clusters)
-    market_block = serialize_market_snapshot(market_snapshot)
-    tracking_block = serialize_tracking_summary(tracking_summary)
 
     return f"""
 当前时间：{now_text}（{weekday}）
@@ -192,3 +212,69 @@ def build_user_prompt(
 ### 连续事件追踪
 {tracking_block}
 """.strip()
+
+
+def build_user_prompt(
+    mode: str,
+    clusters: list[EventCluster],
+    market_snapshot: dict[str, Any] | None = None,
+    tracking_summary: dict[str, Any] | None = None,
+) -> str:
+    return _assemble_user_prompt(
+        mode,
+        serialize_clusters(clusters),
+        serialize_market_snapshot(market_snapshot),
+        serialize_tracking_summary(tracking_summary),
+    )
+
+
+def build_budgeted_user_prompt(
+    mode: str,
+    clusters: list[EventCluster],
+    market_snapshot: dict[str, Any] | None = None,
+    tracking_summary: dict[str, Any] | None = None,
+    *,
+    token_budget: int = 0,
+) -> tuple[str, dict[str, Any]]:
+    """Build the user prompt, trimming cluster material until its token estimate fits ``token_budget`` (0 = no limit).
+
+    Trimming walks ``CLUSTER_TRIM_LEVELS`` one step at a time, lowest-ranked cluster first, so the top
+    events keep their summaries longest. Returns the prompt and its size stats for the run payload.
+    """
+    market_block = serialize_market_snapshot(market_snapshot)
+    tracking_block = serialize_tracking_summary(tracking_summary)
+    levels = [0] * len(clusters)
+    if token_budget:
+        frame_tokens = estimate_tokens(_assemble_user_prompt(mode, "", market_block, tracking_block))
+        cluster_tokens: dict[tuple[int, int], int] = {}
+
+        def planned_tokens() -> int:
+            total = frame_tokens
+            for position, cluster in enumerate(clusters):
+                key = (position, levels[position])
+                if key not in cluster_tokens:
+                    cluster_tokens[key] = estimate_tokens("\n".join(_serialize_cluster(position + 1, cluster, levels[position])))
+                total += cluster_tokens[key]
+            return total
+
+        for level in range(1, len(CLUSTER_TRIM_LEVELS)):
+            for position in reversed(range(len(clusters))):
+                if planned_tokens() <= token_budget:
+                    break
+                levels[position] = level
+            if planned_tokens() <= token_budget:
+                break
+
+    prompt = _assemble_user_prompt(mode, serialize_clusters(clusters, levels), market_block, tracking_block)
+    estimated = estimate_tokens(prompt)
+    trimmed = sum(1 for level in levels if level)
+    stats: dict[str, Any] = {
+        "token_budget": token_budget,
+        "estimated_tokens": estimated,
+        "untrimmed_estimated_tokens": (
+            estimate_tokens(_assemble_user_prompt(mode, serialize_clusters(clusters), market_block, tracking_block)) if trimmed else estimated
+        ),
+        "trimmed_clusters": trimmed,
+        "over_budget": bool(token_budget) and estimated > token_budget,
+    }
+    return prompt, stats
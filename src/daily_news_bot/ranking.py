@@ -4,7 +4,9 @@ import re
 from collections import Counter
 from datetime import datetime
 
+from .cluster_features import cluster_features
 from .credibility import assess_cluster_credibility
+from .keyword_matcher import TOKEN, KeywordHits, KeywordMatcher
 from .models import EventCluster
 
 
@@ -57,14 +59,15 @@ MACRO_SHOCK_TERMS = (
     "gas reserves",
     "electricity bills",
 )
+TAG_MATCHER = KeywordMatcher(KEYWORDS, mode=TOKEN)
+STORY_MATCHER = KeywordMatcher(
+    {"corporate": CORPORATE_TERMS, "commentary": COMMENTARY_TERMS, "macro_shock": MACRO_SHOCK_TERMS}
+)
 
 
 
 def cluster_text(cluster: EventCluster) -> str:
-    parts: list[str] = [cluster.theme]
-    for article in cluster.articles[:5]:
-        parts.extend([article.title, article.summary])
-    return " ".join(part for part in parts if part).lower()
+    return cluster_features(cluster).brief_text
 
 
 
@@ -74,22 +77,21 @@ def token_set(text: str) -> set[str]:
 
 
 def infer_tags(cluster: EventCluster) -> list[str]:
-    text = cluster_text(cluster)
-    tokens = token_set(text)
-    found: list[str] = []
-
-    for tag, phrases in KEYWORDS.items():
-        for phrase in phrases:
-            if " " in phrase:
-                if phrase in text:
-                    found.append(tag)
-                    break
-            else:
-                if phrase in tokens:
-                    found.append(tag)
-                    break
-
-    category = cluster.representative.category.strip().lower()
+    return list(cluster_features(cluster).memo("ranking.tags", lambda: _infer_tags(cluster)))
+
+
+
+def _story_hits(cluster: EventCluster) -> KeywordHits:
+    return cluster_features(cluster).memo("ranking.story_hits", lambda: STORY_MATCHER.scan(cluster_text(cluster)))
+
+
+
+def _infer_tags(cluster: EventCluster) -> tuple[str, ...]:
+    features = cluster_features(cluster)
+    text = features.brief_text
+    found = TAG_MATCHER.scan(text).keys()
+
+    category = features.representative.category.strip().lower()
     if category in RECOGNIZED_TAGS and category not in found and category != "geopolitics":
         found.append(category)
 
@@ -102,7 +104,7 @@ def infer_tags(cluster: EventCluster) -> list[str]:
     for item in found:
         if item not in deduped:
             deduped.append(item)
-    return deduped
+    return tuple(deduped)
 
 
 
@@ -129,7 +131,7 @@ def infer_certainty(cluster: EventCluster) -> str:
         return "高"
     if cluster.confirmed_source_count >= 2 and cluster.credibility_score >= 0.56:
         return "中"
-    if len({item.source for item in cluster.articles}) >= 2 and cluster.credibility_score >= 0.50:
+    if len(cluster.source_names) >= 2 and cluster.credibility_score >= 0.50:
         return "中"
     return "低"
 
@@ -149,19 +151,19 @@ def infer_importance(score: float) -> str:
 
 
 def is_macro_shock_story(cluster: EventCluster) -> bool:
-    text = cluster_text(cluster)
-    return any(term in text for term in MACRO_SHOCK_TERMS)
+    return _story_hits(cluster).any("macro_shock")
 
 
 
 def is_side_signal_story(cluster: EventCluster, tags: list[str]) -> bool:
     text = cluster_text(cluster)
-    source_count = len({item.source for item in cluster.articles})
-    if is_macro_shock_story(cluster):
+    hits = _story_hits(cluster)
+    source_count = len(cluster.source_names)
+    if hits.any("macro_shock"):
         return False
-    if source_count == 1 and any(term in text for term in CORPORATE_TERMS):
+    if source_count == 1 and hits.any("corporate"):
         return True
-    if source_count == 1 and any(term in text for term in COMMENTARY_TERMS):
+    if source_count == 1 and hits.any("commentary"):
         return True
     if "technology" in tags and "cyberattack" in text and source_count == 1:
         return True
@@ -174,12 +176,12 @@ def is_side_signal_story(cluster: EventCluster, tags: list[str]) -> bool:
 def score_cluster(cluster: EventCluster, now: datetime | None = None) -> float:
     current = now or datetime.utcnow()
     assess_cluster_credibility(cluster)
-    rep = cluster.representative
+    rep = cluster_features(cluster).representative
     age_hours = max((current - rep.published_at).total_seconds() / 3600, 0.1)
     recency_score = max(0.0, 2.4 - min(age_hours, 24.0) / 8.0)
     source_score = rep.source_weight * 2.2
-    spread_score = min(len({item.source for item in cluster.articles}), 5) * 0.45
-    volume_score = min(len(cluster.articles), 5) * 0.25
+    spread_score = min(len(cluster.source_names), 5) * 0.45
+    volume_score = min(cluster.coverage_count, 5) * 0.25
     credibility_score = cluster.credibility_score * 1.2
 
     tags = infer_tags(cluster)
@@ -198,7 +200,7 @@ def score_cluster(cluster: EventCluster, now: datetime | None = None) -> float:
     penalty = 0.0
     if is_side_signal_story(cluster, tags):
         penalty += 1.55
-        if len({item.source for item in cluster.articles}) == 1:
+        if len(cluster.source_names) == 1:
             penalty += 0.35
     if cluster.credibility_label == "低":
         penalty += 1.25
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+from contextlib import ExitStack
+import gzip
 import json
+import os
 from pathlib import Path
-from typing import Any
+import re
+from typing import Any, Iterable, Iterator
 
 from .config import Settings
 from .llm import generate_report
 from .models import EventCluster
-from .prompts import SYSTEM_PROMPT, build_user_prompt
+from .prompts import SYSTEM_PROMPT, build_budgeted_user_prompt
+
+
+# Arrays under these keys are per-day series (fixed-pool backfills, fund NAV histories) that the report
+# only needs for charts; with side files on they are written next to report.json instead of inline.
+SIDE_FILE_KEYS = frozenset({"history"})
+SIDE_FILE_MIN_ITEMS = 20
+SIDE_FILE_DIR_SUFFIX = "_files"
+JSON_WRITE_BUFFER_CHARS = 1 << 16
+_SIDE_FILE_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 
 def _format_number(value: float | None) -> str:
@@ -125,7 +138,7 @@ def build_fallback_report(
                 f"**一句话结论：** 这是一个与 {', '.join(cluster.tags) or '综合'} 相关的重要事件，市场方向偏向 {cluster.direction}。",
                 f"**真实性状态：** {cluster.credibility_label}；交叉验证来源 {cluster.confirmed_source_count} 家；官方确认：{'是' if cluster.official_confirmation else '否'}。",
                 f"**发生了什么：** {representative.summary or representative.title}",
-                f"**为什么重要：** 该事件被 {len(cluster.articles)} 条报道覆盖，重要性为 {cluster.importance}。",
+                f"**为什么重要：** 该事件被 {cluster.coverage_count} 条报道覆盖，重要性为 {cluster.importance}。",
                 f"**影响链条：** 事件发生 → 预期变化 → {', '.join(cluster.tags) or '相关资产'} 重新定价。",
                 "**受益方：** 素材未提供足够细节时，以直接受主题推动的资产与行业为主。",
                 "**受损方：** 素材未提供足够细节时，以直接受主题冲击的资产与行业为主。",
@@ -194,22 +207,24 @@ def render_report(
     mode: str,
     market_snapshot: dict[str, Any] | None = None,
     tracking_summary: dict[str, Any] | None = None,
-) -> tuple[str, bool]:
-    user_prompt = build_user_prompt(
+) -> tuple[str, bool, dict[str, Any]]:
+    """Return the report markdown, whether the LLM wrote it, and the prompt size stats."""
+    user_prompt, prompt_stats = build_budgeted_user_prompt(
         mode,
         clusters,
         market_snapshot=market_snapshot,
         tracking_summary=tracking_summary,
+        token_budget=settings.prompt_token_budget,
     )
     llm_output = generate_report(settings, SYSTEM_PROMPT, user_prompt)
     if llm_output:
-        return sanitize_report_output(llm_output), True
+        return sanitize_report_output(llm_output), True, prompt_stats
     return sanitize_report_output(build_fallback_report(
         clusters,
         mode,
         market_snapshot=market_snapshot,
         tracking_summary=tracking_summary,
-    )), False
+    )), False, prompt_stats
 
 
 def save_text(path: str | Path, content: str) -> None:
@@ -218,7 +233,126 @@ def save_text(path: str | Path, content: str) -> None:
     target.write_text(content, encoding="utf-8")
 
 
-def save_json(path: str | Path, payload: dict) -> None:
+def _side_file_name(parts: list[str]) -> str:
+    return _SIDE_FILE_UNSAFE_RE.sub("_", ".".join(parts)) + ".json"
+
+
+def _split_side_arrays(value: Any, parts: list[str], side_files: dict[str, list]) -> Any:
+    """Return ``value`` with long history arrays swapped for references, copying only the containers on their path."""
+    if isinstance(value, dict):
+        replaced: dict[str, Any] | None = None
+        for key, item in value.items():
+            if key in SIDE_FILE_KEYS and isinstance(item, list) and len(item) >= SIDE_FILE_MIN_ITEMS:
+                name = _side_file_name([*parts, str(key)])
+                side_files[name] = item
+                new_item: Any = {"$ref": name, "items": len(item)}
+            else:
+                new_item = _split_side_arrays(item, [*parts, str(key)], side_files)
+            if new_item is not item:
+                replaced = replaced if replaced is not None else dict(value)
+                replaced[key] = new_item
+        return value if replaced is None else replaced
+    if isinstance(value, list):
+        replaced_list: list[Any] | None = None
+        for index, item in enumerate(value):
+            new_item = _split_side_arrays(item, [*parts, str(index)], side_files)
+            if new_item is not item:
+                replaced_list = replaced_list if replaced_list is not None else list(value)
+                replaced_list[index] = new_item
+        return value if replaced_list is None else replaced_list
+    return value
+
+
+def _json_chunks(payload: Any, compact: bool) -> Iterator[str]:
+    if not compact:
+        # The indenting encoder is the pure-Python one either way; iterencode just streams it.
+        yield from json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(payload)
+        return
+    if not isinstance(payload, dict):
+        yield json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        return
+    # One C-encoded string per top-level key keeps the fast path without holding the whole document.
+    yield "{"
+    for index, (key, value) in enumerate(payload.items()):
+        yield ("," if index else "") + json.dumps(str(key), ensure_ascii=False) + ":"
+        yield json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    yield "}"
+
+
+def _write_json_stream(target: Path, chunks: Iterable[str], gzip_copy: bool) -> dict[str, int]:
+    temp_path = target.with_name(f"{target.name}.tmp")
+    gzip_path = target.with_name(f"{target.name}.gz")
+    gzip_temp_path = gzip_path.with_name(f"{gzip_path.name}.tmp")
+    written = 0
+    with ExitStack() as stack:
+        handle = stack.enter_context(open(temp_path, "wb"))
+        # mtime=0 keeps the archive byte-identical for identical reports.
+        compressed = stack.enter_context(gzip.GzipFile(gzip_temp_path, "wb", mtime=0)) if gzip_copy else None
+        buffer: list[str] = []
+        buffered = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered < JSON_WRITE_BUFFER_CHARS:
+                continue
+            data = "".join(buffer).encode("utf-8")
+            handle.write(data)
+            if compressed is not None:
+                compressed.write(data)
+            written += len(data)
+            buffer, buffered = [], 0
+        data = "".join(buffer).encode("utf-8")
+        handle.write(data)
+        if compressed is not None:
+            compressed.write(data)
+        written += len(data)
+    os.replace(temp_path, target)
+    stats = {"bytes": written}
+    if gzip_copy:
+        os.replace(gzip_temp_path, gzip_path)
+        stats["gzip_bytes"] = gzip_path.stat().st_size
+    else:
+        gzip_path.unlink(missing_ok=True)
+    return stats
+
+
+def side_file_dir(path: str | Path) -> Path:
+    target = Path(path)
+    return target.with_name(f"{target.stem}{SIDE_FILE_DIR_SUFFIX}")
+
+
+def save_json(
+    path: str | Path,
+    payload: dict,
+    *,
+    compact: bool = False,
+    side_files: bool = False,
+    gzip_copy: bool = False,
+) -> dict[str, int]:
+    """Stream ``payload`` to ``path`` and return byte counts.
+
+    ``compact`` drops indentation and uses the C encoder per top-level key. ``side_files`` moves long
+    ``history`` arrays into ``<stem>_files/<dotted.path>.json`` and leaves ``{"$ref": name, "items": n}``
+    in their place. ``gzip_copy`` also writes ``<path>.gz`` (and ``.gz`` side files) in the same pass.
+    """
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    directory = side_file_dir(target)
+    arrays: dict[str, list] = {}
+    if side_files:
+        payload = _split_side_arrays(payload, [], arrays)
+    if directory.is_dir():
+        # Side files belong to one report; drop the previous run's so no stale history is published.
+        for stale in directory.glob("*.json*"):
+            stale.unlink()
+    stats = _write_json_stream(target, _json_chunks(payload, compact), gzip_copy)
+    side_bytes = 0
+    if arrays:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, items in arrays.items():
+            side_bytes += _write_json_stream(directory / name, _json_chunks(items, compact), gzip_copy)["bytes"]
+    elif directory.is_dir() and not any(directory.iterdir()):
+        directory.rmdir()
+    stats["side_files"] = len(arrays)
+    stats["side_file_bytes"] = side_bytes
+    return stats
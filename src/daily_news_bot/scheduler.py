@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .profiling import RunTimings
+
+DEFAULT_MAX_WORKERS = 6
+
+
+@dataclass(slots=True)
+class Stage:
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    fallback: Callable[[Exception], Any] | None = None
+
+    @property
+    def output_keys(self) -> tuple[str, ...]:
+        return self.outputs or (self.name,)
+
+
+def _validate_stages(stages: list[Stage], available: set[str]) -> None:
+    names: set[str] = set()
+    produced = set(available)
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        names.add(stage.name)
+        for key in stage.output_keys:
+            if key in produced:
+                raise ValueError(f"Stage {stage.name} redefines value: {key}")
+            produced.add(key)
+
+    for stage in stages:
+        missing_inputs = [key for key in stage.inputs if key not in produced]
+        if missing_inputs:
+            raise ValueError(f"Stage {stage.name} has unknown inputs: {', '.join(missing_inputs)}")
+        missing_stages = [name for name in stage.after if name not in names]
+        if missing_stages:
+            raise ValueError(f"Stage {stage.name} runs after unknown stages: {', '.join(missing_stages)}")
+
+
+def _call_stage(stage: Stage, kwargs: dict[str, Any], timings: RunTimings | None) -> Any:
+    if timings is None:
+        return _call_stage_function(stage, kwargs)
+    with timings.stage(stage.name):
+        return _call_stage_function(stage, kwargs)
+
+
+def _call_stage_function(stage: Stage, kwargs: dict[str, Any]) -> Any:
+    try:
+        return stage.func(**kwargs)
+    except Exception as exc:
+        if stage.fallback is None:
+            raise
+        return stage.fallback(exc)
+
+
+def _store_outputs(stage: Stage, result: Any, values: dict[str, Any]) -> None:
+    keys = stage.output_keys
+    if len(keys) == 1:
+        values[keys[0]] = result
+        return
+    if not isinstance(result, tuple) or len(result) != len(keys):
+        raise ValueError(f"Stage {stage.name} must return {len(keys)} values: {', '.join(keys)}")
+    values.update(zip(keys, result))
+
+
+def run_stages(
+    stages: list[Stage],
+    context: dict[str, Any] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timings: RunTimings | None = None,
+) -> dict[str, Any]:
+    """Run each stage as soon as its inputs exist; a stage fallback turns its exception into its output."""
+    values = dict(context or {})
+    _validate_stages(stages, set(values))
+
+    pending = list(stages)
+    finished: set[str] = set()
+    running: dict[Future[Any], Stage] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="stage") as executor:
+        while pending or running:
+            ready = [
+                stage
+                for stage in pending
+                if all(key in values for key in stage.inputs) and all(name in finished for name in stage.after)
+            ]
+            for stage in ready:
+                pending.remove(stage)
+                kwargs = {key: values[key] for key in stage.inputs}
+                running[executor.submit(_call_stage, stage, kwargs, timings)] = stage
+            if not running:
+                names = ", ".join(stage.name for stage in pending)
+                raise ValueError(f"Stages cannot be scheduled because of a dependency cycle: {names}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                _store_outputs(stage, future.result(), values)
+                finished.add(stage.name)
+    return values
@@ -7,6 +7,7 @@ from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import requests
 
 from .feishu_receipts import API_BASE, resolve_chat_id, tenant_access_token
+from .http_client import http_post
 
 
 CARD_TOTAL_LIMIT = 18000
@@ -241,12 +242,12 @@ def send_feishu_webhook(webhook_url: str, title: str, content: str) -> None:
 
     card_payload = _build_card_payload(title, content)
     try:
-        response = requests.post(webhook_url, json=card_payload, timeout=20)
+        response = http_post(webhook_url, json=card_payload, timeout=20)
         _raise_for_feishu_error(response)
         return
     except Exception:
         fallback_payload = _build_post_payload(title, content)
-        response = requests.post(webhook_url, json=fallback_payload, timeout=20)
+        response = http_post(webhook_url, json=fallback_payload, timeout=20)
         _raise_for_feishu_error(response)
 
 
@@ -271,7 +272,7 @@ def send_feishu_app_message(
         raise RuntimeError(f"Could not find Feishu chat: {chat_name or chat_id}")
 
     card = _build_app_card_payload(title, content)
-    response = requests.post(
+    response = http_post(
         f"{API_BASE}/im/v1/messages",
         params={"receive_id_type": "chat_id"},
         headers={
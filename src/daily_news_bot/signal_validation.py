@@ -1,20 +1,31 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime, timedelta
+import argparse
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime, timedelta
+import math
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from .config import ROOT_DIR
+from .fixed_pool_history import DEFAULT_HISTORY_LIMIT, update_etf_price_history
+from .price_store import PriceWindow, load_prices
+from .state_store import load_state, save_state
 
 
 VALIDATION_PATH = ROOT_DIR / "outputs" / "signal_validation.json"
 HORIZONS = (30, 60, 90)
-MAX_SIGNALS = 500
-KEEP_DAYS = 180
+MAX_SIGNALS = 1500
+KEEP_DAYS = 365
+# Series a signal code may have in the price store, in lookup order: exchange-traded klines, then fund NAVs.
+PRICE_SERIES_PREFIXES = ("etf_kline", "fund_nav")
+MAX_CLOSE_STALENESS_DAYS = 7
 DEDUP_DAYS = 3
 MIN_ADJUSTMENT_SAMPLES = 3
 DEFAULT_BENCHMARK = {"code": "510300", "name": "沪深300ETF"}
+DEFAULT_MAX_WORKERS = 6
 THEME_BENCHMARKS: dict[str, dict[str, str]] = {
     "broad_core": {"code": "510300", "name": "沪深300ETF"},
     "china_macro": {"code": "510300", "name": "沪深300ETF"},
@@ -55,12 +66,7 @@ def _parse_time(value: Any) -> datetime | None:
 
 
 def _load_state(path: Path = VALIDATION_PATH) -> dict[str, Any]:
-    if not path.exists():
-        return {"version": 1, "signals": []}
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {"version": 1, "signals": []}
+    payload = load_state(path)
     if not isinstance(payload, dict):
         return {"version": 1, "signals": []}
     payload.setdefault("version", 1)
@@ -69,8 +75,7 @@ def _load_state(path: Path = VALIDATION_PATH) -> dict[str, Any]:
 
 
 def _save_state(payload: dict[str, Any], path: Path = VALIDATION_PATH) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_state(path, payload, export=True)
 
 
 def _quote_map(execution_checks: dict[str, Any] | None) -> dict[str, dict[str, Any]]:
@@ -90,6 +95,42 @@ def _quote_price(quote: dict[str, Any] | None) -> float | None:
     return None
 
 
+class DailyCloses:
+    """As-of daily closes per code from the local price store, loaded once per code."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root
+        self._windows: dict[str, PriceWindow | None] = {}
+
+    def _window(self, code: str) -> PriceWindow | None:
+        if code not in self._windows:
+            self._windows[code] = None
+            for prefix in PRICE_SERIES_PREFIXES:
+                window = load_prices(f"{prefix}/{code}", self.root)
+                if len(window) and "close" in window.columns:
+                    self._windows[code] = window
+                    break
+        return self._windows[code]
+
+    def close_on(self, code: str, day: date) -> tuple[date, float] | None:
+        """The last close on or before ``day``, once the series has a bar on or after it."""
+        window = self._window(code)
+        if not code or window is None or window.days[-1] < day.toordinal():
+            return None
+        closes = window.columns["close"]
+        index = bisect_right(window.days, day.toordinal()) - 1
+        while index >= 0 and (math.isnan(closes[index]) or closes[index] == 0):
+            index -= 1
+        if index < 0 or day.toordinal() - window.days[index] > MAX_CLOSE_STALENESS_DAYS:
+            return None
+        return date.fromordinal(window.days[index]), closes[index]
+
+
+def _price_root(path: Path) -> Path:
+    # The price store sits next to the validation state, like the SQLite state store does.
+    return Path(path).parent / "price_history"
+
+
 def _benchmark_for_theme(theme_key: str) -> dict[str, str]:
     return dict(THEME_BENCHMARKS.get(theme_key) or DEFAULT_BENCHMARK)
 
@@ -108,31 +149,6 @@ def _horizon_label(horizon: int) -> str:
     return f"T+{horizon}"
 
 
-def _trim_signals(signals: list[dict[str, Any]], now: datetime) -> list[dict[str, Any]]:
-    cutoff = now - timedelta(days=KEEP_DAYS)
-    kept: list[dict[str, Any]] = []
-    for signal in signals:
-        created_at = _parse_time(signal.get("created_at_utc"))
-        if created_at is None or created_at < cutoff:
-            continue
-        kept.append(signal)
-    kept.sort(key=lambda item: str(item.get("created_at_utc") or ""), reverse=True)
-    return kept[:MAX_SIGNALS]
-
-
-def _is_duplicate(signals: list[dict[str, Any]], code: str, theme_key: str, now: datetime) -> bool:
-    cutoff = now - timedelta(days=DEDUP_DAYS)
-    for signal in signals:
-        if str(signal.get("code") or "") != code:
-            continue
-        if str(signal.get("theme_key") or "") != theme_key:
-            continue
-        created_at = _parse_time(signal.get("created_at_utc"))
-        if created_at is not None and created_at >= cutoff:
-            return True
-    return False
-
-
 def _candidate_entries(portfolio_payload: dict[str, Any], quote_by_code: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
     entries: list[dict[str, Any]] = []
     for row in (portfolio_payload.get("candidate_scores") or [])[:6]:
@@ -199,12 +215,7 @@ def _relative_observation_fields(
     signal: dict[str, Any],
     quote_by_code: dict[str, dict[str, Any]],
 ) -> dict[str, Any]:
-    benchmark_code = str(signal.get("benchmark_code") or "").strip()
-    if not benchmark_code:
-        benchmark = _benchmark_for_theme(str(signal.get("theme_key") or ""))
-        benchmark_code = benchmark["code"]
-        signal.setdefault("benchmark_code", benchmark_code)
-        signal.setdefault("benchmark_name", benchmark["name"])
+    benchmark_code = _signal_benchmark_code(signal)
     benchmark_quote = quote_by_code.get(benchmark_code)
     benchmark_current = _quote_price(benchmark_quote)
     benchmark_start = _safe_float(signal.get("benchmark_start_price"))
@@ -234,13 +245,84 @@ def _apply_relative_return(observation: dict[str, Any], signal: dict[str, Any],
     observation["relative_hit"] = relative_return > 0
 
 
-def _observe_existing(signals: list[dict[str, Any]], quote_by_code: dict[str, dict[str, Any]], now: datetime) -> None:
+def _signal_benchmark_code(signal: dict[str, Any]) -> str:
+    benchmark_code = str(signal.get("benchmark_code") or "").strip()
+    if not benchmark_code:
+        benchmark = _benchmark_for_theme(str(signal.get("theme_key") or ""))
+        benchmark_code = benchmark["code"]
+        signal.setdefault("benchmark_code", benchmark_code)
+        signal.setdefault("benchmark_name", benchmark["name"])
+    return benchmark_code
+
+
+def _close_observation(signal: dict[str, Any], created_at: datetime, horizon: int, closes: DailyCloses, now: datetime) -> dict[str, Any] | None:
+    """Resolve one horizon against the stored daily closes at exactly created day + horizon."""
+    created_day = created_at.date()
+    target_day = created_day + timedelta(days=horizon)
+    code = str(signal.get("code") or "")
+    end = closes.close_on(code, target_day)
+    if end is None:
+        return None
+    start_price = _safe_float(signal.get("start_price"))
+    if start_price in (None, 0):
+        start = closes.close_on(code, created_day)
+        start_price = start[1] if start else None
+    return_pct = _pct_change(start_price, end[1])
+    if return_pct is None:
+        return None
+    observation: dict[str, Any] = {
+        "observed_at_utc": now.isoformat(),
+        "elapsed_days": horizon,
+        "price_date": end[0].isoformat(),
+        "price": end[1],
+        "return_pct": return_pct,
+        "hit": return_pct > 0,
+        "basis": "close",
+    }
+
+    benchmark_code = _signal_benchmark_code(signal)
+    benchmark_end = closes.close_on(benchmark_code, target_day)
+    benchmark_start_price = _safe_float(signal.get("benchmark_start_price"))
+    if benchmark_start_price in (None, 0):
+        benchmark_start = closes.close_on(benchmark_code, created_day)
+        benchmark_start_price = benchmark_start[1] if benchmark_start else None
+    benchmark_return = _pct_change(benchmark_start_price, benchmark_end[1] if benchmark_end else None)
+    if benchmark_end is not None and benchmark_return is not None:
+        relative_return = round(return_pct - benchmark_return, 3)
+        observation.update(
+            {
+                "benchmark_code": benchmark_code,
+                "benchmark_name": signal.get("benchmark_name") or benchmark_code,
+                "benchmark_price": benchmark_end[1],
+                "benchmark_return_pct": benchmark_return,
+                "relative_return_pct": relative_return,
+                "relative_hit": relative_return > 0,
+            }
+        )
+    return observation
+
+
+def _observe_existing(
+    signals: list[dict[str, Any]],
+    quote_by_code: dict[str, dict[str, Any]],
+    now: datetime,
+    closes: DailyCloses | None = None,
+) -> None:
+    """Fill due horizons from stored closes; without a close series, fall back to the current quote."""
     for signal in signals:
         created_at = _parse_time(signal.get("created_at_utc"))
         if created_at is None:
             continue
         elapsed_days = (now - created_at).total_seconds() / 86400
         observations = signal.setdefault("observations", {})
+        if closes is not None:
+            for horizon in HORIZONS:
+                key = _horizon_key(horizon)
+                if elapsed_days < horizon or (observations.get(key) or {}).get("basis") == "close":
+                    continue
+                observation = _close_observation(signal, created_at, horizon, closes, now)
+                if observation is not None:
+                    observations[key] = observation
         quote = quote_by_code.get(str(signal.get("code") or ""))
         current_price = _quote_price(quote)
         if current_price in (None, 0):
@@ -248,7 +330,8 @@ def _observe_existing(signals: list[dict[str, Any]], quote_by_code: dict[str, di
         for horizon in HORIZONS:
             key = _horizon_key(horizon)
             if key in observations:
-                if "relative_return_pct" not in (observations.get(key) or {}):
+                existing = observations.get(key) or {}
+                if "relative_return_pct" not in existing and existing.get("basis") != "close":
                     _apply_relative_return(observations[key], signal, quote_by_code)
                 continue
             if elapsed_days < horizon:
@@ -262,12 +345,13 @@ def _observe_existing(signals: list[dict[str, Any]], quote_by_code: dict[str, di
                 "price": current_price,
                 "return_pct": return_pct,
                 "hit": return_pct > 0,
+                "basis": "quote",
             }
             _apply_relative_return(observations[key], signal, quote_by_code)
 
 
 def _add_current_signals(
-    signals: list[dict[str, Any]],
+    index: "SignalIndex",
     entries: list[dict[str, Any]],
     now: datetime,
 ) -> int:
@@ -275,10 +359,10 @@ def _add_current_signals(
     for entry in entries:
         code = str(entry.get("code") or "")
         theme_key = str(entry.get("theme_key") or "")
-        if not code or _is_duplicate(signals, code, theme_key, now):
+        if not code or index.is_duplicate(code, theme_key, now):
             continue
         signal_id = f"{now.strftime('%Y%m%d%H%M%S')}-{entry.get('source')}-{theme_key}-{code}"
-        signals.append(
+        index.add(
             {
                 "id": signal_id,
                 "created_at_utc": now.isoformat(),
@@ -294,31 +378,81 @@ def _add_current_signals(
                 "benchmark_name": entry.get("benchmark_name"),
                 "benchmark_start_price": entry.get("benchmark_start_price"),
                 "observations": {},
-            }
+            },
+            now,
         )
         added += 1
     return added
 
 
-def _empty_bucket() -> dict[str, Any]:
-    return {"samples": 0, "hits": 0, "sum_return_pct": 0.0, "relative_samples": 0, "relative_hits": 0, "sum_relative_return_pct": 0.0}
-
-
-def _summarize(signals: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    grouped: dict[str, dict[str, Any]] = {}
-    for signal in signals:
-        theme_key = str(signal.get("theme_key") or "unknown")
-        theme = str(signal.get("theme") or theme_key)
-        row = grouped.setdefault(
-            theme_key,
-            {
-                "theme_key": theme_key,
-                "theme": theme,
-                "signals": 0,
-                **{_horizon_key(horizon): _empty_bucket() for horizon in HORIZONS},
-            },
-        )
-        row["signals"] += 1
+def _empty_bucket() -> dict[str, int]:
+    return {"samples": 0, "hits": 0, "sum_return_milli": 0, "relative_samples": 0, "relative_hits": 0, "sum_relative_return_milli": 0}
+
+
+def _milli(value: float) -> int:
+    # Returns are stored rounded to 3 decimals, so integer thousandths add and subtract without drift.
+    return round(value * 1000)
+
+
+class SignalIndex:
+    """The run's signals, newest first, indexed for dedupe and with running per-theme/horizon buckets.
+
+    Each stored signal's timestamp is parsed once. Adding, trimming or re-observing a signal updates the
+    (code, theme_key) dedupe index, the theme buckets and the open/mistake sets in O(horizons), so
+    ``rows()`` costs O(themes) however many signals are kept.
+    """
+
+    def __init__(self, signals: Iterable[dict[str, Any]], now: datetime) -> None:
+        cutoff = now - timedelta(days=KEEP_DAYS)
+        parsed: list[tuple[datetime, dict[str, Any]]] = []
+        for signal in signals:
+            created_at = _parse_time(signal.get("created_at_utc"))
+            if created_at is not None and created_at >= cutoff:
+                parsed.append((created_at, signal))
+        parsed.sort(key=lambda item: str(item[1].get("created_at_utc") or ""), reverse=True)
+        self._stored: list[dict[str, Any]] = []
+        self._added: list[dict[str, Any]] = []
+        self._latest: dict[tuple[str, str], datetime] = {}
+        self._created: dict[int, datetime] = {}
+        self._themes: dict[str, dict[str, Any]] = {}
+        self._counted: dict[int, list[tuple[str, int | None, int | None]]] = {}
+        self._open: dict[int, dict[str, Any]] = {}
+        self._mistakes: dict[int, dict[str, Any]] = {}
+        for created_at, signal in parsed[:MAX_SIGNALS]:
+            self._stored.append(signal)
+            self._track(signal, created_at)
+
+    @property
+    def signals(self) -> list[dict[str, Any]]:
+        # Signals added this run are the newest, in the order they were added.
+        return self._added + self._stored
+
+    def __len__(self) -> int:
+        return len(self._added) + len(self._stored)
+
+    def is_duplicate(self, code: str, theme_key: str, now: datetime) -> bool:
+        latest = self._latest.get((code, theme_key))
+        return latest is not None and latest >= now - timedelta(days=DEDUP_DAYS)
+
+    def add(self, signal: dict[str, Any], created_at: datetime) -> None:
+        self._added.append(signal)
+        self._track(signal, created_at, newest=True)
+        while len(self) > MAX_SIGNALS:
+            self._untrack(self._stored.pop() if self._stored else self._added.pop())
+
+    def open_signals(self) -> list[dict[str, Any]]:
+        """Signals with a horizon not yet settled at a stored close; everything else is final."""
+        return list(self._open.values())
+
+    def mistake_candidates(self) -> list[dict[str, Any]]:
+        return sorted(self._mistakes.values(), key=lambda item: str(item.get("created_at_utc") or ""), reverse=True)
+
+    def refresh(self, signal: dict[str, Any]) -> None:
+        """Re-count a signal after its observations changed."""
+        row = self._themes[self._theme_key(signal)]
+        for key, return_milli, relative_milli in self._counted.pop(id(signal), []):
+            self._count(row[key], return_milli, relative_milli, -1)
+        counted: list[tuple[str, int | None, int | None]] = []
         observations = signal.get("observations") or {}
         for horizon in HORIZONS:
             key = _horizon_key(horizon)
@@ -326,20 +460,105 @@ def _summarize(signals: list[dict[str, Any]]) -> list[dict[str, Any]]:
             return_pct = _safe_float(obs.get("return_pct"))
             if return_pct is None:
                 continue
-            bucket = row[key]
-            bucket["samples"] += 1
-            bucket["sum_return_pct"] += return_pct
-            if return_pct > 0:
-                bucket["hits"] += 1
             relative_return_pct = _safe_float(obs.get("relative_return_pct"))
-            if relative_return_pct is not None:
-                bucket["relative_samples"] += 1
-                bucket["sum_relative_return_pct"] += relative_return_pct
-                if relative_return_pct > 0:
-                    bucket["relative_hits"] += 1
+            entry = (key, _milli(return_pct), _milli(relative_return_pct) if relative_return_pct is not None else None)
+            self._count(row[key], entry[1], entry[2], 1)
+            counted.append(entry)
+        self._counted[id(signal)] = counted
+
+        if all((observations.get(_horizon_key(horizon)) or {}).get("basis") == "close" for horizon in HORIZONS):
+            self._open.pop(id(signal), None)
+        else:
+            self._open[id(signal)] = signal
+        if _is_mistake(signal):
+            self._mistakes[id(signal)] = signal
+        else:
+            self._mistakes.pop(id(signal), None)
+
+    def rows(self) -> list[dict[str, Any]]:
+        grouped = []
+        for row in self._themes.values():
+            summary = {"theme_key": row["theme_key"], "theme": row["theme"], "signals": row["signals"]}
+            for horizon in HORIZONS:
+                key = _horizon_key(horizon)
+                bucket = row[key]
+                summary[key] = {
+                    "samples": bucket["samples"],
+                    "hits": bucket["hits"],
+                    "sum_return_pct": bucket["sum_return_milli"] / 1000,
+                    "relative_samples": bucket["relative_samples"],
+                    "relative_hits": bucket["relative_hits"],
+                    "sum_relative_return_pct": bucket["sum_relative_return_milli"] / 1000,
+                }
+            grouped.append(summary)
+        return _finalize_rows(grouped)
+
+    @staticmethod
+    def _theme_key(signal: dict[str, Any]) -> str:
+        return str(signal.get("theme_key") or "unknown")
+
+    @staticmethod
+    def _count(bucket: dict[str, int], return_milli: int | None, relative_milli: int | None, sign: int) -> None:
+        if return_milli is None:
+            return
+        bucket["samples"] += sign
+        bucket["sum_return_milli"] += sign * return_milli
+        if return_milli > 0:
+            bucket["hits"] += sign
+        if relative_milli is not None:
+            bucket["relative_samples"] += sign
+            bucket["sum_relative_return_milli"] += sign * relative_milli
+            if relative_milli > 0:
+                bucket["relative_hits"] += sign
+
+    @staticmethod
+    def _dedupe_key(signal: dict[str, Any]) -> tuple[str, str]:
+        return str(signal.get("code") or ""), str(signal.get("theme_key") or "")
+
+    def _track(self, signal: dict[str, Any], created_at: datetime, newest: bool = False) -> None:
+        self._created[id(signal)] = created_at
+        dedupe_key = self._dedupe_key(signal)
+        if dedupe_key not in self._latest or created_at > self._latest[dedupe_key]:
+            self._latest[dedupe_key] = created_at
+        theme_key = self._theme_key(signal)
+        row = self._themes.get(theme_key)
+        if row is None:
+            row = self._themes[theme_key] = {
+                "theme_key": theme_key,
+                "theme": str(signal.get("theme") or theme_key),
+                "signals": 0,
+                **{_horizon_key(horizon): _empty_bucket() for horizon in HORIZONS},
+            }
+        elif newest:
+            # The row is labelled by its newest signal.
+            row["theme"] = str(signal.get("theme") or theme_key)
+        row["signals"] += 1
+        self.refresh(signal)
+
+    def _untrack(self, signal: dict[str, Any]) -> None:
+        theme_key = self._theme_key(signal)
+        row = self._themes[theme_key]
+        for key, return_milli, relative_milli in self._counted.pop(id(signal), []):
+            self._count(row[key], return_milli, relative_milli, -1)
+        row["signals"] -= 1
+        if row["signals"] <= 0:
+            del self._themes[theme_key]
+        self._open.pop(id(signal), None)
+        self._mistakes.pop(id(signal), None)
+        # A trimmed signal no longer blocks a new one; fall back to the newest kept signal for its key.
+        created_at = self._created.pop(id(signal), None)
+        dedupe_key = self._dedupe_key(signal)
+        if self._latest.get(dedupe_key) == created_at:
+            kept = [self._created[id(item)] for item in self.signals if self._dedupe_key(item) == dedupe_key]
+            if kept:
+                self._latest[dedupe_key] = max(kept)
+            else:
+                del self._latest[dedupe_key]
+
 
+def _finalize_rows(grouped: list[dict[str, Any]]) -> list[dict[str, Any]]:
     rows: list[dict[str, Any]] = []
-    for row in grouped.values():
+    for row in grouped:
         for horizon in HORIZONS:
             key = f"t{horizon}"
             bucket = row[key]
@@ -572,6 +791,16 @@ def _latest_completed_observation(signal: dict[str, Any]) -> tuple[str, dict[str
     return None
 
 
+def _is_mistake(signal: dict[str, Any]) -> bool:
+    latest = _latest_completed_observation(signal)
+    if latest is None:
+        return False
+    return_pct = _safe_float(latest[1].get("return_pct"))
+    relative_return_pct = _safe_float(latest[1].get("relative_return_pct"))
+    underperformed_benchmark = relative_return_pct is not None and relative_return_pct <= -2
+    return return_pct is not None and (return_pct < 0 or underperformed_benchmark)
+
+
 def _mistake_reason(signal: dict[str, Any], return_pct: float, relative_return_pct: float | None = None) -> str:
     priority = str(signal.get("priority") or "")
     source = str(signal.get("source") or "")
@@ -605,14 +834,11 @@ def _build_mistake_reviews(signals: list[dict[str, Any]]) -> list[dict[str, Any]
     reviews: list[dict[str, Any]] = []
     for signal in signals:
         latest = _latest_completed_observation(signal)
-        if latest is None:
+        if latest is None or not _is_mistake(signal):
             continue
         horizon, observation = latest
-        return_pct = _safe_float(observation.get("return_pct"))
+        return_pct = float(observation["return_pct"])
         relative_return_pct = _safe_float(observation.get("relative_return_pct"))
-        underperformed_benchmark = relative_return_pct is not None and relative_return_pct <= -2
-        if return_pct is None or (return_pct >= 0 and not underperformed_benchmark):
-            continue
         reason = _mistake_reason(signal, return_pct, relative_return_pct)
         reviews.append(
             {
@@ -660,21 +886,90 @@ def build_signal_validation(
     portfolio_payload: dict[str, Any],
     execution_checks: dict[str, Any] | None,
     path: Path = VALIDATION_PATH,
+    price_root: Path | None = None,
 ) -> dict[str, Any]:
     now = generated_at.replace(tzinfo=None, microsecond=0)
     state = _load_state(path)
-    signals = _trim_signals(list(state.get("signals") or []), now)
+    index = SignalIndex(state.get("signals") or [], now)
     quote_by_code = _quote_map(execution_checks)
-    _observe_existing(signals, quote_by_code, now)
+    pending = index.open_signals()
+    _observe_existing(pending, quote_by_code, now, DailyCloses(price_root or _price_root(path)))
+    for signal in pending:
+        index.refresh(signal)
     entries = _candidate_entries(portfolio_payload, quote_by_code)
-    added_count = _add_current_signals(signals, entries, now)
-    signals = _trim_signals(signals, now)
-    rows = _summarize(signals)
+    added_count = _add_current_signals(index, entries, now)
+    output = _validation_output(index, now, added_count)
+    _save_state(output, path)
+    return output
+
+
+def recompute_signal_validation(
+    *,
+    generated_at: datetime | None = None,
+    path: Path = VALIDATION_PATH,
+    price_root: Path | None = None,
+) -> dict[str, Any]:
+    """Re-resolve every observation from the stored daily closes alone, dropping quote-based ones."""
+    now = (generated_at or datetime.utcnow()).replace(tzinfo=None, microsecond=0)
+    signals = list(_load_state(path).get("signals") or [])
+    for signal in signals:
+        signal["observations"] = {}
+    index = SignalIndex(signals, now)
+    pending = index.open_signals()
+    _observe_existing(pending, {}, now, DailyCloses(price_root or _price_root(path)))
+    for signal in pending:
+        index.refresh(signal)
+    output = _validation_output(index, now, 0)
+    _save_state(output, path)
+    return output
+
+
+def refresh_signal_price_history(
+    path: Path = VALIDATION_PATH,
+    timeout: int = 10,
+    limit: int = DEFAULT_HISTORY_LIMIT,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> dict[str, Any]:
+    """Bring the daily closes of every signal still waiting on a horizon, and its benchmark, up to date."""
+    now = datetime.utcnow()
+    codes: dict[str, None] = {}
+    for signal in _load_state(path).get("signals") or []:
+        created_at = _parse_time(signal.get("created_at_utc"))
+        observations = signal.get("observations") or {}
+        if created_at is None or all((observations.get(_horizon_key(horizon)) or {}).get("basis") == "close" for horizon in HORIZONS):
+            continue
+        if created_at < now - timedelta(days=KEEP_DAYS):
+            continue
+        for code in (signal.get("code"), signal.get("benchmark_code") or _benchmark_for_theme(str(signal.get("theme_key") or ""))["code"]):
+            if str(code or "").strip():
+                codes[str(code).strip()] = None
+    refreshed: list[str] = []
+    failures: dict[str, str] = {}
+    if not codes:
+        return {"codes": [], "refreshed": refreshed, "failures": failures}
+    # Each code is its own price series; the shared client's host slots keep Eastmoney within its limit.
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(codes))), thread_name_prefix="signal-price") as executor:
+        futures = {
+            code: executor.submit(copy_context().run, update_etf_price_history, code, timeout=timeout, limit=limit)
+            for code in codes
+        }
+    for code, future in futures.items():
+        try:
+            future.result()
+            refreshed.append(code)
+        except Exception as exc:
+            failures[code] = f"{type(exc).__name__}: {exc}"[:200]
+    return {"codes": list(codes), "refreshed": refreshed, "failures": failures}
+
+
+def _validation_output(index: SignalIndex, now: datetime, added_count: int) -> dict[str, Any]:
+    signals = index.signals
+    rows = index.rows()
     industry_leaderboard = _build_industry_leaderboard(rows)
-    mistake_reviews = _build_mistake_reviews(signals)
+    mistake_reviews = _build_mistake_reviews(index.mistake_candidates())
     mistake_summary = _build_mistake_summary(mistake_reviews)
 
-    output = {
+    return {
         "version": 1,
         "updated_at_utc": now.isoformat(),
         "signals": signals,
@@ -688,8 +983,6 @@ def build_signal_validation(
         "signal_count": len(signals),
         "note": "这是基于系统每日候选信号和后续价格表现的事后验算，不是收益保证，也不是自动交易指令；样本满足后会对长期低命中的主题自动降权。",
     }
-    _save_state(output, path)
-    return output
 
 
 def render_signal_validation_markdown(validation: dict[str, Any]) -> str:
@@ -740,3 +1033,23 @@ def render_signal_validation_markdown(validation: dict[str, Any]) -> str:
             )
     lines.extend(["", f"> {validation.get('note') or '事后验算只用于校准系统，不代表未来收益。'}"])
     return "\n".join(lines).strip() + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute every signal validation horizon from the stored daily closes.")
+    parser.add_argument("command", choices=("recompute",))
+    parser.add_argument("--path", default=str(VALIDATION_PATH))
+    parser.add_argument("--refresh", action="store_true", help="Download missing daily bars for the signal and benchmark codes first.")
+    args = parser.parse_args(argv)
+
+    path = Path(args.path)
+    if args.refresh:
+        refresh_signal_price_history(path)
+    validation = recompute_signal_validation(path=path)
+    observed = sum(len(signal.get("observations") or {}) for signal in validation["signals"])
+    print(f"recompute: {validation['signal_count']} signals, {observed} horizon observations")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
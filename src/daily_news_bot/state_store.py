@@ -0,0 +1,573 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from .config import ROOT_DIR
+
+STATE_DIR = ROOT_DIR / "outputs"
+STATE_DB_NAME = "state.sqlite3"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    collection TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    sort_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (collection, record_key)
+);
+CREATE INDEX IF NOT EXISTS records_by_sort_key ON records (collection, sort_key);
+CREATE TABLE IF NOT EXISTS record_terms (
+    collection TEXT NOT NULL,
+    term TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    PRIMARY KEY (collection, term, bucket, record_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS record_terms_by_key ON record_terms (collection, record_key);
+CREATE TABLE IF NOT EXISTS record_term_versions (
+    collection TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS record_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    op TEXT NOT NULL,
+    record_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS record_log_files (
+    collection TEXT PRIMARY KEY,
+    lines INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS json_files (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL DEFAULT '',
+    dirty INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _field(name: str) -> Callable[[dict[str, Any]], str]:
+    return lambda record: str(record.get(name) or "")
+
+
+@dataclass(frozen=True, slots=True)
+class RecordSpec:
+    """How a JSON list of records maps onto indexed rows: one row per ``key``, read back in ``sort_key`` order.
+
+    With ``terms``, each row is also listed under every term in its ``bucket`` (a day for
+    histories), so ``query_state_records`` can fetch only rows sharing a term within a window.
+    Bump ``terms_version`` when either function changes so stored rows are re-indexed.
+
+    With ``log``, the exported copy is that append-only JSON Lines file instead of a
+    JSON array: each export appends the rows changed since the last one (and
+    ``{"$delete": key}`` tombstones), and the file is compacted once it holds more than
+    ``LOG_COMPACT_RATIO`` lines per live row.
+    """
+
+    key: Callable[[dict[str, Any]], str]
+    sort_key: Callable[[dict[str, Any]], str]
+    terms: Callable[[dict[str, Any]], Iterable[str]] | None = None
+    bucket: Callable[[dict[str, Any]], str] | None = None
+    terms_version: int = 1
+    log: str | None = None
+
+
+def _event_history_key(record: dict[str, Any]) -> str:
+    # cluster_id is only a title prefix (every CJK title gets "event"), so the representative title and link
+    # tell same-run clusters apart.
+    identity = f'{record.get("title") or ""}\n{record.get("url") or ""}'
+    digest = hashlib.sha1(identity.encode("utf-8")).hexdigest()[:12]
+    return f'{record.get("generated_at_utc") or ""}|{record.get("cluster_id") or ""}|{digest}'
+
+
+# History files stored row by row, so a run only writes the rows it adds or changes.
+# Every other state file is kept as one JSON document.
+RECORD_SPECS = {
+    "event_history.json": RecordSpec(
+        key=_event_history_key,
+        sort_key=_field("generated_at_utc"),
+        terms=lambda record: {str(token) for token in record.get("tokens") or []},
+        bucket=lambda record: str(record.get("generated_at_utc") or "")[:10],
+        log="event_history.jsonl",
+    ),
+    "decision_journal.json": RecordSpec(key=_field("generated_at_utc"), sort_key=_field("generated_at_utc")),
+    "portfolio_history.json": RecordSpec(
+        key=lambda record: str(record.get("captured_at_utc") or "")[:10],
+        sort_key=_field("captured_at_utc"),
+    ),
+}
+LOG_COMPACT_RATIO = 2
+LOG_COMPACT_SLACK = 256
+TOMBSTONE = "$delete"
+STATE_FILES = (
+    "event_history.json",
+    "decision_journal.json",
+    "portfolio_history.json",
+    "signal_validation.json",
+    "fixed_buy_pool_history.json",
+    "industry_radar_state.json",
+    "watchlist.json",
+    "fund_holdings_cache.json",
+)
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _fingerprint(path: Path) -> str:
+    """Size and content hash of ``path``, so a byte-identical copy restored from the archive is not re-imported."""
+    digest = hashlib.sha1()
+    size = 0
+    try:
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+                size += len(chunk)
+    except OSError:
+        return ""
+    return f"{size}:{digest.hexdigest()}"
+
+
+@contextmanager
+def _connect(directory: Path) -> Iterator[sqlite3.Connection]:
+    directory.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(directory / STATE_DB_NAME, timeout=30)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+def _mark_dirty(connection: sqlite3.Connection, name: str) -> None:
+    connection.execute(
+        "INSERT INTO json_files (name, dirty) VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET dirty = 1",
+        (name,),
+    )
+
+
+def _index_terms(connection: sqlite3.Connection, name: str, spec: RecordSpec, keyed: dict[str, dict[str, Any]]) -> None:
+    connection.executemany(
+        "DELETE FROM record_terms WHERE collection = ? AND record_key = ?",
+        [(name, key) for key in keyed],
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO record_terms (collection, term, bucket, record_key) VALUES (?, ?, ?, ?)",
+        [
+            (name, term, spec.bucket(record) if spec.bucket else "", key)
+            for key, record in keyed.items()
+            for term in spec.terms(record)
+        ],
+    )
+
+
+def _log_ops(connection: sqlite3.Connection, name: str, op: str, keys: Iterable[str]) -> None:
+    connection.executemany(
+        "INSERT INTO record_log (collection, op, record_key) VALUES (?, ?, ?)",
+        [(name, op, key) for key in keys],
+    )
+
+
+def _delete_records(connection: sqlite3.Connection, name: str, spec: RecordSpec, keys: list[str], log: bool = True) -> None:
+    """Delete rows by key together with their term postings, logging tombstones for the JSON Lines copy."""
+    pairs = [(name, key) for key in keys]
+    connection.executemany("DELETE FROM record_terms WHERE collection = ? AND record_key = ?", pairs)
+    connection.executemany("DELETE FROM records WHERE collection = ? AND record_key = ?", pairs)
+    if log and spec.log:
+        _log_ops(connection, name, "delete", keys)
+
+
+def _delete_where(
+    connection: sqlite3.Connection,
+    name: str,
+    spec: RecordSpec,
+    condition: str,
+    params: tuple[Any, ...] = (),
+    log: bool = True,
+) -> None:
+    keys = [
+        key
+        for (key,) in connection.execute(f"SELECT record_key FROM records WHERE collection = ? AND {condition}", (name, *params))
+    ]
+    _delete_records(connection, name, spec, keys, log=log)
+
+
+def _ensure_terms(connection: sqlite3.Connection, name: str, spec: RecordSpec) -> None:
+    """Rebuild the term postings of ``name`` if they were built by another ``terms_version`` (or never)."""
+    if spec.terms is None:
+        return
+    row = connection.execute("SELECT version FROM record_term_versions WHERE collection = ?", (name,)).fetchone()
+    if row is not None and row[0] == spec.terms_version:
+        return
+    connection.execute("DELETE FROM record_terms WHERE collection = ?", (name,))
+    keyed = {
+        key: json.loads(payload)
+        for key, payload in connection.execute("SELECT record_key, payload FROM records WHERE collection = ?", (name,))
+    }
+    _index_terms(connection, name, spec, keyed)
+    connection.execute(
+        "INSERT INTO record_term_versions (collection, version) VALUES (?, ?) "
+        "ON CONFLICT (collection) DO UPDATE SET version = excluded.version",
+        (name, spec.terms_version),
+    )
+
+
+def _write_records(
+    connection: sqlite3.Connection,
+    name: str,
+    records: Iterable[Any],
+    spec: RecordSpec,
+    replace: bool,
+    log: bool = True,
+) -> None:
+    _ensure_terms(connection, name, spec)
+    keyed = {spec.key(record): record for record in records if isinstance(record, dict)}
+    changed: dict[str, dict[str, Any]] = {}
+    for key, record in keyed.items():
+        cursor = connection.execute(
+            """
+            INSERT INTO records (collection, record_key, sort_key, payload) VALUES (?, ?, ?, ?)
+            ON CONFLICT (collection, record_key) DO UPDATE SET sort_key = excluded.sort_key, payload = excluded.payload
+            WHERE records.payload != excluded.payload OR records.sort_key != excluded.sort_key
+            """,
+            (name, key, spec.sort_key(record), _dumps(record)),
+        )
+        if cursor.rowcount:
+            changed[key] = record
+    if spec.terms is not None and changed:
+        _index_terms(connection, name, spec, changed)
+    if log and spec.log:
+        _log_ops(connection, name, "put", changed)
+    if replace:
+        existing = {key for (key,) in connection.execute("SELECT record_key FROM records WHERE collection = ?", (name,))}
+        _delete_records(connection, name, spec, sorted(existing - keyed.keys()), log=log)
+
+
+def _write_payload(connection: sqlite3.Connection, name: str, payload: Any) -> None:
+    spec = RECORD_SPECS.get(name)
+    if spec is not None:
+        _write_records(connection, name, payload if isinstance(payload, list) else [], spec, replace=True)
+    else:
+        connection.execute(
+            "INSERT INTO documents (name, payload) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET payload = excluded.payload",
+            (name, _dumps(payload)),
+        )
+
+
+def _read_payload(connection: sqlite3.Connection, name: str) -> Any | None:
+    if name in RECORD_SPECS:
+        rows = connection.execute(
+            "SELECT payload FROM records WHERE collection = ? ORDER BY sort_key, rowid",
+            (name,),
+        ).fetchall()
+        if rows:
+            return [json.loads(payload) for (payload,) in rows]
+        known = connection.execute("SELECT 1 FROM json_files WHERE name = ?", (name,)).fetchone()
+        return [] if known else None
+    row = connection.execute("SELECT payload FROM documents WHERE name = ?", (name,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _exported_path(path: Path) -> Path:
+    """The file a collection is exported to: its JSON Lines log if it has one, else ``path`` itself."""
+    spec = RECORD_SPECS.get(path.name)
+    return path.with_name(spec.log) if spec is not None and spec.log else path
+
+
+def _iter_log(path: Path) -> Iterator[tuple[str, Any]]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and set(entry) == {TOMBSTONE}:
+                yield "delete", str(entry[TOMBSTONE])
+            else:
+                yield "put", entry
+
+
+def _import_log(connection: sqlite3.Connection, name: str, spec: RecordSpec, path: Path) -> None:
+    """Replay a JSON Lines log into an emptied collection, a batch of puts at a time."""
+    _delete_where(connection, name, spec, "1", log=False)
+    connection.execute("DELETE FROM record_log WHERE collection = ?", (name,))
+    lines = 0
+    batch: list[Any] = []
+    for op, value in _iter_log(path):
+        lines += 1
+        if op == "put":
+            batch.append(value)
+            if len(batch) < 500:
+                continue
+        _write_records(connection, name, batch, spec, replace=False, log=False)
+        batch = []
+        if op == "delete":
+            _delete_records(connection, name, spec, [value], log=False)
+    _write_records(connection, name, batch, spec, replace=False, log=False)
+    connection.execute(
+        "INSERT INTO record_log_files (collection, lines) VALUES (?, ?) "
+        "ON CONFLICT (collection) DO UPDATE SET lines = excluded.lines",
+        (name, lines),
+    )
+
+
+def _import_json_if_changed(connection: sqlite3.Connection, path: Path) -> bool:
+    """Load ``path`` into the store when it differs from the copy last imported or exported.
+
+    A collection with a JSON Lines log reads the log when it exists and falls back to
+    the older JSON array file otherwise.
+    """
+    source = _exported_path(path)
+    if not source.exists():
+        source = path
+    fingerprint = _fingerprint(source)
+    if not fingerprint:
+        return False
+    row = connection.execute("SELECT fingerprint FROM json_files WHERE name = ?", (path.name,)).fetchone()
+    if row is not None and row[0] == fingerprint:
+        return False
+    if source != path:
+        _import_log(connection, path.name, RECORD_SPECS[path.name], source)
+    else:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            payload = None
+        if payload is not None:
+            _write_payload(connection, path.name, payload)
+    connection.execute(
+        "INSERT INTO json_files (name, fingerprint, dirty) VALUES (?, ?, 0) "
+        "ON CONFLICT (name) DO UPDATE SET fingerprint = excluded.fingerprint, dirty = 0",
+        (path.name, fingerprint),
+    )
+    return True
+
+
+def _export_log(connection: sqlite3.Connection, name: str, spec: RecordSpec, path: Path, compact: bool) -> None:
+    """Append logged changes to the JSON Lines file, or rewrite it from the live rows when compaction is due."""
+    ops = connection.execute(
+        "SELECT op, record_key FROM record_log WHERE collection = ? ORDER BY seq",
+        (name,),
+    ).fetchall()
+    row = connection.execute("SELECT lines FROM record_log_files WHERE collection = ?", (name,)).fetchone()
+    lines = row[0] if row else 0
+    (live,) = connection.execute("SELECT COUNT(*) FROM records WHERE collection = ?", (name,)).fetchone()
+    recorded = connection.execute("SELECT fingerprint FROM json_files WHERE name = ?", (name,)).fetchone()
+    # Appending is only safe onto the exact file this store last wrote or read.
+    owned = row is not None and recorded is not None and recorded[0] == _fingerprint(path)
+    if compact or not owned or lines + len(ops) > LOG_COMPACT_RATIO * live + LOG_COMPACT_SLACK:
+        partial = path.with_name(path.name + ".tmp")
+        with partial.open("w", encoding="utf-8") as handle:
+            for (payload,) in connection.execute(
+                "SELECT payload FROM records WHERE collection = ? ORDER BY sort_key, rowid",
+                (name,),
+            ):
+                handle.write(payload + "\n")
+        os.replace(partial, path)
+        lines = live
+    else:
+        with path.open("a", encoding="utf-8") as handle:
+            for op, key in ops:
+                if op == "delete":
+                    handle.write(_dumps({TOMBSTONE: key}) + "\n")
+                    lines += 1
+                    continue
+                found = connection.execute(
+                    "SELECT payload FROM records WHERE collection = ? AND record_key = ?",
+                    (name, key),
+                ).fetchone()
+                if found:
+                    handle.write(found[0] + "\n")
+                    lines += 1
+    connection.execute("DELETE FROM record_log WHERE collection = ?", (name,))
+    connection.execute(
+        "INSERT INTO record_log_files (collection, lines) VALUES (?, ?) "
+        "ON CONFLICT (collection) DO UPDATE SET lines = excluded.lines",
+        (name, lines),
+    )
+
+
+def _export(connection: sqlite3.Connection, path: Path, compact: bool = False) -> Path | None:
+    target = _exported_path(path)
+    spec = RECORD_SPECS.get(path.name)
+    if target != path and spec is not None:
+        _export_log(connection, path.name, spec, target, compact)
+    else:
+        payload = _read_payload(connection, path.name)
+        if payload is None:
+            return None
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    connection.execute(
+        "UPDATE json_files SET fingerprint = ?, dirty = 0 WHERE name = ?",
+        (_fingerprint(target), path.name),
+    )
+    return target
+
+
+def _has_state(target: Path) -> bool:
+    """Whether a store or a JSON copy exists for ``target``; reads skip creating the store when neither does."""
+    return (target.parent / STATE_DB_NAME).exists() or target.exists() or _exported_path(target).exists()
+
+
+def load_state(path: str | Path) -> Any | None:
+    """State saved under ``path``'s file name, or ``None`` if there is none.
+
+    A JSON file at ``path`` that is newer than the store (first run, or restored
+    from the Pages archive) is migrated in first.
+    """
+    target = Path(path)
+    if not _has_state(target):
+        return None
+    with _connect(target.parent) as connection:
+        _import_json_if_changed(connection, target)
+        return _read_payload(connection, target.name)
+
+
+def save_state(path: str | Path, payload: Any, export: bool = False) -> None:
+    """Store ``payload``; history files only rewrite rows whose content changed.
+
+    ``export`` also rewrites the JSON file now, for state published as a Pages
+    artifact; other files are written by ``export_state_json`` at the end of a run.
+    """
+    target = Path(path)
+    with _connect(target.parent) as connection:
+        _import_json_if_changed(connection, target)
+        _write_payload(connection, target.name, payload)
+        _mark_dirty(connection, target.name)
+        if export:
+            _export(connection, target)
+
+
+def append_state_records(
+    path: str | Path,
+    records: list[dict[str, Any]],
+    keep_from: str | None = None,
+    keep_last: int | None = None,
+) -> None:
+    """Upsert ``records`` into a history file and prune rows sorting before ``keep_from`` or beyond ``keep_last``."""
+    target = Path(path)
+    spec = RECORD_SPECS.get(target.name)
+    if spec is None:
+        raise ValueError(f"{target.name} is not a record history")
+    with _connect(target.parent) as connection:
+        _import_json_if_changed(connection, target)
+        _write_records(connection, target.name, records, spec, replace=False)
+        if keep_from is not None:
+            _delete_where(connection, target.name, spec, "sort_key < ?", (keep_from,))
+        if keep_last is not None:
+            _delete_where(
+                connection,
+                target.name,
+                spec,
+                "rowid NOT IN (SELECT rowid FROM records WHERE collection = ? ORDER BY sort_key DESC, rowid DESC LIMIT ?)",
+                (target.name, max(keep_last, 0)),
+            )
+        _mark_dirty(connection, target.name)
+
+
+def iter_state_records(path: str | Path, since: str | None = None, newest_first: bool = False) -> Iterator[Any]:
+    """Stream a history file's records in sort order (optionally from ``since`` on) without loading the whole list."""
+    target = Path(path)
+    if target.name not in RECORD_SPECS:
+        payload = load_state(target)
+        yield from payload if isinstance(payload, list) else []
+        return
+    if not _has_state(target):
+        return
+    # Migrate in its own transaction so no write lock is held while the caller consumes rows.
+    with _connect(target.parent) as connection:
+        _import_json_if_changed(connection, target)
+    with _connect(target.parent) as connection:
+        cursor = connection.execute(
+            "SELECT payload FROM records WHERE collection = ? AND sort_key >= ? "
+            f"ORDER BY sort_key {'DESC' if newest_first else 'ASC'}, rowid {'DESC' if newest_first else 'ASC'}",
+            (target.name, since or ""),
+        )
+        for (payload,) in cursor:
+            yield json.loads(payload)
+
+
+def query_state_records(path: str | Path, terms: Iterable[str], bucket_from: str, bucket_to: str) -> list[dict[str, Any]]:
+    """Records of a history file listed under any of ``terms`` in buckets ``bucket_from``..``bucket_to``, in stored order."""
+    target = Path(path)
+    spec = RECORD_SPECS.get(target.name)
+    if spec is None or spec.terms is None or spec.bucket is None:
+        raise ValueError(f"{target.name} is not a term-indexed history")
+    wanted = sorted({str(term) for term in terms})
+    if not wanted or not _has_state(target):
+        return []
+    with _connect(target.parent) as connection:
+        _import_json_if_changed(connection, target)
+        _ensure_terms(connection, target.name, spec)
+        placeholders = ", ".join("?" for _ in wanted)
+        rows = connection.execute(
+            f"""
+            SELECT payload FROM records
+            WHERE collection = ? AND record_key IN (
+                SELECT record_key FROM record_terms
+                WHERE collection = ? AND term IN ({placeholders}) AND bucket BETWEEN ? AND ?
+            )
+            ORDER BY sort_key, rowid
+            """,
+            (target.name, target.name, *wanted, bucket_from, bucket_to),
+        ).fetchall()
+    return [json.loads(payload) for (payload,) in rows]
+
+
+def migrate_json_state(directory: str | Path = STATE_DIR, names: tuple[str, ...] = STATE_FILES) -> list[str]:
+    """One-shot import of the JSON state files in ``directory``; returns the files that were imported."""
+    folder = Path(directory)
+    with _connect(folder) as connection:
+        return [name for name in names if _import_json_if_changed(connection, folder / name)]
+
+
+def export_state_json(directory: str | Path = STATE_DIR, force: bool = False) -> list[Path]:
+    """Write JSON copies of state changed since the last export, for the Pages archive and artifacts.
+
+    ``force`` rewrites every file and compacts the JSON Lines logs.
+    """
+    folder = Path(directory)
+    if not (folder / STATE_DB_NAME).exists():
+        return []
+    with _connect(folder) as connection:
+        query = "SELECT name FROM json_files" if force else "SELECT name FROM json_files WHERE dirty = 1"
+        names = [name for (name,) in connection.execute(query).fetchall()]
+        exported = [_export(connection, folder / name, compact=force) for name in sorted(names)]
+        return [path for path in exported if path is not None]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate JSON state files into the SQLite state store, or export them back.")
+    parser.add_argument("command", choices=("migrate", "export"))
+    parser.add_argument("--state-dir", default=str(STATE_DIR))
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Export every stored file and compact the logs, not only the ones changed since the last export.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        names = migrate_json_state(args.state_dir)
+    else:
+        names = [path.name for path in export_state_json(args.state_dir, force=args.all)]
+    print(f"{args.command}: {', '.join(names) if names else 'nothing to do'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from .cluster_features import cluster_features
+from .keyword_matcher import KeywordHits, KeywordMatcher
 from .models import EventCluster
 
 
@@ -197,6 +199,8 @@ STRATEGIC_RULES: dict[str, dict[str, Any]] = {
 }
 
 
+RULE_MATCHER = KeywordMatcher({key: rule.get("keywords", ()) for key, rule in STRATEGIC_RULES.items()})
+
 FRAMEWORK_LINES = [
     "谁被卡：供给、技术、运输、结算或政策许可，到底哪个环节变成瓶颈。",
     "谁拿筹码：扩产、库存、长协、替代路线或出口限制，是否改变谈判能力。",
@@ -206,31 +210,20 @@ FRAMEWORK_LINES = [
 ]
 
 
-def _cluster_text(cluster: EventCluster) -> str:
-    parts: list[str] = [cluster.theme, " ".join(cluster.tags or [])]
-    for article in cluster.articles[:5]:
-        parts.extend([article.title, article.summary, article.content, article.category, article.region])
-    return " ".join(part for part in parts if part).casefold()
-
-
-def _keyword_hit(keyword: str, text: str) -> bool:
-    return keyword.casefold() in text
-
-
-def _rule_score(rule: dict[str, Any], text: str, tags: set[str]) -> int:
-    keyword_score = sum(2 for keyword in rule.get("keywords", ()) if _keyword_hit(str(keyword), text))
+def _rule_score(key: str, rule: dict[str, Any], hits: KeywordHits, tags: set[str]) -> int:
+    keyword_score = 2 * hits.count(key)
     tag_score = sum(1 for tag in rule.get("tag_boost", ()) if str(tag) in tags)
     return keyword_score + tag_score
 
 
 def _best_rule(cluster: EventCluster) -> tuple[str, dict[str, Any], int] | None:
-    text = _cluster_text(cluster)
+    hits = RULE_MATCHER.scan(cluster_features(cluster).detail_text)
     tags = {str(tag).casefold() for tag in cluster.tags or []}
     best_key = ""
     best_rule: dict[str, Any] = {}
     best_score = 0
     for key, rule in STRATEGIC_RULES.items():
-        score = _rule_score(rule, text, tags)
+        score = _rule_score(key, rule, hits, tags)
         if score > best_score:
             best_key = key
             best_rule = rule
@@ -293,7 +286,7 @@ def build_strategic_lens(
         if not best:
             continue
         theme_key, rule, score = best
-        representative = cluster.representative
+        representative = cluster_features(cluster).representative
         row = {
             "cluster_id": cluster.cluster_id,
             "title": representative.title,
@@ -1,13 +1,14 @@
 ﻿from __future__ import annotations
 
-import json
 import re
 from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+from .cluster_features import cluster_features
 from .models import EventCluster
+from .state_store import append_state_records, iter_state_records, query_state_records, save_state
 
 
 WORD_RE = re.compile(r"[a-zA-Z0-9\u4e00-\u9fff]{2,}")
@@ -24,42 +25,52 @@ def _tokenize(text: str) -> set[str]:
 
 
 
-def _cluster_text(cluster: EventCluster) -> str:
-    rep = cluster.representative
-    return " ".join(part for part in [cluster.theme, rep.title, rep.summary] if part)
+def _cluster_tokens(cluster: EventCluster) -> frozenset[str]:
+    features = cluster_features(cluster)
+    return features.memo("tracking.tokens", lambda: frozenset(_tokenize(features.headline_text)))
 
 
 
 def _history_record(cluster: EventCluster, generated_at: datetime) -> dict[str, Any]:
-    rep = cluster.representative
+    rep = cluster_features(cluster).representative
     return {
         "generated_at_utc": generated_at.isoformat(),
         "cluster_id": cluster.cluster_id,
         "theme": cluster.theme,
         "title": rep.title,
+        "url": rep.url,
         "summary": rep.summary,
         "tags": cluster.tags,
         "direction": cluster.direction,
         "importance": cluster.importance,
         "score": cluster.score,
-        "tokens": sorted(_tokenize(_cluster_text(cluster))),
+        "tokens": sorted(_cluster_tokens(cluster)),
     }
 
 
 
+def iter_event_history(path: Path = HISTORY_PATH, since: str | None = None, newest_first: bool = False) -> Iterator[dict[str, Any]]:
+    """Stream history records in time order, optionally only those generated at or after ``since``."""
+    return iter_state_records(path, since=since, newest_first=newest_first)
+
+
+
 def load_event_history(path: Path = HISTORY_PATH) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return []
+    return list(iter_event_history(path))
 
 
 
 def save_event_history(records: list[dict[str, Any]], path: Path = HISTORY_PATH) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_state(path, records)
+
+
+
+def _candidate_history(path: Path, tokens: set[str], cutoff: datetime, generated_at: datetime) -> Iterable[dict[str, Any]]:
+    """History records in the lookback days that share a token with the current clusters."""
+    try:
+        return query_state_records(path, tokens, cutoff.date().isoformat(), generated_at.date().isoformat())
+    except ValueError:
+        return iter_event_history(path)
 
 
 
@@ -79,22 +90,26 @@ def build_tracking_summary(
     path: Path = HISTORY_PATH,
     lookback_days: int = 7,
 ) -> dict[str, Any]:
-    history = load_event_history(path)
     cutoff = generated_at - timedelta(days=lookback_days)
+    cluster_tokens = [_cluster_tokens(cluster) for cluster in clusters]
     recent_history = []
-    for item in history:
+    postings: dict[str, list[int]] = {}
+    for item in _candidate_history(path, set().union(*cluster_tokens), cutoff, generated_at):
         try:
             item_time = datetime.fromisoformat(item.get("generated_at_utc", ""))
         except ValueError:
             continue
         if item_time >= cutoff and item_time < generated_at:
+            for token in set(item.get("tokens") or []):
+                postings.setdefault(token, []).append(len(recent_history))
             recent_history.append(item)
 
     summaries: list[dict[str, Any]] = []
-    for cluster in clusters:
-        current_tokens = _tokenize(_cluster_text(cluster))
+    for cluster, current_tokens in zip(clusters, cluster_tokens):
         matches: list[dict[str, Any]] = []
-        for item in recent_history:
+        # Only records sharing a token can reach the threshold; visit them in history order.
+        positions = sorted({position for token in current_tokens for position in postings.get(token, ())})
+        for item in (recent_history[position] for position in positions):
             score = _similarity(current_tokens, set(item.get("tokens") or []))
             if score >= 0.45:
                 matches.append({**item, "match_score": round(score, 3)})
@@ -128,18 +143,6 @@ def update_event_history(
     path: Path = HISTORY_PATH,
     keep_days: int = 400,
 ) -> None:
-    history = load_event_history(path)
     cutoff = generated_at - timedelta(days=keep_days)
-    kept: list[dict[str, Any]] = []
-    for item in history:
-        try:
-            item_time = datetime.fromisoformat(item.get("generated_at_utc", ""))
-        except ValueError:
-            continue
-        if item_time >= cutoff:
-            kept.append(item)
-
-    for cluster in clusters:
-        kept.append(_history_record(cluster, generated_at))
-
-    save_event_history(kept, path)
+    records = [_history_record(cluster, generated_at) for cluster in clusters]
+    append_state_records(path, records, keep_from=cutoff.isoformat())
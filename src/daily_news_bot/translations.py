@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+import hashlib
 import json
+import os
+from pathlib import Path
 import re
+import time
 from typing import Any
 
-import requests
-
-from .config import Settings
+from .config import ROOT_DIR, Settings
+from .http_client import http_get
 from .llm import generate_report
 from .models import EventCluster
+from .prompts import estimate_tokens
+
 
+TRANSLATION_MEMO_PATH = ROOT_DIR / "outputs" / "translation_memo.json"
+TRANSLATION_MEMO_MAX_ENTRIES = 2000
+TRANSLATION_MEMO_TTL_SECONDS = 45 * 24 * 3600
+# Rule-based titles are a stopgap; only real translations are remembered.
+MEMO_PROVIDERS = frozenset({"llm", "google_translate"})
+GOOGLE_MAX_WORKERS = 6
+_SPACE_RE = re.compile(r"\s+")
 
 TRANSLATION_SYSTEM_PROMPT = """你是财经新闻标题翻译助手。
 任务：把英文或其它外文财经新闻标题、摘要翻译成简体中文。
@@ -35,7 +49,7 @@ def _needs_translation(text: str) -> bool:
 def _translate_with_google(text: str, *, timeout: int = 12) -> str:
     if not text.strip():
         return ""
-    response = requests.get(
+    response = http_get(
         "https://translate.googleapis.com/translate_a/single",
         params={
             "client": "gtx",
@@ -107,33 +121,73 @@ def _rough_translate_title(title: str, tags: list[Any]) -> str:
     return translated
 
 
-def _fallback_translate_items(request_items: list[dict[str, Any]]) -> tuple[dict[str, dict[str, str]], str]:
+def _fallback_translate_item(item: dict[str, Any]) -> tuple[dict[str, str], str]:
+    title = str(item.get("title") or "").strip()
+    summary = str(item.get("summary") or "").strip()
+    tags = list(item.get("tags") or [])
+    try:
+        title_zh = _translate_with_google(title)
+        summary_zh = _translate_with_google(summary) if summary else ""
+        provider = "google_translate"
+    except Exception:
+        provider = "rule_based"
+        title_zh = _rough_translate_title(title, tags)
+        summary_zh = _rough_translate_title(summary, tags) if summary else ""
+    return {"title_zh": title_zh, "summary_zh": summary_zh, "why_it_matters_zh": _why_it_matters(tags, item.get("direction"))}, provider
+
+
+def _fallback_translate_items(
+    request_items: list[dict[str, Any]],
+) -> tuple[dict[str, dict[str, str]], str, dict[str, str]]:
+    """Translate items through Google concurrently; returns translations and per-item providers by memo key, and the overall provider."""
+    items = [item for item in request_items if item.get("memo_key")]
+    if not items:
+        return {}, "google_translate", {}
+    with ThreadPoolExecutor(max_workers=min(GOOGLE_MAX_WORKERS, len(items)), thread_name_prefix="translate") as executor:
+        # Each worker runs in a copy of the caller's context so request counters reach the calling stage.
+        results = list(executor.map(lambda item: copy_context().run(_fallback_translate_item, item), items))
+
     translations: dict[str, dict[str, str]] = {}
-    provider = "google_translate"
-    for item in request_items:
-        cluster_id = str(item.get("cluster_id") or "").strip()
-        if not cluster_id:
-            continue
-        title = str(item.get("title") or "").strip()
-        summary = str(item.get("summary") or "").strip()
-        tags = list(item.get("tags") or [])
-        direction = item.get("direction")
+    providers: dict[str, str] = {}
+    for item, (translated, item_provider) in zip(items, results):
+        if translated["title_zh"]:
+            translations[item["memo_key"]] = translated
+            providers[item["memo_key"]] = item_provider
+    provider = "rule_based" if "rule_based" in providers.values() else "google_translate"
+    return translations, provider, providers
 
-        try:
-            title_zh = _translate_with_google(title)
-            summary_zh = _translate_with_google(summary) if summary else ""
-        except Exception:
-            provider = "rule_based"
-            title_zh = _rough_translate_title(title, tags)
-            summary_zh = _rough_translate_title(summary, tags) if summary else ""
-
-        if title_zh:
-            translations[cluster_id] = {
-                "title_zh": title_zh,
-                "summary_zh": summary_zh,
-                "why_it_matters_zh": _why_it_matters(tags, direction),
-            }
-    return translations, provider
+
+def _normalize_source(text: Any) -> str:
+    return _SPACE_RE.sub(" ", str(text or "")).strip().casefold()
+
+
+def _memo_key(item: dict[str, Any]) -> str:
+    source = f"{_normalize_source(item.get('title'))}\n{_normalize_source(item.get('summary'))}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def load_translation_memo(path: str | Path | None = None) -> dict[str, Any]:
+    target = Path(path) if path else TRANSLATION_MEMO_PATH
+    try:
+        payload = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_translation_memo(memo: dict[str, Any], path: str | Path | None = None, now: float | None = None) -> None:
+    target = Path(path) if path else TRANSLATION_MEMO_PATH
+    current = time.time() if now is None else now
+    fresh = [
+        (key, entry)
+        for key, entry in memo.items()
+        if isinstance(entry, dict) and current - float(entry.get("used_at") or 0) < TRANSLATION_MEMO_TTL_SECONDS
+    ]
+    fresh.sort(key=lambda item: float(item[1].get("used_at") or 0), reverse=True)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f"{target.name}.tmp")
+    temp_path.write_text(json.dumps(dict(fresh[:TRANSLATION_MEMO_MAX_ENTRIES]), ensure_ascii=False), encoding="utf-8")
+    os.replace(temp_path, target)
 
 
 def _extract_json_object(text: str) -> dict[str, Any]:
@@ -156,13 +210,57 @@ def _extract_json_object(text: str) -> dict[str, Any]:
     return data
 
 
+def _prompt_item(item: dict[str, Any]) -> dict[str, Any]:
+    # cluster_id is only a title prefix and can repeat within a run, so the prompt names items by memo key.
+    return {"id": item["memo_key"][:16], **{field: item[field] for field in ("title", "summary", "tags", "direction")}}
+
+
+def _llm_translate_items(settings: Settings, request_items: list[dict[str, Any]]) -> tuple[dict[str, dict[str, str]], str]:
+    """One LLM request for all ``request_items``; returns translations by memo key and an error string (empty on success)."""
+    memo_keys = {item["memo_key"][:16]: item["memo_key"] for item in request_items}
+    user_prompt = (
+        "请把下面的外文新闻标题和摘要翻译成简体中文。\n"
+        "返回 JSON，格式必须是：\n"
+        '{"items":[{"id":"...","title_zh":"...","summary_zh":"...","why_it_matters_zh":"..."}]}\n'
+        "字段说明：id 原样返回；title_zh 是中文标题；summary_zh 是中文摘要；why_it_matters_zh 用一句话说明它对市场为什么重要。\n\n"
+        f"{json.dumps({'items': [_prompt_item(item) for item in request_items]}, ensure_ascii=False, indent=2)}"
+    )
+    output = generate_report(settings, TRANSLATION_SYSTEM_PROMPT, user_prompt, debug_name="translations")
+    if not output:
+        return {}, "translation_llm_unavailable"
+    try:
+        data = _extract_json_object(output)
+    except Exception as exc:
+        return {}, f"translation_parse_failed: {type(exc).__name__}: {exc}"
+
+    translations: dict[str, dict[str, str]] = {}
+    for item in data.get("items") or []:
+        if not isinstance(item, dict):
+            continue
+        memo_key = memo_keys.get(str(item.get("id") or "").strip())
+        title_zh = str(item.get("title_zh") or "").strip()
+        if not memo_key or not title_zh:
+            continue
+        translations[memo_key] = {
+            "title_zh": title_zh,
+            "summary_zh": str(item.get("summary_zh") or "").strip(),
+            "why_it_matters_zh": str(item.get("why_it_matters_zh") or "").strip(),
+        }
+    return translations, ""
+
+
 def translate_cluster_highlights(
     settings: Settings,
     clusters: list[EventCluster],
     *,
     limit: int = 10,
+    memo_path: str | Path | None = TRANSLATION_MEMO_PATH,
 ) -> dict[str, Any]:
-    """Translate foreign-language cluster titles/summaries for dashboard display."""
+    """Translate foreign-language cluster titles/summaries for dashboard display.
+
+    Headlines already translated in an earlier run come from the translation memo (keyed by a hash of the
+    normalized title and summary); only the misses go to the LLM, in one request, or to Google.
+    """
     request_items: list[dict[str, Any]] = []
     for cluster in clusters[:limit]:
         representative = cluster.representative
@@ -179,6 +277,7 @@ def translate_cluster_highlights(
                 "direction": cluster.direction,
             }
         )
+        request_items[-1]["memo_key"] = _memo_key(request_items[-1])
 
     if not request_items:
         return {
@@ -187,69 +286,77 @@ def translate_cluster_highlights(
             "reason": "no_foreign_cluster_titles",
         }
 
-    user_prompt = (
-        "请把下面的外文新闻标题和摘要翻译成简体中文。\n"
-        "返回 JSON，格式必须是：\n"
-        '{"items":[{"cluster_id":"...","title_zh":"...","summary_zh":"...","why_it_matters_zh":"..."}]}\n'
-        "字段说明：title_zh 是中文标题；summary_zh 是中文摘要；why_it_matters_zh 用一句话说明它对市场为什么重要。\n\n"
-        f"{json.dumps({'items': request_items}, ensure_ascii=False, indent=2)}"
-    )
-
-    output = generate_report(settings, TRANSLATION_SYSTEM_PROMPT, user_prompt)
-    if not output:
-        fallback_items, provider = _fallback_translate_items(request_items)
-        if fallback_items:
-            return {
-                "enabled": True,
-                "items": fallback_items,
-                "requested_count": len(request_items),
-                "translated_count": len(fallback_items),
-                "provider": provider,
-                "llm_error": "translation_llm_unavailable",
-            }
-        return {
-            "enabled": False,
-            "items": {},
-            "error": "translation_llm_unavailable",
-        }
-
-    try:
-        data = _extract_json_object(output)
-    except Exception as exc:
-        fallback_items, provider = _fallback_translate_items(request_items)
-        if fallback_items:
-            return {
-                "enabled": True,
-                "items": fallback_items,
-                "requested_count": len(request_items),
-                "translated_count": len(fallback_items),
-                "provider": provider,
-                "llm_error": f"translation_parse_failed: {type(exc).__name__}: {exc}",
-            }
+    now = time.time()
+    memo = load_translation_memo(memo_path) if memo_path else {}
+    by_key: dict[str, dict[str, str]] = {}
+    saved_tokens = 0
+    misses: dict[str, dict[str, Any]] = {}
+    for item in request_items:
+        memo_key = item["memo_key"]
+        if memo_key in by_key or memo_key in misses:
+            continue
+        entry = memo.get(memo_key)
+        if isinstance(entry, dict) and entry.get("title_zh"):
+            entry["used_at"] = now
+            translated = {field: str(entry.get(field) or "") for field in ("title_zh", "summary_zh", "why_it_matters_zh")}
+            by_key[memo_key] = translated
+            saved_tokens += estimate_tokens(json.dumps(_prompt_item(item), ensure_ascii=False)) + estimate_tokens(json.dumps(translated, ensure_ascii=False))
+        else:
+            misses[memo_key] = item
+
+    providers: dict[str, str] = {}
+    llm_error = ""
+    if misses:
+        llm_items, llm_error = _llm_translate_items(settings, list(misses.values()))
+        providers.update({memo_key: "llm" for memo_key in llm_items})
+        if llm_error:
+            fallback_items, _, fallback_providers = _fallback_translate_items(list(misses.values()))
+            llm_items.update(fallback_items)
+            providers.update(fallback_providers)
+        by_key.update(llm_items)
+
+    if memo_path:
+        for memo_key, provider in providers.items():
+            if provider in MEMO_PROVIDERS:
+                memo[memo_key] = {**by_key[memo_key], "provider": provider, "used_at": now}
+        try:
+            save_translation_memo(memo, memo_path, now)
+        except OSError:
+            pass
+
+    # Dashboard and Feishu still look translations up by cluster_id.
+    translations = {str(item["cluster_id"]): by_key[item["memo_key"]] for item in request_items if item["memo_key"] in by_key}
+    miss_count = sum(1 for item in request_items if item["memo_key"] in misses)
+    hits = len(request_items) - miss_count
+    memo_stats = {
+        "hits": hits,
+        "misses": miss_count,
+        "hit_rate_pct": round(hits / len(request_items) * 100, 1),
+        "saved_tokens_estimate": saved_tokens,
+    }
+    if not translations:
         return {
             "enabled": False,
             "items": {},
-            "error": f"translation_parse_failed: {type(exc).__name__}: {exc}",
-        }
-
-    translations: dict[str, dict[str, str]] = {}
-    for item in data.get("items") or []:
-        if not isinstance(item, dict):
-            continue
-        cluster_id = str(item.get("cluster_id") or "").strip()
-        title_zh = str(item.get("title_zh") or "").strip()
-        if not cluster_id or not title_zh:
-            continue
-        translations[cluster_id] = {
-            "title_zh": title_zh,
-            "summary_zh": str(item.get("summary_zh") or "").strip(),
-            "why_it_matters_zh": str(item.get("why_it_matters_zh") or "").strip(),
+            "error": llm_error or "translation_llm_unavailable",
+            "memo": memo_stats,
         }
 
-    return {
-        "enabled": bool(translations),
+    provider_names = set(providers.values())
+    if not provider_names:
+        provider = "memo"
+    elif provider_names == {"llm"}:
+        provider = "llm"
+    else:
+        provider = "rule_based" if "rule_based" in provider_names else "google_translate"
+    result: dict[str, Any] = {
+        "enabled": True,
         "items": translations,
         "requested_count": len(request_items),
         "translated_count": len(translations),
-        "provider": "llm",
+        "provider": provider,
+        "memo": memo_stats,
     }
+    if llm_error:
+        result["llm_error"] = llm_error
+    return result
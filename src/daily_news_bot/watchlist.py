@@ -13,7 +13,10 @@ except ImportError:  # pragma: no cover
     yaml = None
 
 from .config import ROOT_DIR
+from .cluster_features import cluster_features
+from .keyword_matcher import keyword_matcher
 from .models import EventCluster
+from .state_store import load_state, save_state
 
 
 STATE_PATH = ROOT_DIR / "outputs" / "watchlist.json"
@@ -64,12 +67,7 @@ def _hash_id(prefix: str, text: str) -> str:
 
 
 def _load_json(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        return {"items": []}
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return {"items": []}
+    payload = load_state(path)
     if isinstance(payload, list):
         return {"items": payload}
     if isinstance(payload, dict):
@@ -170,13 +168,9 @@ def _merge_config_items(
         state_items[merged["id"]] = merged
 
 
-def _cluster_text(cluster: EventCluster) -> str:
-    rep = cluster.representative
-    return " ".join(
-        str(part)
-        for part in [cluster.theme, rep.title, rep.summary, rep.source, " ".join(cluster.tags or [])]
-        if part
-    )
+def _cluster_tokens(cluster: EventCluster) -> frozenset[str]:
+    features = cluster_features(cluster)
+    return features.memo(("watchlist.tokens", features.tags), lambda: frozenset(_tokenize(features.watch_text)))
 
 
 def _similarity(left: set[str], right: set[str]) -> float:
@@ -275,14 +269,14 @@ def _evaluate_news(entry: dict[str, Any], clusters: list[EventCluster]) -> tuple
     if similarity_threshold is None:
         similarity_threshold = 0.35 if entry.get("type") == "event_followup" else 0.2
 
+    matcher = keyword_matcher(tuple(keywords), normalize=str.lower)
     matches: list[str] = []
     for cluster in clusters:
-        text = _cluster_text(cluster)
-        lower_text = text.lower()
-        keyword_hits = sum(1 for keyword in keywords if keyword and keyword in lower_text)
-        score = _similarity(entry_tokens, _tokenize(text))
+        features = cluster_features(cluster)
+        keyword_hits = matcher.scan(features.watch_text.lower()).count()
+        score = _similarity(entry_tokens, _cluster_tokens(cluster))
         if keyword_hits >= min_keyword_matches or score >= similarity_threshold:
-            matches.append(cluster.representative.title)
+            matches.append(features.representative.title)
 
     min_occurrences = int(entry.get("min_occurrences") or 1)
     return len(matches) >= min_occurrences, "；".join(matches[:3]) or "未命中"
@@ -308,9 +302,8 @@ def _auto_event_entries(clusters: list[EventCluster], generated_at: datetime, da
     entries: list[dict[str, Any]] = []
     expires_at = (generated_at + timedelta(days=days)).isoformat()
     for cluster in clusters[:5]:
-        rep = cluster.representative
-        text = _cluster_text(cluster)
-        tokens = sorted(_tokenize(text))
+        rep = cluster_features(cluster).representative
+        tokens = sorted(_cluster_tokens(cluster))
         if not tokens:
             continue
         entry_id = _hash_id("event", rep.title)
@@ -425,11 +418,7 @@ def evaluate_watchlist(
         if not _is_old_inactive(item, generated_at, keep_days)
     ]
     items.sort(key=lambda item: (item.get("status") != "active", str(item.get("expires_at_utc") or ""), str(item.get("title") or "")))
-    state_path.parent.mkdir(parents=True, exist_ok=True)
-    state_path.write_text(
-        json.dumps({"updated_at_utc": generated_at.isoformat(), "items": items}, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    save_state(state_path, {"updated_at_utc": generated_at.isoformat(), "items": items}, export=True)
 
     active_items = [item for item in items if item.get("status") == "active" and item.get("enabled", True)]
     summary = {
@@ -0,0 +1,28 @@
+"""Shared report payload for the dashboard render tests and benchmark."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def dashboard_payload() -> dict[str, Any]:
+    """A small report payload touching every dashboard section."""
+    return {
+        "generated_at_utc": "2026-05-03T00:00:00",
+        "mode": "evening",
+        "selected_count": 1,
+        "articles_count": 12,
+        "clusters": [{"title": "Oil jumps as Hormuz traffic slows", "score": 9, "articles": [{"source": "Reuters", "link": "https://example.com/a"}]}],
+        "translations": {"items": {"0": {"title_zh": "霍尔木兹通行放缓，油价上涨"}}},
+        "global_30s_overview": "油价上涨，先看价格确认。",
+        "data_quality": {"generated_at_bjt": "2026-05-03 08:00", "freshness_status": "新鲜", "latest_article_age_hours": 2},
+        "market_snapshot": {"provider": "Yahoo", "items": [{"name": "WTI", "price": 80.1, "change_pct": 2.3}]},
+        "watchlist": {"triggered_count": 1, "new_count": 0, "active_count": 2, "triggered": [{"title": "油价"}]},
+        "feishu_receipts": {"status": "ok", "message_count": 1},
+        "logic_playbook": {"cards": [{"title": "价格确认", "question": "新闻有没有被价格确认？"}]},
+        "signal_validation": {"lines": ["T+30 胜率 60%"], "rows": []},
+        "portfolio": {"enabled": True, "private_mode": True, "fixed_buy_pool_rows": [{"name": "电力ETF", "code": "561560", "state": "观察"}]},
+        "weekly_review": {"enabled": True, "private_mode": True},
+        "output_paths": {"report_md_url": "https://user.github.io/news/report.md", "archive_index_url": "https://user.github.io/news/runs/"},
+        "dashboard": {"enabled": True},
+    }
@@ -0,0 +1,55 @@
+"""Shared setup for tests that call llm.generate_report against a fake provider."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+import json
+from pathlib import Path
+import tempfile
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from src.daily_news_bot import llm
+from src.daily_news_bot.config import load_settings
+
+
+def llm_response(status_code: int, content: str = "") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = 200 <= status_code < 300
+    data = {"choices": [{"message": {"content": content}}]} if content else {"error": f"HTTP {status_code}"}
+    response.json.return_value = data
+    response.text = json.dumps(data)
+    return response
+
+
+class LlmDebugDirMixin:
+    """Points llm's debug files and response cache at a temp dir; ``self.settings`` chains primary -> backup."""
+
+    def setUp(self) -> None:
+        super().setUp()  # type: ignore[misc]
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)  # type: ignore[attr-defined]
+        self.root = Path(tmp.name)
+        for name, value in {
+            "DEBUG_DIR": self.root,
+            "DEBUG_JSON_PATH": self.root / "llm_last_response.json",
+            "DEBUG_TEXT_PATH": self.root / "llm_last_response.txt",
+            "DEBUG_REQUEST_PATH": self.root / "llm_last_request.json",
+            "DEBUG_STATUS_PATH": self.root / "llm_last_status.json",
+            "RESPONSE_CACHE_PATH": self.root / "llm_response_cache.json",
+        }.items():
+            patcher = patch.object(llm, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)  # type: ignore[attr-defined]
+        self.status_path = self.root / "llm_last_status.json"
+        self.settings = replace(
+            load_settings(),
+            api_key="key",
+            base_url="https://llm.example/v1",
+            model="primary",
+            fallback_models=("backup",),
+        )
+
+    def _status(self) -> dict[str, Any]:
+        return json.loads(self.status_path.read_text(encoding="utf-8"))
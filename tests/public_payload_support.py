@@ -0,0 +1,161 @@
+"""Shared weekly-run payload and the legacy deep-copy redaction, for the redaction tests and benchmark."""
+
+from __future__ import annotations
+
+import copy
+import re
+from typing import Any
+
+from src.daily_news_bot.main import _normalize_public_url
+
+
+# The deep-copying pipeline main.main ran before redaction became copy-free, kept as the reference output.
+def _legacy_without_private_portfolio(payload: dict[str, Any]) -> dict[str, Any]:
+    public_payload = copy.deepcopy(payload)
+    portfolio = public_payload.get("portfolio") or {}
+    if portfolio.get("enabled"):
+        sync = portfolio.get("trade_sync_status") or {}
+        fixed_pool_rows = []
+        for row in portfolio.get("fixed_buy_pool_rows") or []:
+            public_row = {
+                key: copy.deepcopy(row.get(key))
+                for key in ("name", "code", "state", "market_confirmation", "odds_label", "day_change_pct", "change_text", "role", "reason")
+                if row.get(key) is not None
+            }
+            public_row["amount_text"] = "按纪律表"
+            fixed_pool_rows.append(public_row)
+        public_payload["portfolio"] = {
+            "enabled": True,
+            "private_mode": True,
+            "annual_objective": portfolio.get("annual_objective") or {},
+            "industry_radar": portfolio.get("industry_radar") or {},
+            "fixed_buy_pool_rows": fixed_pool_rows,
+            "trade_sync_status": {
+                "label": sync.get("label") or "持仓同步",
+                "value": sync.get("value") or "未知",
+                "tone": sync.get("tone") or "neutral",
+                "status": sync.get("status") or "",
+                "note": sync.get("note") or "私密组合已接入；公开网页不显示持仓明细。",
+                "checked_at_utc": sync.get("checked_at_utc") or "",
+            },
+            "public_note": "组合配置已接入，但持仓、成本、现金、交易流水和组合估值不发布到公开网页；具体动作看飞书推送。",
+        }
+        public_payload["portfolio_brief_markdown"] = ""
+    weekly = public_payload.get("weekly_review") or {}
+    if weekly.get("enabled"):
+        public_payload["weekly_review"] = {"enabled": True, "private_mode": True, "public_note": "周复盘已按私密组合生成，但不发布到公开网页。"}
+        public_payload["weekly_review_markdown"] = ""
+    output_paths = public_payload.get("output_paths") or {}
+    output_paths.update(
+        {
+            "portfolio_md_generated": False,
+            "portfolio_md_url": "",
+            "portfolio_md_uri": "",
+            "weekly_md_generated": False,
+            "weekly_md_url": "",
+            "weekly_md_uri": "",
+        }
+    )
+    public_payload["output_paths"] = output_paths
+    return public_payload
+
+
+def _legacy_feishu_receipts(payload: dict[str, Any]) -> dict[str, Any]:
+    public_payload = copy.deepcopy(payload)
+    receipt_status = public_payload.get("feishu_receipts") or {}
+    if receipt_status:
+        public_payload["feishu_receipts"] = {
+            "configured": bool(receipt_status.get("configured")),
+            "ok": bool(receipt_status.get("ok")),
+            "skipped": bool(receipt_status.get("skipped")),
+            "status": receipt_status.get("status"),
+            **{key: int(receipt_status.get(key) or 0) for key in ("message_count", "ignored_count", "duplicate_count", "error_count", "appended_count")},
+        }
+    return public_payload
+
+
+def _legacy_strip(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _legacy_strip(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_legacy_strip(item) for item in value]
+    if not isinstance(value, str):
+        return value
+    normalized = value.replace("\\", "/")
+    public_url = _normalize_public_url(value)
+    if public_url != value:
+        return public_url
+    if normalized.startswith("file://"):
+        return ""
+    if "/home/runner/" in normalized or re.match(r"^[A-Za-z]:/", normalized):
+        return normalized.rstrip("/").rsplit("/", 1)[-1]
+    return value
+
+
+def _legacy_output_references(payload: dict[str, Any]) -> dict[str, Any]:
+    public_payload = copy.deepcopy(payload)
+    output_paths = dict(public_payload.get("output_paths") or {})
+    labels = {
+        "report_md_path": "report.md",
+        "report_json_path": "report.json",
+        "portfolio_md_path": "portfolio_brief.md",
+        "weekly_md_path": "portfolio_weekly.md",
+        "dashboard_html_path": "dashboard.html",
+    }
+    for key, label in labels.items():
+        if key in output_paths:
+            output_paths[key] = label
+    for key in list(output_paths):
+        if key.endswith("_uri"):
+            output_paths[key] = ""
+    public_payload["output_paths"] = output_paths
+    dashboard = dict(public_payload.get("dashboard") or {})
+    if "output_path" in dashboard:
+        dashboard["output_path"] = "dashboard.html"
+    public_payload["dashboard"] = dashboard
+    public_payload = _legacy_strip(public_payload)
+    watchlist = dict(public_payload.get("watchlist") or {})
+    for key in ("state_path", "config_path"):
+        watchlist.pop(key, None)
+    if watchlist:
+        public_payload["watchlist"] = watchlist
+    return public_payload
+
+
+def legacy_public_payload(payload: dict[str, Any], redact_portfolio_outputs: bool, dashboard_public_url: str) -> dict[str, Any]:
+    output_payload = _legacy_without_private_portfolio(payload) if redact_portfolio_outputs else copy.deepcopy(payload)
+    if dashboard_public_url:
+        output_payload = _legacy_output_references(output_payload)
+    return _legacy_feishu_receipts(output_payload)
+
+
+def weekly_payload(instruments: int = 4, history_days: int = 30) -> dict[str, Any]:
+    """A weekly portfolio run: private holdings with histories, output paths on a runner and public links."""
+    history = [{"date": f"2026-04-{day % 28 + 1:02d}", "nav": 1 + day / 100} for day in range(history_days)]
+    return {
+        "generated_at_utc": "2026-05-03T00:00:00",
+        "clusters": [{"title": "油价", "articles": [{"link": "HTTPS://Example.COM/a", "path": "/home/runner/work/x/outputs/a.json"}]}],
+        "source_status": [{"name": f"source-{index}", "ok": True} for index in range(5)],
+        "watchlist": {"state_path": "/home/runner/work/x/outputs/watchlist.json", "config_path": "config/watchlist.yaml", "active_count": 2},
+        "portfolio": {
+            "enabled": True,
+            "holdings": [{"code": "000001", "cost_cny": 99999, "history": copy.deepcopy(history)} for _ in range(instruments)],
+            "fixed_buy_pool_rows": [
+                {"name": "电力ETF", "code": "561560", "state": "观察", "market_confirmation": {"summary": "价格确认"}, "amount_cny": 5000, "role": "AI电力底座"}
+            ],
+            "fixed_pool_backfill_rows": [{"code": f"{510000 + index}", "history": copy.deepcopy(history)} for index in range(instruments)],
+            "trade_sync_status": {"label": "持仓同步", "value": "已同步", "status": "ok"},
+            "industry_radar": {"rows": [{"theme": "AI"}]},
+        },
+        "portfolio_brief_markdown": "私密动作",
+        "weekly_review": {"enabled": True, "signals": ["私密"]},
+        "weekly_review_markdown": "私密周报",
+        "feishu_receipts": {"configured": True, "ok": True, "status": "file:///tmp/receipts", "message_count": "3", "receipt_text": "secret"},
+        "output_paths": {
+            "report_md_path": "/home/runner/work/x/outputs/report.md",
+            "report_md_uri": "file:///home/runner/work/x/outputs/report.md",
+            "report_json_path": r"C:\runner\outputs\report.json",
+            "dashboard_html_url": "https://User.GitHub.io/news/",
+        },
+        "dashboard": {"enabled": True, "output_path": "/home/runner/work/x/outputs/dashboard.html", "public_url": "https://User.GitHub.io/news/"},
+    }
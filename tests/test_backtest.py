@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date
+import unittest
+
+from src.daily_news_bot.backtest import PriceSeries, summarize_returns
+
+
+def _day(value: str) -> int:
+    return date.fromisoformat(value).toordinal()
+
+
+class PriceSeriesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Fri, Mon, Tue, Wed, Thu with a missing close on Tuesday.
+        self.series = PriceSeries.from_points(
+            [
+                {"date": "2026-05-01", "close": 1.0},
+                {"date": "2026-05-04", "close": "1.1"},
+                {"date": "2026-05-05", "close": None},
+                {"date": "2026-05-06", "close": 1.2},
+                {"date": "2026-05-07", "close": 0.9},
+                {"date": "", "close": 5.0},
+            ]
+        )
+
+    def test_trigger_days_snap_to_the_next_trading_day(self) -> None:
+        triggers = [_day("2026-04-30"), _day("2026-05-02"), _day("2026-05-07"), _day("2026-05-08")]
+        self.assertEqual(len(self.series), 5)
+        self.assertEqual(self.series.start_indexes(triggers), [0, 1, 4, None])
+
+    def test_forward_returns_skip_missing_prices_and_short_tails(self) -> None:
+        triggers = [_day("2026-05-01"), _day("2026-05-03"), _day("2026-05-05"), _day("2026-05-07")]
+        returns = self.series.forward_returns(triggers, (1, 3))
+
+        self.assertEqual(returns[1], [10.0, None, None, None])
+        self.assertEqual(returns[3], [20.0, -18.182, None, None])
+        self.assertEqual(
+            summarize_returns(returns[3]),
+            {"samples": 2, "avg_return_pct": 0.909, "win_rate_pct": 50.0},
+        )
+        self.assertIsNone(summarize_returns([None, None]))
+
+
+if __name__ == "__main__":
+    unittest.main()
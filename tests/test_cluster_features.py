@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+import unittest
+
+from src.daily_news_bot.cluster_features import clear_cluster_features, cluster_features
+from src.daily_news_bot.models import Article, EventCluster
+from src.daily_news_bot.ranking import infer_tags
+
+
+def _cluster() -> EventCluster:
+    articles = [
+        Article(
+            title=f"Oil jumps as Hormuz tanker traffic slows {index}",
+            url=f"https://example.com/{index}",
+            source=f"Wire {index}",
+            category="energy",
+            region="Global",
+            source_weight=1.0 + index / 10,
+            published_at=datetime(2026, 5, 9, 8, index),
+            summary="Crude Prices Rise",
+            content="Shipping insurers widen the war-risk zone.",
+        )
+        for index in range(3)
+    ]
+    return EventCluster(cluster_id="c1", theme="Hormuz oil", articles=articles)
+
+
+class ClusterFeaturesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_cluster_features()
+
+    def test_texts_are_built_once_and_shared(self) -> None:
+        cluster = _cluster()
+        features = cluster_features(cluster)
+
+        self.assertIs(cluster_features(cluster), features)
+        self.assertIs(features.representative, cluster.articles[2])
+        self.assertIs(features.brief_text, features.brief_text)
+        self.assertTrue(features.brief_text.startswith("hormuz oil oil jumps"))
+        self.assertIn("crude prices rise", features.brief_text)
+        self.assertEqual(features.source_text, "oil jumps as hormuz tanker traffic slows 2 crude prices rise wire 2")
+        self.assertEqual(features.headline_text, "Hormuz oil Oil jumps as Hormuz tanker traffic slows 2 Crude Prices Rise")
+
+        calls = []
+        features.memo("lens.value", lambda: calls.append(1) or len(calls))
+        features.memo("lens.value", lambda: calls.append(1) or len(calls))
+        self.assertEqual(calls, [1])
+
+    def test_tag_dependent_texts_follow_tag_changes(self) -> None:
+        cluster = _cluster()
+        before = cluster_features(cluster).detail_text
+        self.assertNotIn("energy geopolitics", before)
+
+        cluster.tags = infer_tags(cluster)
+        after = cluster_features(cluster).detail_text
+        self.assertEqual(cluster.tags, ["geopolitics", "energy"])
+        self.assertIn("geopolitics energy", after)
+        self.assertIn("war-risk zone", after)
+
+    def test_rebuilt_when_cluster_changes_shape(self) -> None:
+        cluster = _cluster()
+        features = cluster_features(cluster)
+        self.assertIn("slows 1", features.brief_text)
+
+        cluster.articles = cluster.articles[:1]
+        rebuilt = cluster_features(cluster)
+        self.assertIsNot(rebuilt, features)
+        self.assertNotIn("slows 1", rebuilt.brief_text)
+        self.assertIs(rebuilt.representative, cluster.articles[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
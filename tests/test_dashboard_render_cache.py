@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+from typing import Any
+
+from src.daily_news_bot import dashboard
+from src.daily_news_bot.dashboard import SectionCache, dashboard_css_href, render_dashboard_html
+from tests.dashboard_support import dashboard_payload
+
+
+class _RecordingPayload(dict):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.read: set[str] = set()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self.read.add(key)
+        return super().get(key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        self.read.add(key)
+        return super().__getitem__(key)
+
+
+class DashboardRenderCacheTest(unittest.TestCase):
+    def test_sections_read_only_their_declared_payload_keys(self) -> None:
+        for name, keys, render in (*dashboard._PAGE_PARTS, *dashboard._DETAIL_SECTIONS):
+            with self.subTest(section=name):
+                payload = _RecordingPayload(dashboard_payload())
+                render(payload)
+                self.assertLessEqual(payload.read, set(keys))
+
+    def test_unchanged_sections_are_reused_from_the_render_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "dashboard_render_cache.json"
+            uncached = render_dashboard_html(dashboard_payload())
+
+            first = SectionCache(path)
+            self.assertEqual(render_dashboard_html(dashboard_payload(), cache=first), uncached)
+            self.assertEqual(first.hits, 0)
+
+            second = SectionCache(path)
+            self.assertEqual(render_dashboard_html(dashboard_payload(), cache=second), uncached)
+            self.assertEqual((second.hits, second.misses), (first.misses, 0))
+
+            changed = dashboard_payload()
+            changed["logic_playbook"]["cards"][0]["title"] = "仓位纪律"
+            third = SectionCache(path)
+            html = render_dashboard_html(changed, cache=third)
+            self.assertEqual(third.misses, 1)
+            self.assertEqual(html, render_dashboard_html(changed))
+            self.assertIn("仓位纪律", html)
+
+    def test_undeclared_payload_reads_fail_instead_of_rendering_empty(self) -> None:
+        for path in (None, "cache"):
+            with self.subTest(cached=bool(path)), tempfile.TemporaryDirectory() as tmp:
+                cache = SectionCache(Path(tmp) / "dashboard_render_cache.json" if path else None)
+                cache.begin()
+                self.assertEqual(cache.render("mode", ("mode",), lambda payload: payload.get("mode"), dashboard_payload()), "evening")
+                for read in (lambda payload: payload.get("clusters"), lambda payload: payload["clusters"], lambda payload: "clusters" in payload):
+                    with self.assertRaises(KeyError):
+                        cache.render("mode", ("mode",), read, dashboard_payload())
+
+    def test_stylesheet_can_be_linked_instead_of_inlined(self) -> None:
+        html = render_dashboard_html(dashboard_payload(), css_href=dashboard_css_href())
+        self.assertIn(f'<link rel="stylesheet" href="{dashboard.DASHBOARD_CSS_FILE}?v=', html)
+        self.assertNotIn("<style>", html)
+        self.assertIn("<style>", render_dashboard_html(dashboard_payload()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+import tempfile
+import unittest
+
+from benchmarks.event_history_benchmark import GENERATED_AT, build_history, full_scan_tracking_summary, synthetic_clusters
+from src.daily_news_bot.tracking import _cluster_tokens, build_tracking_summary, load_event_history, save_event_history
+
+
+class EventHistoryIndexTest(unittest.TestCase):
+    def test_indexed_lookup_matches_full_scan(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "event_history.json"
+            build_history(path, days=20, per_run=4)
+            for seed in (11, 12, 13):
+                with self.subTest(seed=seed):
+                    clusters = synthetic_clusters(4, seed=seed)
+                    for lookback_days in (1, 7, 30):
+                        self.assertEqual(
+                            build_tracking_summary(clusters, GENERATED_AT, path, lookback_days=lookback_days),
+                            full_scan_tracking_summary(clusters, GENERATED_AT, path, lookback_days=lookback_days),
+                        )
+
+    def test_rewritten_history_is_reindexed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "event_history.json"
+            clusters = synthetic_clusters(2, seed=5)
+            build_history(path, days=3, per_run=2, seed=5)
+            history = load_event_history(path)
+            recent = (GENERATED_AT - timedelta(hours=1)).isoformat()
+            echo = {"generated_at_utc": recent, "cluster_id": "x", "title": "Echo", "tokens": sorted(_cluster_tokens(clusters[0]))}
+            save_event_history(history + [echo], path)
+
+            summary = build_tracking_summary(clusters, GENERATED_AT, path)
+            self.assertEqual(summary, full_scan_tracking_summary(clusters, GENERATED_AT, path))
+            self.assertEqual(summary["tracked_events"][0]["last_seen_utc"], recent)
+
+            save_event_history(history, path)
+            self.assertEqual(build_tracking_summary(clusters, GENERATED_AT, path), full_scan_tracking_summary(clusters, GENERATED_AT, path))
+
+
+if __name__ == "__main__":
+    unittest.main()
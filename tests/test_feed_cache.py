@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.daily_news_bot.fetchers import collect_articles_with_status, load_feed_cache
+from src.daily_news_bot.main import _build_source_coverage
+from src.daily_news_bot.models import SourceDef
+
+
+NOW = datetime(2026, 5, 9, 12, 0)
+FEED_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Wire</title>
+<item><title>Fed holds rates steady</title><link>https://example.com/fed</link>
+<description>Policy makers kept rates unchanged.</description>
+<pubDate>Sat, 09 May 2026 10:00:00 GMT</pubDate></item>
+<item><title>Old story</title><link>https://example.com/old</link>
+<pubDate>Fri, 01 May 2026 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def _response(status_code: int, content: bytes = b"", headers: dict[str, str] | None = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+class FeedCacheTest(unittest.TestCase):
+    def test_not_modified_feed_reuses_cached_entries_and_counts_hit(self) -> None:
+        source = SourceDef(name="Wire", url="https://example.com/rss.xml", category="macro", region="US")
+        first = _response(200, FEED_BODY, {"ETag": '"v1"', "Last-Modified": "Sat, 09 May 2026 10:00:00 GMT"})
+        second = _response(304)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "feed_cache.json"
+            with patch("src.daily_news_bot.fetchers.http_get", side_effect=[first, second]) as mocked_get:
+                fresh_articles, fresh_status = collect_articles_with_status(
+                    [source], hours_back=24, per_source_limit=5, now=NOW, cache_path=cache_path
+                )
+                cached_articles, cached_status = collect_articles_with_status(
+                    [source], hours_back=24, per_source_limit=5, now=NOW, cache_path=cache_path
+                )
+
+            conditional_headers = mocked_get.call_args_list[1].kwargs["headers"]
+            self.assertEqual(conditional_headers["If-None-Match"], '"v1"')
+            self.assertEqual(conditional_headers["If-Modified-Since"], "Sat, 09 May 2026 10:00:00 GMT")
+            self.assertIn(source.url, load_feed_cache(cache_path))
+
+        self.assertEqual([item.to_dict() for item in cached_articles], [item.to_dict() for item in fresh_articles])
+        self.assertEqual(fresh_status[0]["cache_misses"], 1)
+        self.assertEqual(cached_status[0]["cache_hits"], 1)
+        self.assertEqual(cached_status[0]["skipped_old"], fresh_status[0]["skipped_old"])
+        coverage = _build_source_coverage(fresh_status + cached_status)
+        self.assertEqual((coverage["feed_cache_hits"], coverage["feed_cache_misses"]), (1, 1))
+
+    def test_failed_downloads_are_reached_but_empty_and_keep_the_cached_copy(self) -> None:
+        source = SourceDef(name="Wire", url="https://example.com/rss.xml", category="macro", region="US")
+        responses = [
+            _response(200, FEED_BODY, {"ETag": '"v1"'}),
+            _response(503, b"Service Unavailable"),
+            requests.ConnectionError("connection reset"),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "feed_cache.json"
+            statuses = []
+            with patch("src.daily_news_bot.fetchers.http_get", side_effect=responses) as mocked_get:
+                for _ in responses:
+                    statuses.extend(
+                        collect_articles_with_status([source], hours_back=24, per_source_limit=5, now=NOW, cache_path=cache_path)[1]
+                    )
+            self.assertEqual({call.kwargs["retries"] for call in mocked_get.call_args_list}, {0})
+            self.assertEqual(load_feed_cache(cache_path)[source.url]["etag"], '"v1"')
+
+        self.assertEqual([item["ok"] for item in statuses], [True, True, True])
+        self.assertIn("503", statuses[1]["error"])
+        self.assertIn("connection reset", statuses[2]["error"])
+        coverage = _build_source_coverage(statuses[1:])
+        self.assertEqual((coverage["sources_failed"], coverage["sources_empty_in_window"]), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
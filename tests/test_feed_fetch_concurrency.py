@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.daily_news_bot.fetchers import _new_status, collect_articles_with_status
+from src.daily_news_bot.models import Article, SourceDef
+
+
+NOW = datetime(2026, 5, 9, 12, 0)
+
+
+def _source(name: str) -> SourceDef:
+    return SourceDef(name=name, url=f"https://example.com/{name}.xml", category="macro", region="US")
+
+
+def _article(source: SourceDef, url: str, minute: int) -> Article:
+    return Article(
+        title=f"{source.name} headline",
+        url=url,
+        source=source.name,
+        category=source.category,
+        region=source.region,
+        source_weight=source.weight,
+        published_at=datetime(2026, 5, 9, 11, minute),
+    )
+
+
+class FeedFetchConcurrencyTest(unittest.TestCase):
+    def test_statuses_keep_source_order_and_first_source_wins_duplicates(self) -> None:
+        sources = [_source("slow"), _source("broken"), _source("fast")]
+        delays = {"slow": 0.15, "broken": 0.0, "fast": 0.0}
+
+        def fake_fetch(source, hours_back, per_source_limit, now, timeout, cache):
+            time.sleep(delays[source.name])
+            if source.name == "broken":
+                raise ValueError("bad feed")
+            status = _new_status(source)
+            status["returned_articles"] = 1
+            return [_article(source, "https://example.com/shared", 1 if source.name == "slow" else 2)], status
+
+        with patch("src.daily_news_bot.fetchers.fetch_source_articles", side_effect=fake_fetch):
+            articles, statuses = collect_articles_with_status(
+                sources, hours_back=24, per_source_limit=5, now=NOW, cache_path=None
+            )
+
+        self.assertEqual([item["name"] for item in statuses], ["slow", "broken", "fast"])
+        self.assertFalse(statuses[1]["ok"])
+        self.assertIn("ValueError", statuses[1]["error"])
+        self.assertEqual(len(articles), 1)
+        self.assertEqual(articles[0].source, "slow")
+
+    def test_total_budget_fills_unfinished_sources_with_timeout_status(self) -> None:
+        sources = [_source("stalled"), _source("fast")]
+        release = threading.Event()
+
+        def fake_fetch(source, hours_back, per_source_limit, now, timeout, cache):
+            if source.name == "stalled":
+                release.wait(2)
+            return [], _new_status(source)
+
+        started = time.monotonic()
+        try:
+            with patch("src.daily_news_bot.fetchers.fetch_source_articles", side_effect=fake_fetch):
+                _, statuses = collect_articles_with_status(
+                    sources, hours_back=24, per_source_limit=5, now=NOW, total_budget=0.2, cache_path=None
+                )
+        finally:
+            release.set()
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual([item["name"] for item in statuses], ["stalled", "fast"])
+        self.assertFalse(statuses[0]["ok"])
+        self.assertIn("TimeoutError", statuses[0]["error"])
+        self.assertTrue(statuses[1]["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
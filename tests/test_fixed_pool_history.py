@@ -19,7 +19,7 @@ class FixedPoolHistoryTest(unittest.TestCase):
             {"generated_at_utc": "2026-05-05T00:00:00", "theme": "AI 订单继续发酵", "tags": ["ai"]},
         ]
 
-        with patch("src.daily_news_bot.fixed_pool_history.load_event_history", return_value=event_history):
+        with patch("src.daily_news_bot.fixed_pool_history.iter_event_history", return_value=iter(reversed(event_history))):
             panel = build_fixed_pool_60d_panel(
                 {
                     "decision_cockpit": {
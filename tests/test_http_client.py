@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.daily_news_bot import http_client
+from src.daily_news_bot.profiling import RunTimings
+
+
+def _response(status_code: int, content: bytes = b"ok", headers: dict[str, str] | None = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+class HttpClientTest(unittest.TestCase):
+    def test_get_retries_transient_failures_and_counts_each_attempt(self) -> None:
+        session = MagicMock()
+        session.request.side_effect = [
+            requests.ConnectionError("reset"),
+            _response(503, b"busy", {"Retry-After": "1"}),
+            _response(200, b"payload"),
+        ]
+        timings = RunTimings()
+        with patch.object(http_client, "get_session", return_value=session), patch.object(http_client.time, "sleep") as sleep:
+            with timings.stage("quotes"):
+                response = http_client.http_get("https://push2.eastmoney.com/api", params={"secid": "1.000001"}, timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.request.call_count, 3)
+        self.assertEqual(session.request.call_args.kwargs["timeout"], 5)
+        self.assertEqual(sleep.call_args_list[1].args[0], 1.0)
+        stage = timings.to_dict()["stages"][0]
+        self.assertEqual((stage["requests"], stage["bytes_downloaded"]), (2, 11))
+
+    def test_post_is_not_retried_by_default(self) -> None:
+        session = MagicMock()
+        session.request.return_value = _response(502)
+        with patch.object(http_client, "get_session", return_value=session), patch.object(http_client.time, "sleep") as sleep:
+            response = http_client.http_post("https://open.feishu.cn/open-apis/bot", json={})
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(session.request.call_count, 1)
+        sleep.assert_not_called()
+
+    def test_eastmoney_subdomains_share_one_concurrency_cap(self) -> None:
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def slow_request(method, url, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.03)
+            with lock:
+                in_flight -= 1
+            return _response(200)
+
+        session = MagicMock()
+        session.request.side_effect = slow_request
+        hosts = ["fund.eastmoney.com", "push2.eastmoney.com", "fundf10.eastmoney.com"]
+        with patch.object(http_client, "get_session", return_value=session), patch.dict(http_client.HOST_LIMITS, {"eastmoney.com": 2}), patch.dict(http_client._host_slots, clear=True):
+            threads = [
+                threading.Thread(target=http_client.http_get, args=(f"https://{hosts[index % 3]}/item/{index}",))
+                for index in range(9)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(session.request.call_count, 9)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
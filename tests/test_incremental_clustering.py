@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+import unittest
+
+from benchmarks.clustering_benchmark import exhaustive_cluster_articles, synthetic_articles
+from src.daily_news_bot.clustering import cluster_articles
+from src.daily_news_bot.models import Article
+
+
+def _signature(clusters):
+    return [
+        (cluster.cluster_id, cluster.theme, cluster.representative.url, [article.url for article in cluster.articles])
+        for cluster in clusters
+    ]
+
+
+def _article(index: int, title: str, weight: float = 1.0) -> Article:
+    return Article(
+        title=title,
+        url=f"https://example.com/{index}",
+        source="Wire",
+        category="macro",
+        region="US",
+        source_weight=weight,
+        published_at=datetime(2026, 5, 9, 8, 0),
+    )
+
+
+class IncrementalClusteringTest(unittest.TestCase):
+    def test_matches_exhaustive_scan_on_synthetic_week(self) -> None:
+        for seed in (1, 2, 3):
+            with self.subTest(seed=seed):
+                articles = synthetic_articles(250, seed=seed)
+                self.assertEqual(_signature(cluster_articles(articles)), _signature(exhaustive_cluster_articles(articles)))
+
+    def test_ties_keep_earliest_cluster_and_representative(self) -> None:
+        articles = [
+            _article(1, "Warsh hearing on Fed policy"),
+            _article(2, "Warsh hearing on Fed policy"),
+            _article(3, "Warsh hearing Fed policy again", weight=1.2),
+            _article(4, "Warsh hearing on Fed policy"),
+            _article(5, "Iran oil war"),
+        ]
+
+        clusters = cluster_articles(articles)
+
+        self.assertEqual(_signature(clusters), _signature(exhaustive_cluster_articles(articles)))
+        self.assertEqual(clusters[0].representative.url, "https://example.com/3")
+
+
+if __name__ == "__main__":
+    unittest.main()
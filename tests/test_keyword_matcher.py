@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import unittest
+
+from benchmarks.keyword_matcher_benchmark import TABLES, legacy_found, synthetic_clusters
+from src.daily_news_bot.keyword_matcher import TOKEN, WORD, KeywordMatcher, keyword_matcher
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_modes_keep_each_call_site_semantics(self) -> None:
+        text = "analysts said u.s. chip exports slowed; 芯片出口管制 tightened, cyberattacks rose"
+
+        substring = KeywordMatcher({"tech": ["AI", "芯片"], "trade": ["exports", "出口", "出口管制"]})
+        self.assertEqual(substring.scan(text).hits("tech"), ["AI", "芯片"])
+        self.assertEqual(substring.scan(text).hits("trade"), ["exports", "出口", "出口管制"])
+
+        word = KeywordMatcher({"tech": ["ai", "chip", "芯片"], "us": ["u.s."]}, mode=WORD)
+        self.assertEqual(word.scan(text).hits("tech"), ["chip", "芯片"])
+        self.assertEqual(word.scan(text).keys(), ["tech"])
+
+        token = KeywordMatcher({"cyber": ["cyberattack", "chip exports"]}, mode=TOKEN)
+        self.assertEqual(token.scan(text).hits("cyber"), ["chip exports"])
+
+    def test_counts_keep_duplicate_keywords_and_scan_many_unions_texts(self) -> None:
+        matcher = keyword_matcher(("oil", "gold", "oil", ""))
+        self.assertEqual(matcher.scan("oil and more oil").count(), 2)
+        self.assertEqual(matcher.scan_many(["oil", "gold"]).hits(), ["oil", "gold", "oil"])
+        self.assertIs(keyword_matcher(("oil", "gold", "oil", "")), matcher)
+
+    def test_module_tables_match_per_keyword_scans(self) -> None:
+        for cluster in synthetic_clusters(40):
+            for label, matcher, build in TABLES:
+                text = build(cluster)
+                self.assertEqual(matcher.scan(text).found, legacy_found(matcher, text), label)
+
+
+if __name__ == "__main__":
+    unittest.main()
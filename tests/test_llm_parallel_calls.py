@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.daily_news_bot import llm
+from tests.llm_support import LlmDebugDirMixin, llm_response
+
+
+class LlmParallelCallsTest(LlmDebugDirMixin, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.settings = replace(self.settings, llm_cache_ttl_seconds=0, llm_failure_ttl_seconds=0)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _post(self, endpoint, headers=None, json=None, timeout=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        prompt = json["messages"][-1]["content"]
+        # The translation prompt fails on its primary model, so only that call walks its fallback chain.
+        if prompt == "titles" and json["model"] == "primary":
+            return llm_response(400)
+        return llm_response(200, f"{json['model']}:{prompt}")
+
+    def _run_both(self, settings) -> list[str | None]:
+        with patch.object(llm, "http_post", side_effect=self._post), ThreadPoolExecutor(max_workers=2) as executor:
+            report = executor.submit(llm.generate_report, settings, "system", "news")
+            translations = executor.submit(llm.generate_report, settings, "translate", "titles", debug_name="translations")
+            return [report.result(), translations.result()]
+
+    def test_concurrent_calls_keep_their_own_debug_files_and_fallback_chain(self) -> None:
+        self.assertEqual(self._run_both(self.settings), ["primary:news", "backup:titles"])
+        self.assertEqual(self.peak, 2)
+
+        report_status = self._status()
+        translation_status = json.loads((self.root / "llm_translations_status.json").read_text(encoding="utf-8"))
+        self.assertEqual(report_status["selected_model"], "primary")
+        self.assertEqual([item["model"] for item in translation_status["attempts"]], ["primary", "backup"])
+        self.assertEqual((self.root / "llm_last_response.txt").read_text(encoding="utf-8").count("primary:news"), 1)
+        self.assertIn("backup:titles", (self.root / "llm_translations_response.txt").read_text(encoding="utf-8"))
+
+    def test_in_flight_requests_are_bounded(self) -> None:
+        self.assertEqual(self._run_both(replace(self.settings, llm_max_concurrency=1)), ["primary:news", "backup:titles"])
+        self.assertEqual(self.peak, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import replace
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from src.daily_news_bot import llm
+from tests.llm_support import LlmDebugDirMixin, llm_response
+
+
+class LlmResponseCacheTest(LlmDebugDirMixin, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.settings = replace(self.settings, llm_cache_ttl_seconds=3600, llm_failure_ttl_seconds=600)
+
+    def test_identical_prompt_is_served_from_the_cache_until_it_expires(self) -> None:
+        with patch.object(llm.time, "time", return_value=1000.0), patch.object(llm, "http_post", return_value=llm_response(200, "日报")) as post:
+            self.assertEqual(llm.generate_report(self.settings, "system", "user"), "日报")
+            self.assertEqual(self._status()["cache"]["hit"], False)
+            self.assertEqual(llm.generate_report(self.settings, "system", "user"), "日报")
+            self.assertEqual(post.call_count, 1)
+            self.assertEqual(self._status()["cache"]["hit"], True)
+            self.assertEqual(self._status()["selected_model"], "primary")
+
+            llm.generate_report(self.settings, "system", "another user prompt")
+            llm.generate_report(replace(self.settings, temperature=0.7), "system", "user")
+            self.assertEqual(post.call_count, 3)
+
+        with patch.object(llm.time, "time", return_value=1000.0 + 3600), patch.object(llm, "http_post", return_value=llm_response(200, "新日报")) as post:
+            self.assertEqual(llm.generate_report(self.settings, "system", "user"), "新日报")
+            self.assertEqual(post.call_count, 1)
+
+    def test_least_recently_used_responses_are_evicted(self) -> None:
+        with patch.object(llm, "RESPONSE_CACHE_MAX_ENTRIES", 2), patch.object(llm, "http_post", return_value=llm_response(200, "ok")) as post:
+            for now, prompt in ((1.0, "a"), (2.0, "b"), (3.0, "a"), (4.0, "c")):
+                with patch.object(llm.time, "time", return_value=now):
+                    llm.generate_report(self.settings, "system", prompt)
+            self.assertEqual(post.call_count, 3)
+            with patch.object(llm.time, "time", return_value=5.0):
+                llm.generate_report(self.settings, "system", "a")
+                llm.generate_report(self.settings, "system", "b")
+            self.assertEqual(post.call_count, 4)
+
+    def test_provider_failures_skip_the_model_chain_for_a_short_window(self) -> None:
+        responses = [requests.ConnectionError("down"), llm_response(503)]
+        with patch.object(llm.time, "time", return_value=1000.0), patch.object(llm, "http_post", side_effect=responses) as post:
+            self.assertIsNone(llm.generate_report(self.settings, "system", "user"))
+            self.assertEqual(post.call_count, 2)
+            self.assertIsNone(llm.generate_report(self.settings, "translate", "titles"))
+            self.assertEqual(post.call_count, 2)
+            status = self._status()
+            self.assertEqual(status["cache"]["skipped_models"], ["primary", "backup"])
+            self.assertFalse(status["ok"])
+
+        with patch.object(llm.time, "time", return_value=1000.0 + 600), patch.object(llm, "http_post", return_value=llm_response(200, "恢复")) as post:
+            self.assertEqual(llm.generate_report(self.settings, "system", "user"), "恢复")
+            self.assertEqual(post.call_count, 1)
+
+    def test_prompt_specific_errors_are_not_negatively_cached(self) -> None:
+        with patch.object(llm.time, "time", return_value=1000.0), patch.object(llm, "http_post", side_effect=[llm_response(400), llm_response(200, "备用")]) as post:
+            self.assertEqual(llm.generate_report(self.settings, "system", "user"), "备用")
+        with patch.object(llm.time, "time", return_value=1001.0), patch.object(llm, "http_post", return_value=llm_response(200, "主模型")) as post:
+            self.assertEqual(llm.generate_report(self.settings, "system", "other"), "主模型")
+            self.assertEqual(post.call_args.kwargs["json"]["model"], "primary")
+
+
+if __name__ == "__main__":
+    unittest.main()
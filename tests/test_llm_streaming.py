@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import replace
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.daily_news_bot import llm
+from tests.llm_support import LlmDebugDirMixin
+
+
+def _sse(*texts: str, pings: int = 0) -> list[bytes]:
+    lines = [b": keep-alive"] * pings
+    lines += [b"data: " + json.dumps({"choices": [{"delta": {"content": text}}]}).encode("utf-8") for text in texts]
+    return [*lines, b"data: [DONE]"]
+
+
+class _FakeSocket:
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+
+    def settimeout(self, timeout: float) -> None:
+        self.timeout = timeout
+
+
+class _FakeStreams:
+    """Stands in for http_stream: each model name maps to the SSE lines it sends and the delay before each line.
+
+    A delay longer than the socket's current read timeout fails the read, as a silent socket would.
+    """
+
+    def __init__(self, streams: dict[str, tuple[list[bytes], float | list[float]]]) -> None:
+        self.streams = streams
+        self.payloads: list[dict] = []
+
+    @contextmanager
+    def __call__(self, method, url, *, headers=None, json=None, timeout=None):
+        self.payloads.append(json)
+        lines, delay = self.streams[json["model"]]
+        delays = delay if isinstance(delay, list) else [delay] * len(lines)
+        sock = _FakeSocket(timeout[1] if isinstance(timeout, tuple) else timeout)
+
+        def iter_lines():
+            for line, wait in zip(lines, delays):
+                time.sleep(wait)
+                if wait > sock.timeout:
+                    raise requests.ConnectionError("Read timed out.")
+                yield line
+
+        response = MagicMock()
+        response.raw.connection.sock = sock
+        response.ok = True
+        response.status_code = 200
+        response.headers = {"Content-Type": "text/event-stream; charset=utf-8"}
+        response.iter_lines = lambda chunk_size=512: iter_lines()
+        yield response
+
+
+class LlmStreamingTest(LlmDebugDirMixin, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.settings = replace(
+            self.settings,
+            llm_cache_ttl_seconds=0,
+            llm_failure_ttl_seconds=600,
+            llm_stream=True,
+            llm_first_token_timeout=0.05,
+        )
+
+    def test_stalled_model_falls_through_to_the_fallback_before_the_full_timeout(self) -> None:
+        streams = _FakeStreams({"primary": (_sse("慢", pings=10), 0.02), "backup": (_sse("日", "报"), 0.0)})
+        started = time.monotonic()
+        with patch.object(llm, "http_stream", streams):
+            self.assertEqual(llm.generate_report(self.settings, "system", "user"), "日报")
+        self.assertLess(time.monotonic() - started, 1)
+
+        status = self._status()
+        stalled, served = status["attempts"]
+        self.assertEqual(stalled["model"], "primary")
+        self.assertIn("no token within", stalled["error"])
+        self.assertEqual((served["model"], served["ok"], served["tokens"]), ("backup", True, 2))
+        self.assertIn("ttft_ms", served)
+        self.assertIn("tokens_per_sec", served)
+        self.assertTrue(streams.payloads[0]["stream"])
+
+        # The stalled provider is skipped on the next call within the failure TTL.
+        with patch.object(llm, "http_stream", streams):
+            llm.generate_report(self.settings, "system", "another prompt")
+        self.assertEqual(self._status()["cache"]["skipped_models"], ["primary"])
+
+    def test_a_pause_after_the_first_token_is_not_a_stall(self) -> None:
+        settings = replace(self.settings, timeout=5)
+        streams = _FakeStreams({"primary": (_sse("日", "报"), [0.0, 0.2, 0.0]), "backup": (_sse("备"), 0.0)})
+        with patch.object(llm, "http_stream", streams):
+            self.assertEqual(llm.generate_report(settings, "system", "user"), "日报")
+        self.assertEqual([attempt["model"] for attempt in self._status()["attempts"]], ["primary"])
+
+    def test_output_is_capped_at_the_token_budget(self) -> None:
+        settings = replace(self.settings, llm_max_output_tokens=3)
+        streams = _FakeStreams({"primary": (_sse("一", "二", "三", "四", "五"), 0.0)})
+        with patch.object(llm, "http_stream", streams):
+            self.assertEqual(llm.generate_report(settings, "system", "user"), "一二三")
+        self.assertEqual(streams.payloads[0]["max_tokens"], 3)
+        attempt = self._status()["attempts"][0]
+        self.assertEqual((attempt["tokens"], attempt["truncated"]), (3, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
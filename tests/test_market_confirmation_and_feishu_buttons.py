@@ -12,6 +12,11 @@ from src.daily_news_bot.senders import _build_card_payload
 
 
 class MarketConfirmationAndFeishuButtonsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.state_path = Path(tmp.name) / "industry_radar_state.json"
+
     def test_execution_check_lines_prioritize_holding_risks(self) -> None:
         lines = _execution_check_lines(
             {
@@ -79,6 +84,7 @@ class MarketConfirmationAndFeishuButtonsTest(unittest.TestCase):
             },
             local_market_payload={"broad_change_pct": 0.8, "risk_avg_pct": 0.1, "high_chase_count": 0},
             candidate_scores=[],
+            state_path=self.state_path,
         )
 
         row = enriched["rows"][0]
@@ -121,6 +127,7 @@ class MarketConfirmationAndFeishuButtonsTest(unittest.TestCase):
             },
             local_market_payload={"broad_change_pct": 0.2, "risk_avg_pct": 0.1, "high_chase_count": 0},
             candidate_scores=[],
+            state_path=self.state_path,
         )
 
         row = enriched["rows"][0]
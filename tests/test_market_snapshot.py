@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.daily_news_bot import market_data
+
+
+def _fake_quote(symbol: str, timeout: int = 10) -> dict:
+    if symbol == "^VIX":
+        raise ConnectionError("offline")
+    return {"symbol": symbol, "price": 1.0, "change_pct": 0.5}
+
+
+class MarketSnapshotTest(unittest.TestCase):
+    def test_snapshot_keeps_asset_order_failures_and_reuses_fresh_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "quotes.json"
+            with patch.object(market_data, "fetch_quote", side_effect=_fake_quote) as mocked, patch.object(market_data.time, "time", return_value=1000.0):
+                first = market_data.fetch_market_snapshot(cache_path=cache_path)
+                self.assertEqual(mocked.call_count, len(market_data.ASSETS))
+                second = market_data.fetch_market_snapshot(cache_path=cache_path)
+
+            symbols = [asset["symbol"] for asset in market_data.ASSETS if asset["symbol"] != "^VIX"]
+            self.assertEqual([item["symbol"] for item in first["items"]], symbols)
+            self.assertEqual(first["failures"][0]["symbol"], "^VIX")
+            self.assertIn("ConnectionError", first["failures"][0]["error"])
+            self.assertEqual(first["coverage"]["cached_assets"], 0)
+
+            # Only the failed symbol is fetched again while the cache is fresh.
+            self.assertEqual(mocked.call_count, len(market_data.ASSETS) + 1)
+            self.assertEqual([item["symbol"] for item in second["items"]], symbols)
+            self.assertEqual(second["coverage"]["cached_assets"], len(symbols))
+            self.assertEqual(second["items"][0]["name"], market_data.ASSETS[0]["name"])
+
+            with patch.object(market_data, "fetch_quote", side_effect=_fake_quote) as refetch, patch.object(
+                market_data.time, "time", return_value=1000.0 + market_data.QUOTE_CACHE_TTL_SECONDS + 1
+            ):
+                expired = market_data.fetch_market_snapshot(cache_path=cache_path)
+            self.assertEqual(refetch.call_count, len(market_data.ASSETS))
+            self.assertEqual(expired["coverage"]["cached_assets"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+import unittest
+
+from src.daily_news_bot.credibility import assess_cluster_credibility
+from src.daily_news_bot.models import Article, EventCluster
+from src.daily_news_bot.near_duplicates import collapse_near_duplicates
+
+
+SUMMARY = "The Federal Reserve left its benchmark rate unchanged on Wednesday and signalled patience on cuts."
+
+
+def _article(url: str, source: str, domain: str, title: str, summary: str = SUMMARY, score: float = 0.7, official: bool = False) -> Article:
+    return Article(
+        title=title,
+        url=url,
+        source=source,
+        category="macro",
+        region="US",
+        source_weight=1.0,
+        published_at=datetime(2026, 5, 9, 10, 0),
+        summary=summary,
+        official_source=official,
+        source_domain=domain,
+        credibility_score=score,
+    )
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def test_wire_reprints_collapse_into_one_article_that_keeps_the_spread(self) -> None:
+        articles = [
+            _article("https://a.com/1", "Wire A", "a.com", "Fed holds rates steady - Reuters"),
+            _article("https://other.com/2", "Other", "other.com", "Apple unveils new chip", "Apple showed a faster laptop processor."),
+            _article("https://b.com/3", "Wire B", "b.com", "Fed holds rates steady", score=0.9),
+            _article("https://c.com/4", "Blog C", "c.com", "Fed holds rates steady | AP", score=0.3),
+        ]
+
+        collapsed = collapse_near_duplicates(articles, threshold=0.6)
+
+        self.assertEqual([item.url for item in collapsed], ["https://b.com/3", "https://other.com/2"])
+        keeper = collapsed[0]
+        self.assertEqual(keeper.syndicated_count, 3)
+        self.assertEqual(sorted(keeper.syndicated_sources), ["Blog C", "Wire A"])
+        self.assertEqual(keeper.syndicated_domains, ["a.com"])
+        self.assertEqual(collapsed[1].syndicated_count, 1)
+
+        cluster = assess_cluster_credibility(EventCluster(cluster_id="fed", theme="Fed", articles=[keeper]))
+        self.assertEqual(cluster.confirmed_source_count, 2)
+        self.assertEqual(cluster.source_names, {"Wire A", "Wire B", "Blog C"})
+        self.assertEqual(cluster.coverage_count, 3)
+
+    def test_official_copy_is_kept_and_threshold_above_one_disables(self) -> None:
+        articles = [
+            _article("https://wire.com/1", "Wire", "wire.com", "Fed holds rates steady", score=0.9),
+            _article("https://fed.gov/2", "Fed", "federalreserve.gov", "Fed holds rates steady", score=0.8, official=True),
+        ]
+
+        self.assertEqual([item.url for item in collapse_near_duplicates(articles)], ["https://fed.gov/2"])
+        self.assertEqual(len(collapse_near_duplicates(articles, threshold=1.01)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
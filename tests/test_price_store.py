@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.daily_news_bot import portfolio_quotes, price_store
+from src.daily_news_bot.price_store import append_prices, bars_to_fetch, load_prices, price_depth
+
+
+def _nav_response(rows: list[tuple[str, float]]) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = {"Data": {"LSJZList": [{"FSRQ": day, "DWJZ": str(nav), "JZZZL": "0.5"} for day, nav in rows]}}
+    return response
+
+
+class PriceStoreTest(unittest.TestCase):
+    def test_appends_overwrites_last_bar_and_backfills(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(append_prices("etf/510300", [{"date": "2026-05-05", "close": 1.0}, {"date": "2026-05-06", "close": "-"}], root=tmp), 2)
+            day_file = Path(tmp) / "etf" / "510300" / price_store.DAY_FILE
+            self.assertEqual(day_file.stat().st_size, 8)
+
+            # The last stored bar is rewritten in place; only the new day is appended.
+            self.assertEqual(append_prices("etf/510300", [{"date": "2026-05-06", "close": 1.1}, {"date": "2026-05-07", "close": 1.2}], root=tmp), 1)
+            self.assertEqual(day_file.stat().st_size, 12)
+            window = load_prices("etf/510300", root=tmp)
+            self.assertEqual(window.rows(), [{"date": "2026-05-05", "close": 1.0}, {"date": "2026-05-06", "close": 1.1}, {"date": "2026-05-07", "close": 1.2}])
+
+            append_prices("etf/510300", [{"date": "2026-05-01", "close": 0.9, "volume": 10}], root=tmp, depth=320)
+            window = load_prices("etf/510300", root=tmp)
+            self.assertEqual(window.tail(2).rows(), [{"date": "2026-05-06", "close": 1.1, "volume": None}, {"date": "2026-05-07", "close": 1.2, "volume": None}])
+            self.assertEqual(window.rows()[0], {"date": "2026-05-01", "close": 0.9, "volume": 10.0})
+            self.assertEqual(price_depth("etf/510300", root=tmp), 320)
+
+            # A torn append is trimmed on read and rewritten on the next write.
+            with open(day_file, "ab") as handle:
+                handle.write(b"\x01\x02\x03\x04\x05")
+            self.assertEqual(len(load_prices("etf/510300", root=tmp)), 4)
+            append_prices("etf/510300", [{"date": "2026-05-08", "close": 1.3, "volume": 12}], root=tmp)
+            self.assertEqual(load_prices("etf/510300", root=tmp).tail(1).rows(), [{"date": "2026-05-08", "close": 1.3, "volume": 12.0}])
+
+    def test_only_missing_bars_are_requested_once_the_window_is_stored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(bars_to_fetch("fund_nav/000001", 320, root=tmp), 320)
+            append_prices("fund_nav/000001", [{"date": "2026-05-08", "close": 1.0}], root=tmp, depth=10)
+            self.assertEqual(bars_to_fetch("fund_nav/000001", 320, root=tmp, today=date(2026, 5, 11)), 320)
+            self.assertEqual(bars_to_fetch("fund_nav/000001", 10, root=tmp, today=date(2026, 5, 11)), 4)
+            self.assertEqual(bars_to_fetch("fund_nav/000001", 10, root=tmp, today=date(2026, 5, 8)), 1)
+
+    def test_fund_history_reads_its_window_from_the_store(self) -> None:
+        today = date.today()
+        full = [((today - timedelta(days=offset)).isoformat(), 1 + offset / 100) for offset in range(1, 13)]
+        with tempfile.TemporaryDirectory() as tmp, patch.object(price_store, "PRICE_STORE_DIR", Path(tmp)):
+            with patch.object(portfolio_quotes, "_request", return_value=_nav_response(full[:10])) as request:
+                history = portfolio_quotes.fetch_fund_history("000001", page_size=10)
+            self.assertEqual(request.call_args.kwargs["params"]["pageSize"], 10)
+            self.assertEqual(history[0], {"date": full[0][0], "nav": 1.01, "day_change_pct": 0.5})
+            self.assertEqual(len(history), 10)
+
+            latest = [(today.isoformat(), 1.0), full[0]]
+            with patch.object(portfolio_quotes, "_request", return_value=_nav_response(latest)) as request:
+                history = portfolio_quotes.fetch_fund_history("000001", page_size=10)
+            self.assertEqual(request.call_args.kwargs["params"]["pageSize"], 2)
+            self.assertEqual([row["date"] for row in history[:2]], [today.isoformat(), full[0][0]])
+            self.assertEqual(history[-1]["date"], full[8][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import unittest
+from unittest.mock import patch
+
+from src.daily_news_bot import prompts
+from src.daily_news_bot.models import Article, EventCluster
+from src.daily_news_bot.prompts import build_budgeted_user_prompt, build_user_prompt, estimate_tokens
+
+
+def _cluster(index: int, articles: int = 6) -> EventCluster:
+    return EventCluster(
+        cluster_id=str(index),
+        theme="能源",
+        tags=["能源", "地缘"],
+        credibility_notes=["多家主流媒体交叉验证"],
+        articles=[
+            Article(
+                title=f"Tankers reroute around Hormuz {index}-{article}",
+                url=f"https://example.com/{index}/{article}",
+                source="Reuters",
+                category="energy",
+                region="global",
+                source_weight=1.0,
+                published_at=datetime(2026, 5, 3, tzinfo=timezone.utc),
+                summary=f"Summary {index}-{article}: insurers raised war-risk premiums and freight rates climbed. " * 3,
+            )
+            for article in range(articles)
+        ],
+    )
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def utcnow(cls) -> datetime:
+        return datetime(2026, 5, 3, 8, 0)
+
+
+class PromptBudgetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = patch.object(prompts, "datetime", _FixedDatetime)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clusters = [_cluster(index) for index in range(10)]
+
+    def test_estimate_counts_cjk_characters_and_latin_words(self) -> None:
+        self.assertEqual(estimate_tokens("油价上涨"), 4)
+        self.assertEqual(estimate_tokens("oil prices rise"), 3)
+        self.assertGreater(estimate_tokens("a" * 40), estimate_tokens("a" * 8))
+
+    def test_prompt_is_unchanged_when_it_fits_the_budget(self) -> None:
+        prompt, stats = build_budgeted_user_prompt("comprehensive", self.clusters, token_budget=100_000)
+        self.assertEqual(prompt, build_user_prompt("comprehensive", self.clusters))
+        self.assertEqual(stats["trimmed_clusters"], 0)
+        self.assertEqual(stats["estimated_tokens"], estimate_tokens(prompt))
+        self.assertFalse(stats["over_budget"])
+
+    def test_lower_ranked_clusters_are_trimmed_first_to_fit(self) -> None:
+        untrimmed = estimate_tokens(build_user_prompt("comprehensive", self.clusters))
+        budget = untrimmed * 2 // 3
+        prompt, stats = build_budgeted_user_prompt("comprehensive", self.clusters, token_budget=budget)
+
+        self.assertLessEqual(stats["estimated_tokens"], budget)
+        self.assertEqual(stats["untrimmed_estimated_tokens"], untrimmed)
+        self.assertGreater(stats["trimmed_clusters"], 0)
+        self.assertIn("Summary 0-4:", prompt)
+        self.assertNotIn("Summary 9-4:", prompt)
+        self.assertIn("## 事件 10", prompt)
+
+    def test_impossible_budget_keeps_every_cluster_at_its_barest(self) -> None:
+        prompt, stats = build_budgeted_user_prompt("comprehensive", self.clusters, token_budget=10)
+        self.assertTrue(stats["over_budget"])
+        self.assertEqual(stats["trimmed_clusters"], len(self.clusters))
+        self.assertNotIn("Summary", prompt)
+        self.assertNotIn("真实性说明", prompt)
+        self.assertEqual(prompt.count("- [Reuters]"), len(self.clusters))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from src.daily_news_bot.main import _public_output_payload
+from tests.public_payload_support import legacy_public_payload, weekly_payload
+
+
+class PublicPayloadRedactionTest(unittest.TestCase):
+    def test_output_is_byte_identical_to_the_deep_copy_pipeline(self) -> None:
+        for redact in (False, True):
+            for public_url in ("", "https://user.github.io/news/"):
+                with self.subTest(redact=redact, public_url=public_url):
+                    payload = weekly_payload()
+                    before = json.dumps(payload, ensure_ascii=False)
+                    expected = json.dumps(legacy_public_payload(payload, redact, public_url), ensure_ascii=False, indent=2)
+
+                    public_payload = _public_output_payload(payload, redact, public_url)
+
+                    self.assertEqual(json.dumps(public_payload, ensure_ascii=False, indent=2), expected)
+                    self.assertEqual(json.dumps(payload, ensure_ascii=False), before)
+
+    def test_untouched_branches_are_shared_and_private_histories_dropped(self) -> None:
+        payload = weekly_payload()
+        public_payload = _public_output_payload(payload, True, "https://user.github.io/news/")
+
+        self.assertIs(public_payload["source_status"], payload["source_status"])
+        self.assertIsNot(public_payload["clusters"], payload["clusters"])
+        self.assertIs(public_payload["clusters"][0]["title"], payload["clusters"][0]["title"])
+        self.assertNotIn("holdings", public_payload["portfolio"])
+        self.assertNotIn("fixed_pool_backfill_rows", public_payload["portfolio"])
+        self.assertIs(
+            public_payload["portfolio"]["fixed_buy_pool_rows"][0]["market_confirmation"],
+            payload["portfolio"]["fixed_buy_pool_rows"][0]["market_confirmation"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.daily_news_bot.report import save_json, side_file_dir
+
+
+def _payload() -> dict:
+    history = [{"date": f"2026-04-{day:02d}", "close": 1 + day / 100} for day in range(1, 31)]
+    return {
+        "generated_at": "2026-05-01T08:00:00",
+        "clusters": [{"title": "原油 供给", "articles": [{"title": "Hormuz"}]}],
+        "portfolio": {
+            "fixed_pool_backfill_rows": [{"code": "510300", "history": history}, {"code": "518880", "history": history[:3]}],
+        },
+    }
+
+
+class ReportJsonOutputTest(unittest.TestCase):
+    def test_default_output_matches_indented_dump(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.json"
+            stats = save_json(path, _payload())
+            text = path.read_text(encoding="utf-8")
+            self.assertEqual(text, json.dumps(_payload(), ensure_ascii=False, indent=2))
+            self.assertEqual(stats, {"bytes": len(text.encode("utf-8")), "side_files": 0, "side_file_bytes": 0})
+            self.assertFalse(side_file_dir(path).exists())
+
+    def test_compact_side_files_and_gzip_round_trip(self) -> None:
+        payload = _payload()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.json"
+            stats = save_json(path, payload, compact=True, side_files=True, gzip_copy=True)
+
+            text = path.read_text(encoding="utf-8")
+            self.assertNotIn("\n", text)
+            self.assertEqual(gzip.decompress((Path(tmp) / "report.json.gz").read_bytes()).decode("utf-8"), text)
+            self.assertEqual(stats["side_files"], 1)
+
+            written = json.loads(text)
+            rows = written["portfolio"]["fixed_pool_backfill_rows"]
+            name = "portfolio.fixed_pool_backfill_rows.0.history.json"
+            self.assertEqual(rows[0]["history"], {"$ref": name, "items": 30})
+            self.assertEqual(rows[1]["history"], payload["portfolio"]["fixed_pool_backfill_rows"][1]["history"])
+            side = side_file_dir(path) / name
+            self.assertEqual(json.loads(side.read_text(encoding="utf-8")), payload["portfolio"]["fixed_pool_backfill_rows"][0]["history"])
+            self.assertTrue(side.with_name(f"{name}.gz").exists())
+            # The caller's payload is left untouched.
+            self.assertEqual(payload, _payload())
+
+            # A run without side files clears the previous run's.
+            save_json(path, payload, compact=True)
+            self.assertFalse(side_file_dir(path).exists())
+            self.assertFalse((Path(tmp) / "report.json.gz").exists())
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8")), payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
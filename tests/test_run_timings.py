@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+import pstats
+import tempfile
+import time
+import unittest
+
+from src.daily_news_bot.dashboard import _coverage_body
+from src.daily_news_bot.profiling import RunTimings, format_timings_summary, record_request
+from src.daily_news_bot.scheduler import Stage, run_stages
+
+
+class RunTimingsTest(unittest.TestCase):
+    def test_requests_are_attributed_to_the_stage_that_made_them(self) -> None:
+        timings = RunTimings()
+
+        def download(size: int) -> int:
+            record_request(size)
+            time.sleep(0.02)
+            return size
+
+        run_stages(
+            [
+                Stage("quotes", lambda: download(1_500_000)),
+                Stage("news", lambda: download(500_000)),
+                Stage("merge", lambda quotes, news: quotes + news, inputs=("quotes", "news")),
+            ],
+            timings=timings,
+        )
+        record_request(999)
+
+        summary = timings.to_dict()
+        stages = {item["name"]: item for item in summary["stages"]}
+        self.assertEqual(set(stages), {"quotes", "news", "merge"})
+        self.assertEqual((stages["quotes"]["requests"], stages["quotes"]["bytes_downloaded"]), (1, 1_500_000))
+        self.assertEqual(stages["merge"]["requests"], 0)
+        self.assertEqual((summary["requests"], summary["bytes_downloaded"]), (2, 2_000_000))
+        self.assertGreaterEqual(stages["quotes"]["wall_ms"], 15)
+
+        line = format_timings_summary(summary)
+        self.assertIn("请求 2 次 / 2.0 MB", line)
+        self.assertIn("运行耗时", _coverage_body({"timings": summary}))
+        self.assertNotIn("运行耗时", _coverage_body({}))
+
+    def test_profile_dump_merges_stage_profiles(self) -> None:
+        timings = RunTimings(profile=True)
+        with timings.stage("render"):
+            sum(range(1000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "profile.pstats"
+            self.assertTrue(timings.dump_profile(path))
+            self.assertGreater(pstats.Stats(str(path)).total_calls, 0)
+        self.assertFalse(RunTimings().dump_profile(Path("unused.pstats")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,20 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from pathlib import Path
 import tempfile
+import threading
+import time
 import unittest
+from unittest.mock import patch
 
 import json
 
-from src.daily_news_bot.signal_validation import build_signal_validation, render_signal_validation_markdown
+from src.daily_news_bot import signal_validation
+from src.daily_news_bot.price_store import append_prices
+from src.daily_news_bot.signal_validation import SignalIndex, build_signal_validation, recompute_signal_validation, render_signal_validation_markdown
+
+
+def _daily_closes(start: datetime, days: int, step: float) -> list[dict]:
+    return [{"date": (start + timedelta(days=offset)).date().isoformat(), "close": round(1 + offset * step, 4)} for offset in range(days)]
 
 
 class SignalValidationLongTermTest(unittest.TestCase):
@@ -58,6 +67,107 @@ class SignalValidationLongTermTest(unittest.TestCase):
         self.assertIn("T+90", markdown)
         self.assertNotIn("T+5", markdown)
 
+    def test_horizons_resolve_at_the_stored_close_on_the_horizon_date(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "signal_validation.json"
+            now = datetime(2026, 5, 1, 8)
+            created_at = now - timedelta(days=95)
+            signal = {
+                "id": "late",
+                "created_at_utc": created_at.isoformat(),
+                "theme": "AI",
+                "theme_key": "ai",
+                "code": "512480",
+                "start_price": 1.0,
+                "benchmark_code": "510300",
+                # A run that only noticed T+30 late recorded the price it saw then.
+                "observations": {"t30": {"price": 1.9, "return_pct": 90.0, "hit": True}},
+            }
+            path.write_text(json.dumps({"version": 1, "signals": [signal]}), encoding="utf-8")
+            append_prices("etf_kline/512480", _daily_closes(created_at, 100, 0.01), root=Path(tmp) / "price_history")
+            append_prices("etf_kline/510300", _daily_closes(created_at, 100, 0.002), root=Path(tmp) / "price_history")
+
+            validation = build_signal_validation(
+                generated_at=now,
+                portfolio_payload={},
+                execution_checks={"items": [{"code": "512480", "latest_price": 2.5}]},
+                path=path,
+            )
+            observations = validation["signals"][0]["observations"]
+            self.assertEqual(observations["t30"]["price_date"], (created_at + timedelta(days=30)).date().isoformat())
+            self.assertEqual(observations["t30"]["return_pct"], 30.0)
+            self.assertEqual(observations["t30"]["relative_return_pct"], 24.0)
+            self.assertEqual(observations["t90"]["return_pct"], 90.0)
+            self.assertEqual({item["basis"] for item in observations.values()}, {"close"})
+
+            path.write_text(json.dumps({"version": 1, "signals": [signal]}), encoding="utf-8")
+            recomputed = recompute_signal_validation(generated_at=now, path=path)
+            self.assertEqual(recomputed["signals"][0]["observations"], observations)
+            self.assertEqual(recomputed["rows"][0]["t60"]["avg_relative_return_pct"], 48.0)
+
+    def test_signal_index_dedupes_and_keeps_theme_buckets_current(self) -> None:
+        now = datetime(2026, 5, 1, 8)
+
+        def signal(day: int, code: str, return_pct: float | None = None) -> dict:
+            observations = {"t30": {"return_pct": return_pct, "relative_return_pct": return_pct, "basis": "close"}} if return_pct is not None else {}
+            return {"created_at_utc": (now - timedelta(days=day)).isoformat(), "theme_key": "ai", "theme": "AI", "code": code, "observations": observations}
+
+        with patch.object(signal_validation, "MAX_SIGNALS", 3):
+            index = SignalIndex([signal(400, "a", 5.0), signal(40, "a", 1.5), signal(50, "b", -0.5), signal(60, "c", 2.0)], now)
+            self.assertEqual(len(index), 3)
+            self.assertFalse(index.is_duplicate("a", "ai", now))
+            self.assertTrue(index.is_duplicate("a", "ai", now - timedelta(days=38)))
+            self.assertEqual(index.rows()[0]["t30"]["samples"], 3)
+            self.assertEqual(index.rows()[0]["t30"]["avg_return_pct"], 1.0)
+
+            self.assertTrue(index.is_duplicate("c", "ai", now - timedelta(days=60)))
+            index.add(signal(0, "d"), now)
+            self.assertTrue(index.is_duplicate("d", "ai", now))
+            # "c" was trimmed to make room, so it no longer blocks a new "c" signal.
+            self.assertFalse(index.is_duplicate("c", "ai", now - timedelta(days=60)))
+            self.assertEqual([item["code"] for item in index.signals], ["d", "a", "b"])
+            self.assertEqual(len(index.open_signals()), 3)
+            row = index.rows()[0]
+            self.assertEqual((row["signals"], row["t30"]["samples"], row["t30"]["win_rate_pct"]), (3, 2, 50.0))
+            self.assertEqual(row["t30"]["avg_return_pct"], 0.5)
+
+            index.signals[2]["observations"]["t30"]["return_pct"] = 3.5
+            index.refresh(index.signals[2])
+            self.assertEqual(index.rows()[0]["t30"]["avg_return_pct"], 2.5)
+
+    def test_price_history_refresh_fans_out_over_open_signal_codes(self) -> None:
+        now = datetime.utcnow()
+        signals = [
+            {"created_at_utc": (now - timedelta(days=day)).isoformat(), "theme_key": "ai", "code": code, "benchmark_code": "510300", "observations": {}}
+            for day, code in ((5, "159819"), (10, "515070"), (15, "588000"), (400, "512480"))
+        ]
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def update(code: str, timeout: int, limit: int) -> str:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            if code == "515070":
+                raise RuntimeError("kline unavailable")
+            return f"etf_kline/{code}"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "signal_validation.json"
+            path.write_text(json.dumps({"version": 1, "signals": signals}), encoding="utf-8")
+            with patch.object(signal_validation, "update_etf_price_history", side_effect=update):
+                result = signal_validation.refresh_signal_price_history(path)
+
+        self.assertGreater(peak, 1)
+        self.assertEqual(result["codes"], ["159819", "510300", "515070", "588000"])
+        self.assertEqual(result["refreshed"], ["159819", "510300", "588000"])
+        self.assertEqual(list(result["failures"]), ["515070"])
+
 
 if __name__ == "__main__":
     unittest.main()
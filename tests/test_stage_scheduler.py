@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from src.daily_news_bot.scheduler import Stage, run_stages
+
+
+class StageSchedulerTest(unittest.TestCase):
+    def test_independent_stages_overlap_and_dependents_see_outputs(self) -> None:
+        both_started = threading.Barrier(2, timeout=2)
+
+        def fetch(value: int) -> int:
+            both_started.wait()
+            return value
+
+        results = run_stages(
+            [
+                Stage("left", lambda: fetch(2)),
+                Stage("right", lambda: fetch(3)),
+                Stage("total", lambda left, right: left + right, inputs=("left", "right")),
+                Stage("pair", lambda total: (total, total * 10), inputs=("total",), outputs=("small", "large")),
+            ]
+        )
+
+        self.assertEqual(results["total"], 5)
+        self.assertEqual((results["small"], results["large"]), (5, 50))
+
+    def test_fallback_replaces_failed_stage_output(self) -> None:
+        def broken() -> dict:
+            raise ConnectionError("offline")
+
+        results = run_stages(
+            [
+                Stage("market", broken, fallback=lambda exc: {"items": [], "error": f"{type(exc).__name__}: {exc}"}),
+                Stage("count", lambda market: len(market["items"]), inputs=("market",)),
+            ]
+        )
+
+        self.assertEqual(results["market"]["error"], "ConnectionError: offline")
+        self.assertEqual(results["count"], 0)
+
+    def test_after_orders_stages_without_data_edge(self) -> None:
+        order: list[str] = []
+
+        def record(name: str, delay: float = 0.0) -> str:
+            time.sleep(delay)
+            order.append(name)
+            return name
+
+        run_stages(
+            [
+                Stage("first", lambda: record("first", 0.05)),
+                Stage("second", lambda: record("second"), after=("first",)),
+            ]
+        )
+
+        self.assertEqual(order, ["first", "second"])
+
+    def test_unknown_inputs_and_cycles_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            run_stages([Stage("orphan", lambda missing: missing, inputs=("missing",))])
+        with self.assertRaises(ValueError):
+            run_stages(
+                [
+                    Stage("a", lambda b: b, inputs=("b",)),
+                    Stage("b", lambda a: a, inputs=("a",)),
+                ]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import unittest
+
+from src.daily_news_bot.decision_journal import load_decision_journal, update_decision_journal
+from src.daily_news_bot.models import Article, EventCluster
+from src.daily_news_bot.portfolio_quotes import update_portfolio_history
+from src.daily_news_bot.state_store import (
+    RECORD_SPECS,
+    STATE_DB_NAME,
+    append_state_records,
+    export_state_json,
+    load_state,
+    migrate_json_state,
+    query_state_records,
+    save_state,
+)
+from src.daily_news_bot.tracking import iter_event_history, load_event_history, update_event_history
+
+
+def _event(day: int, cluster_id: str) -> dict:
+    return {"generated_at_utc": f"2026-05-{day:02d}T08:00:00", "cluster_id": cluster_id, "title": cluster_id, "tokens": ["oil"]}
+
+
+class StateStoreTest(unittest.TestCase):
+    def test_migrates_json_once_and_exports_after_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "decision_journal.json"
+            records = [{"generated_at_utc": f"2026-05-0{day}T08:00:00", "top_candidates": []} for day in (1, 2, 3)]
+            path.write_text(json.dumps(records), encoding="utf-8")
+
+            self.assertEqual(migrate_json_state(tmp), ["decision_journal.json"])
+            self.assertEqual(migrate_json_state(tmp), [])
+            self.assertEqual(load_decision_journal(path), records)
+            self.assertEqual(export_state_json(tmp), [])
+
+            save_state(path, records[1:])
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8")), records)
+            self.assertEqual(export_state_json(tmp), [path])
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8")), records[1:])
+            # The exported file is not migrated back in on the next read, nor is a byte-identical copy restored over it.
+            self.assertEqual(migrate_json_state(tmp), [])
+            path.write_bytes(path.read_bytes())
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(migrate_json_state(tmp), [])
+
+    def test_event_history_exports_an_append_only_log(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "event_history.json"
+            log_path = Path(tmp) / "event_history.jsonl"
+            records = [_event(1, "a"), _event(1, "b"), _event(2, "a")]
+            path.write_text(json.dumps(records), encoding="utf-8")
+
+            self.assertEqual(load_event_history(path), records)
+            self.assertEqual(export_state_json(tmp, force=True), [log_path])
+            self.assertEqual(len(log_path.read_text(encoding="utf-8").splitlines()), 3)
+
+            append_state_records(path, [_event(3, "c")], keep_from="2026-05-02")
+            self.assertEqual(export_state_json(tmp), [log_path])
+            lines = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+            event_key = RECORD_SPECS["event_history.json"].key
+            self.assertEqual(lines[3:], [_event(3, "c"), {"$delete": event_key(_event(1, "a"))}, {"$delete": event_key(_event(1, "b"))}])
+
+            expected = [_event(2, "a"), _event(3, "c")]
+            self.assertEqual(list(iter_event_history(path)), expected)
+            self.assertEqual(list(iter_event_history(path, since="2026-05-03", newest_first=True)), [_event(3, "c")])
+            # A restored log (a fresh store next to it) replays to the same history.
+            with tempfile.TemporaryDirectory() as fresh:
+                restored = Path(fresh) / "event_history.jsonl"
+                restored.write_text(log_path.read_text(encoding="utf-8"), encoding="utf-8")
+                self.assertEqual(load_event_history(Path(fresh) / "event_history.json"), expected)
+
+            for day in range(4, 9):
+                append_state_records(path, [_event(day, "d")], keep_from="2026-05-02")
+                export_state_json(tmp)
+            appended = len(log_path.read_text(encoding="utf-8").splitlines())
+            self.assertEqual(appended, 11)
+            self.assertEqual(export_state_json(tmp, force=True), [log_path])
+            self.assertEqual(len(log_path.read_text(encoding="utf-8").splitlines()), 7)
+            self.assertEqual(len(load_event_history(path)), 7)
+
+    def test_same_run_clusters_sharing_a_cluster_id_are_all_kept(self) -> None:
+        def cluster(title: str, url: str) -> EventCluster:
+            article = Article(
+                title=title,
+                url=url,
+                source="PBOC",
+                category="china",
+                region="china",
+                source_weight=1.0,
+                published_at=datetime(2026, 5, 3, tzinfo=timezone.utc),
+            )
+            # Clustering turns every CJK title into the same "event" id.
+            return EventCluster(cluster_id="event", theme=title, articles=[article])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "event_history.json"
+            clusters = [
+                cluster("央行开展逆回购操作", "https://pbc.example/1"),
+                cluster("证监会发布新规", "https://csrc.example/1"),
+                cluster("发改委召开发布会", "https://ndrc.example/1"),
+            ]
+            update_event_history(clusters, datetime(2026, 5, 3, 8, 0), path)
+
+            self.assertEqual([item["title"] for item in load_event_history(path)], [item.theme for item in clusters])
+
+    def test_history_rows_are_upserted_and_pruned(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history_path = Path(tmp) / "portfolio_history.json"
+            for day, change in ((1, 0.1), (2, 0.2), (2, 0.3), (3, 0.4)):
+                history = update_portfolio_history(
+                    {"captured_at_utc": f"2026-05-0{day}T07:00:00", "portfolio_estimated_day_change_pct": change},
+                    history_path,
+                    max_entries=2,
+                )
+            self.assertEqual([item["portfolio_estimated_day_change_pct"] for item in history], [0.3, 0.4])
+
+            journal_path = Path(tmp) / "decision_journal.json"
+            old = {"generated_at_utc": "2020-01-01T00:00:00"}
+            journal_path.write_text(json.dumps([old]), encoding="utf-8")
+            now = datetime.utcnow().replace(microsecond=0).isoformat()
+            update_decision_journal({"generated_at_utc": now, "top_candidates": []}, journal_path)
+            self.assertEqual(load_decision_journal(journal_path), [{"generated_at_utc": now, "top_candidates": []}])
+
+            with sqlite3.connect(Path(tmp) / STATE_DB_NAME) as connection:
+                rows = connection.execute("SELECT collection, COUNT(*) FROM records GROUP BY collection ORDER BY collection").fetchall()
+            self.assertEqual(rows, [("decision_journal.json", 1), ("portfolio_history.json", 2)])
+
+    def test_reading_missing_state_creates_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp) / "outputs"
+            self.assertIsNone(load_state(folder / "watchlist.json"))
+            self.assertEqual(list(iter_event_history(folder / "event_history.json")), [])
+            self.assertEqual(query_state_records(folder / "event_history.json", ["oil"], "2026-05-01", "2026-05-31"), [])
+            self.assertFalse(folder.exists())
+
+    def test_documents_round_trip_and_corrupt_json_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "watchlist.json"
+            path.write_text("{not json", encoding="utf-8")
+            self.assertIsNone(load_state(path))
+
+            save_state(path, {"items": [{"id": "w1"}]}, export=True)
+            self.assertEqual(load_state(path), {"items": [{"id": "w1"}]})
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8")), {"items": [{"id": "w1"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.daily_news_bot import translations
+from src.daily_news_bot.config import load_settings
+from src.daily_news_bot.models import Article, EventCluster
+
+
+def _cluster(cluster_id: str, title: str) -> EventCluster:
+    article = Article(
+        title=title,
+        url=f"https://example.com/{cluster_id}",
+        source="Reuters",
+        category="energy",
+        region="global",
+        source_weight=1.0,
+        published_at=datetime(2026, 5, 3, tzinfo=timezone.utc),
+        summary=f"{title} as traders weigh supply risks.",
+    )
+    return EventCluster(cluster_id=cluster_id, theme="energy", articles=[article], tags=["能源"])
+
+
+def _llm_output(system_prompt: str, user_prompt: str) -> str:
+    items = json.loads(user_prompt[user_prompt.index("{\n") :])["items"]
+    return json.dumps({"items": [{"id": item["id"], "title_zh": f"译:{item['title']}"} for item in items]})
+
+
+class TranslationMemoTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.memo_path = Path(tmp.name) / "translation_memo.json"
+        self.settings = load_settings()
+
+    def _translate(self, clusters: list[EventCluster]) -> tuple[dict, list[str]]:
+        prompts: list[str] = []
+
+        def generate(settings, system_prompt, user_prompt, **kwargs):
+            prompts.append(user_prompt)
+            return _llm_output(system_prompt, user_prompt)
+
+        with patch.object(translations, "generate_report", side_effect=generate):
+            result = translations.translate_cluster_highlights(self.settings, clusters, memo_path=self.memo_path)
+        return result, prompts
+
+    def test_only_new_headlines_are_sent_to_the_llm(self) -> None:
+        first, prompts = self._translate([_cluster("a", "Oil jumps as Hormuz traffic slows"), _cluster("b", "Fed holds rates")])
+        self.assertEqual(len(prompts), 1)
+        self.assertEqual(first["memo"], {"hits": 0, "misses": 2, "hit_rate_pct": 0.0, "saved_tokens_estimate": 0})
+
+        # Same story under a new cluster id and with different spacing/case, plus one new headline.
+        second, prompts = self._translate([_cluster("c", "oil  jumps as HORMUZ traffic slows"), _cluster("d", "Copper hits record")])
+        self.assertEqual(len(prompts), 1)
+        self.assertIn("Copper hits record", prompts[0])
+        self.assertNotIn("Hormuz", prompts[0])
+        self.assertEqual(second["items"]["c"]["title_zh"], "译:Oil jumps as Hormuz traffic slows")
+        self.assertEqual(second["items"]["d"]["title_zh"], "译:Copper hits record")
+        self.assertEqual((second["memo"]["hits"], second["memo"]["misses"], second["memo"]["hit_rate_pct"]), (1, 1, 50.0))
+        self.assertGreater(second["memo"]["saved_tokens_estimate"], 0)
+
+        third, prompts = self._translate([_cluster("e", "Fed holds rates")])
+        self.assertEqual(prompts, [])
+        self.assertEqual(third["provider"], "memo")
+        self.assertEqual(third["translated_count"], 1)
+
+    def test_clusters_sharing_an_id_are_remembered_under_their_own_headline(self) -> None:
+        # Clustering ids are a 12-character title prefix, so these two stories get the same one.
+        first, prompts = self._translate([_cluster("oiljumpsasho", "Oil jumps as Hormuz shuts"), _cluster("oiljumpsasho", "Oil jumps as shale output falls")])
+        self.assertEqual(len(prompts), 1)
+        self.assertEqual(first["memo"]["misses"], 2)
+
+        memo = translations.load_translation_memo(self.memo_path)
+        self.assertEqual(sorted(entry["title_zh"] for entry in memo.values()), ["译:Oil jumps as Hormuz shuts", "译:Oil jumps as shale output falls"])
+
+        second, prompts = self._translate([_cluster("oiljumpsasho", "Oil jumps as shale output falls")])
+        self.assertEqual(prompts, [])
+        self.assertEqual(second["items"]["oiljumpsasho"]["title_zh"], "译:Oil jumps as shale output falls")
+
+    def test_google_fallback_runs_concurrently_and_rule_based_titles_are_not_remembered(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def google(text: str, timeout: int = 12) -> str:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            if text.startswith("Offline"):
+                raise RuntimeError("offline")
+            return f"谷歌:{text}"
+
+        clusters = [_cluster(str(index), f"Headline {index} moves markets") for index in range(4)]
+        clusters.append(_cluster("x", "Offline headline about oil"))
+        with patch.object(translations, "generate_report", return_value=None), patch.object(translations, "_translate_with_google", side_effect=google):
+            result = translations.translate_cluster_highlights(self.settings, clusters, memo_path=self.memo_path)
+
+        self.assertGreater(peak, 1)
+        self.assertEqual(result["items"]["0"]["title_zh"], "谷歌:Headline 0 moves markets")
+        self.assertEqual(result["provider"], "rule_based")
+        self.assertEqual(result["llm_error"], "translation_llm_unavailable")
+        memo = translations.load_translation_memo(self.memo_path)
+        self.assertEqual(len(memo), 4)
+        self.assertEqual({entry["provider"] for entry in memo.values()}, {"google_translate"})
+
+
+if __name__ == "__main__":
+    unittest.main()